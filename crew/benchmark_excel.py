@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming Excel writer against the previous pd.ExcelWriter path
+
+Each writer runs in a fresh subprocess so peak RSS (ru_maxrss) only reflects
+that writer. The workload is synthetic quarterly statement data: one sheet
+per data type, many periods, for several symbols in one workbook.
+
+Usage:
+    python benchmark_excel.py
+    python benchmark_excel.py --rows 20000 --sheets 8 --columns 40
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+
+def make_records(rows: int, columns: int):
+    """Synthetic statement records shaped like FMP output"""
+    records = []
+    for i in range(rows):
+        record = {"date": f"{2000 + i // 4}-{(i % 4) * 3 + 3:02d}-30", "symbol": "TEST", "period": f"Q{i % 4 + 1}"}
+        for c in range(columns):
+            record[f"lineItem{c}"] = float(i * columns + c) * 1000.5
+        records.append(record)
+    return records
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write_legacy(path: str, sheets: dict):
+    """Previous writer: a DataFrame per sheet through pd.ExcelWriter(engine='openpyxl')"""
+    import pandas as pd
+
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for name, records in sheets.items():
+            pd.DataFrame(records).to_excel(writer, sheet_name=name, index=False)
+
+
+def write_streaming(path: str, sheets: dict):
+    """Streaming writer: write-only workbook fed straight from the records"""
+    from crew.tools.excel import record_rows, write_workbook
+
+    write_workbook(path, {name: record_rows(records) for name, records in sheets.items()})
+
+
+def worker(writer: str, rows: int, sheets: int, columns: int):
+    """Run one writer and print its timing and memory as JSON"""
+    # Import both writers up front so library imports are not counted as write memory
+    import pandas  # noqa: F401
+    import openpyxl  # noqa: F401
+    import crew.tools.excel  # noqa: F401
+
+    data = {f"SHEET_{s}": make_records(rows, columns) for s in range(sheets)}
+    baseline = peak_rss_mb()
+
+    path = os.path.join(tempfile.mkdtemp(), f"{writer}.xlsx")
+    started = time.perf_counter()
+    (write_legacy if writer == "legacy" else write_streaming)(path, data)
+    elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        "writer": writer,
+        "seconds": round(elapsed, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "write_rss_mb": round(peak_rss_mb() - baseline, 1),
+        "file_mb": round(os.path.getsize(path) / 1024 / 1024, 2),
+    }))
+    os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel writer benchmark")
+    parser.add_argument("--rows", type=int, default=2000, help="Rows per sheet")
+    parser.add_argument("--sheets", type=int, default=6, help="Sheets per workbook")
+    parser.add_argument("--columns", type=int, default=40, help="Numeric columns per sheet")
+    parser.add_argument("--worker", choices=["legacy", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.rows, args.sheets, args.columns)
+        return
+
+    print("Excel Writer Benchmark")
+    print("=" * 30)
+    print(f"{args.sheets} sheets x {args.rows} rows x {args.columns + 3} columns")
+
+    results = []
+    for writer in ("legacy", "streaming"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--worker", writer,
+             "--rows", str(args.rows), "--sheets", str(args.sheets), "--columns", str(args.columns)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        results.append(result)
+        print(f"{writer:>10}: {result['seconds']:>7.2f}s  write RSS {result['write_rss_mb']:>7.1f} MB  "
+              f"peak RSS {result['peak_rss_mb']:>7.1f} MB  file {result['file_mb']} MB")
+
+    legacy, streaming = results
+    if streaming["seconds"]:
+        print(f"\nSpeedup: {legacy['seconds'] / streaming['seconds']:.2f}x")
+    print(f"Write memory saved: {legacy['write_rss_mb'] - streaming['write_rss_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the FMP tool and the DCF crew
+
+Each module is imported in a fresh interpreter with -X importtime, from an
+empty temporary directory and without FMP_API_KEY, to check that importing is
+side-effect free (no exception, no financial_data/ created) and that the
+deferred heavy dependencies are not loaded. The FMP tool defers crewai too,
+so its budget covers the total import time; the crew cannot run without
+crewai, so time spent inside crewai is reported separately and its budget
+applies to the rest ("own" time).
+
+Usage:
+    python benchmark_import.py
+    python benchmark_import.py --runs 5 --budget-fmp 0.5 --budget-crew 0.8
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that must not be imported as a side effect of importing the target
+DEFERRED = ("pandas", "pyarrow", "openpyxl", "crewai_tools")
+
+# Third-party frameworks whose own import time is reported but not budgeted
+FRAMEWORKS = ("crewai",)
+
+# Target module, extra deferred modules, and whether framework time is budgeted
+TARGETS = {
+    "fmp": ("src.crew.tools.fmp", FRAMEWORKS, True),
+    "crew": ("src.crew.dcf_crew", (), False),
+}
+
+
+def measure(module: str, deferred: tuple = DEFERRED) -> dict:
+    """Import a module in a clean subprocess and parse its -X importtime report"""
+    env = {k: v for k, v in os.environ.items() if k != "FMP_API_KEY"}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    check = f"import sys; print('LOADED', ','.join(m for m in {deferred!r} if m in sys.modules))"
+
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}; {check}"],
+            cwd=cwd, env=env, capture_output=True, text=True
+        )
+        side_effects = os.listdir(cwd)
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        cumulative.setdefault((name.strip(), depth), int(cumulative_us))
+
+    total = cumulative.get((module, 0), 0)
+    framework = sum(us for (name, _), us in cumulative.items() if name in FRAMEWORKS)
+    loaded = proc.stdout.split("LOADED", 1)[-1].strip()
+    return {
+        "total": total / 1e6,
+        "framework": framework / 1e6,
+        "own": (total - framework) / 1e6,
+        "deferred_loaded": [m for m in loaded.split(",") if m],
+        "side_effects": side_effects,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark")
+    parser.add_argument("--runs", type=int, default=3, help="Imports per module (best run is reported)")
+    parser.add_argument("--budget-fmp", type=float, default=0.5, help="Total import seconds for crew.tools.fmp")
+    parser.add_argument("--budget-crew", type=float, default=0.8, help="Own import seconds for crew.dcf_crew")
+    args = parser.parse_args()
+
+    budgets = {"fmp": args.budget_fmp, "crew": args.budget_crew}
+    failed = False
+
+    print("Import Time Benchmark")
+    print("=" * 30)
+    for key, (module, extra_deferred, budget_total) in TARGETS.items():
+        runs = [measure(module, DEFERRED + extra_deferred) for _ in range(args.runs)]
+        best = min(runs, key=lambda r: r["total"])
+        budgeted = best["total"] if budget_total else best["own"]
+        ok = budgeted <= budgets[key] and not best["deferred_loaded"] and not best["side_effects"]
+        failed |= not ok
+
+        print(f"\n{'✅' if ok else '❌'} {module}")
+        if budget_total:
+            print(f"   total {best['total']:.3f}s  (budget {budgets[key]:.3f}s)")
+        else:
+            print(f"   total {best['total']:.3f}s  (crewai {best['framework']:.3f}s, own {best['own']:.3f}s, "
+                  f"budget {budgets[key]:.3f}s)")
+        if best["deferred_loaded"]:
+            print(f"   deferred modules imported eagerly: {', '.join(best['deferred_loaded'])}")
+        if best["side_effects"]:
+            print(f"   files created on import: {', '.join(best['side_effects'])}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,10 @@ DCF Analysis Interface
 Simple interface for running DCF analysis on companies using natural language queries.
 """
 
+import argparse
+import json
 import sys
 import os
-from typing import Optional
 
 # Add the src directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -127,13 +128,33 @@ Files are saved in the 'financial_data' directory.
         print(help_text)
 
 
+def print_valuation(symbol: str, period: str, years: int) -> int:
+    """Print the DCF valuation as JSON, computed directly from FMP data without the crew"""
+    from crew.tools.fmp import get_fmp_tool
+    
+    result = get_fmp_tool().get_valuation_snapshot(symbol, period, years)
+    print(json.dumps(result, indent=2, default=str))
+    return 1 if "error" in result else 0
+
+
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="DCF analysis from natural language queries")
+    parser.add_argument("query", nargs="*", help="Analysis query (interactive mode if omitted)")
+    parser.add_argument("--valuation", metavar="SYMBOL",
+                        help="Print the quantitative valuation for SYMBOL as JSON, without running the agents")
+    parser.add_argument("--period", choices=["annual", "quarter"], default="annual")
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+    
+    if args.valuation:
+        sys.exit(print_valuation(args.valuation, args.period, args.years))
+    
     interface = DCFAnalysisInterface()
     
     # Check if query provided as command line argument
-    if len(sys.argv) > 1:
-        query = ' '.join(sys.argv[1:])
+    if args.query:
+        query = ' '.join(args.query)
         result = interface.analyze(query)
         print(result)
     else:
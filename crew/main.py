@@ -1,14 +1,65 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
-from src.crew.dcf_crew import DCFCrew
+from typing import Dict, Optional, List
+from src.crew.dcf_crew import create_dcf_crew
+from src.crew.pool import CrewPool, PoolExhausted
+from src.crew.jobs import JobManager, JobQueueFull
+from src.crew.tools.batch import BatchValuationEngine
+from src.crew.tools.fmp import get_fmp_tool
+
+# Warm crew instances shared by all requests (sized by CREW_POOL_SIZE / CREW_POOL_MAX_SIZE)
+crew_pool = CrewPool.from_env(create_dcf_crew)
+
+# Batch members analysed at once (capped by the pool's max size) and members per batch request
+BATCH_CONCURRENCY = int(os.getenv("CREW_BATCH_CONCURRENCY", "4"))
+MAX_BATCH_SIZE = int(os.getenv("CREW_BATCH_MAX_SIZE", "500"))
+
+def run_analysis_job(params: Dict, report) -> Dict:
+    """Run a queued analysis on a pooled crew, reporting per-task progress"""
+    with crew_pool.checkout(timeout=None) as dcf_crew:
+        result = dcf_crew.analyze_company(params["query"], progress=report)
+        return {"result": result.raw, "metadata": dcf_crew.last_run}
+
+# Background analysis jobs, created on first use so each server process gets its own worker threads
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+def get_job_manager() -> JobManager:
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager.from_env(run_analysis_job)
+        return _job_manager
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the pooled crews at startup so requests only check one out
+    try:
+        await run_in_threadpool(crew_pool.warm)
+        print(f"✅ Crew pool ready: {crew_pool.stats()}")
+    except Exception as e:
+        print(f"⚠️ Crew pool warm-up failed, instances will be created on demand: {e}")
+    # Jobs left unfinished by a server process that died can never complete
+    interrupted = get_job_manager().store.recover()
+    if interrupted:
+        print(f"⚠️ Marked {interrupted} interrupted job(s) as failed")
+    yield
+    get_job_manager().close()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="DCF Analysis Crew API",
     description="API for performing DCF (Discounted Cash Flow) analysis on companies",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Initialize CORS middleware
@@ -30,6 +81,36 @@ class DCFAnalysisRequest(BaseModel):
 class CompanyQuery(BaseModel):
     query: str
 
+class JobRequest(BaseModel):
+    # Either a natural language query or the structured fields of /analyze
+    query: Optional[str] = None
+    company: Optional[str] = None
+    years: Optional[int] = 5
+    data_type: Optional[str] = "annual"
+    analysis_type: Optional[str] = "comprehensive"
+
+def format_analysis_query(company: str, years: int, data_type: str, analysis_type: str) -> str:
+    """Natural language query for structured analysis parameters"""
+    formatted_query = f"Analyze {company} for DCF analysis with {years} years of {data_type} data. "
+    formatted_query += f"Perform {analysis_type} analysis including intrinsic value calculation."
+    return formatted_query
+
+def job_response(job: Dict) -> Dict:
+    """Public view of a stored job"""
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "kind": job["kind"],
+        "params": job["params"],
+        "progress": job["progress"],
+        "result": job["result"],
+        "error": job["error"],
+        "cancel_requested": job["cancel_requested"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"]
+    }
+
 # Sample queries for reference
 SAMPLE_QUERIES = [
     "Analyze Apple Inc for DCF analysis with 5 years of annual data",
@@ -49,26 +130,32 @@ async def root():
         "endpoints": {
             "POST /analyze": "Perform DCF analysis with structured input",
             "POST /query": "Perform DCF analysis with natural language query",
+            "POST /jobs": "Queue a DCF analysis in the background and get a job id",
+            "GET /jobs/{job_id}": "Get a job's status, per-task progress and result",
+            "DELETE /jobs/{job_id}": "Cancel a queued or running job",
+            "GET /jobs": "List recent jobs",
+            "GET /valuation/{symbol}": "Get the DCF valuation directly, without the LLM crew",
             "GET /samples": "Get sample analysis queries",
             "GET /health": "Health check endpoint"
         }
     }
 
 @app.post("/analyze")
-async def analyze_company(request: DCFAnalysisRequest):
+def analyze_company(request: DCFAnalysisRequest):
     """
     Perform DCF analysis on a specific company with structured parameters
+    
+    Deliberately synchronous for existing clients: the request stays open until the
+    analysis finishes. POST /jobs runs the same analysis in the background.
     """
     try:
-        # Create DCF crew instance
-        dcf_crew = DCFCrew()
-        
         # Format the analysis query
-        formatted_query = f"Analyze {request.company} for DCF analysis with {request.years} years of {request.data_type} data. "
-        formatted_query += f"Perform {request.analysis_type} analysis including intrinsic value calculation."
+        formatted_query = format_analysis_query(request.company, request.years, request.data_type, request.analysis_type)
         
-        # Run the DCF analysis
-        result = dcf_crew.analyze_company(formatted_query)
+        # Run the DCF analysis on a pooled crew instance
+        with crew_pool.checkout() as dcf_crew:
+            result = dcf_crew.analyze_company(formatted_query)
+            metadata = dcf_crew.last_run
         
         return {
             "status": "success",
@@ -78,36 +165,121 @@ async def analyze_company(request: DCFAnalysisRequest):
                 "data_type": request.data_type,
                 "analysis_type": request.analysis_type
             },
-            "result": result
+            "result": result,
+            "metadata": metadata
         }
     
+    except PoolExhausted as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"DCF analysis failed: {str(e)}")
 
 @app.post("/query")
-async def analyze_with_query(request: CompanyQuery):
+def analyze_with_query(request: CompanyQuery):
     """
     Perform DCF analysis using natural language query
+    
+    Deliberately synchronous like /analyze; use POST /jobs for a background run.
     """
     try:
         if not request.query.strip():
             raise HTTPException(status_code=400, detail="Query cannot be empty")
         
-        # Create DCF crew instance
-        dcf_crew = DCFCrew()
-        
-        # Run the DCF analysis with the provided query
-        result = dcf_crew.analyze_company(request.query)
+        # Run the DCF analysis with the provided query on a pooled crew instance
+        with crew_pool.checkout() as dcf_crew:
+            result = dcf_crew.analyze_company(request.query)
+            metadata = dcf_crew.last_run
         
         return {
             "status": "success",
             "query": request.query,
-            "result": result
+            "result": result,
+            "metadata": metadata
         }
     
+    except PoolExhausted as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"DCF analysis failed: {str(e)}")
 
+@app.post("/jobs", status_code=202)
+def submit_job(request: JobRequest):
+    """
+    Queue a DCF analysis and return its job id immediately; poll GET /jobs/{job_id} for the result
+    """
+    if request.query and request.query.strip():
+        query = request.query.strip()
+    elif request.company and request.company.strip():
+        query = format_analysis_query(request.company, request.years, request.data_type, request.analysis_type)
+    else:
+        raise HTTPException(status_code=400, detail="Provide a query or a company")
+    
+    try:
+        job = get_job_manager().submit("analysis", {**request.model_dump(exclude_none=True), "query": query})
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return {
+        "status": job["status"],
+        "job_id": job["id"],
+        "status_url": f"/jobs/{job['id']}"
+    }
+
+@app.get("/jobs")
+def list_jobs(limit: int = 50, status: Optional[str] = None):
+    """
+    List recent jobs (newest first, without results)
+    """
+    manager = get_job_manager()
+    return {
+        "status": "success",
+        "jobs": [job_response(job) for job in manager.store.list(min(max(limit, 1), 500), status)],
+        "workers": manager.stats()
+    }
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    Get a job's status, per-task progress and, once finished, its result or error
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job_response(job)
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """
+    Cancel a job: a queued job never starts, a running one stops after its current task
+    (cancellation is only checked between tasks, so the task in progress always finishes)
+    """
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job_response(job)
+
+@app.get("/valuation/{symbol}")
+def get_valuation(symbol: str, period: str = "annual", years: int = 5,
+                  discount_rate: float = 0.10, terminal_growth_rate: float = 0.03):
+    """
+    Get the DCF valuation, UFCF table and assumptions computed directly from FMP data
+    (no agents or LLM calls involved)
+    """
+    period = "quarter" if period.lower() in ("quarter", "quarterly") else period.lower()
+    if period != "annual" and period != "quarter":
+        raise HTTPException(status_code=400, detail="period must be 'annual' or 'quarter'")
+    if not 1 <= years <= 10:
+        raise HTTPException(status_code=400, detail="years must be between 1 and 10")
+    if discount_rate <= terminal_growth_rate:
+        raise HTTPException(status_code=400, detail="discount_rate must exceed terminal_growth_rate")
+    
+    result = get_fmp_tool().get_valuation_snapshot(symbol, period, years, terminal_growth_rate, discount_rate)
+    if "error" in result:
+        status_code = {"invalid_symbol": 400, "no_data": 404}.get(result["error_type"], 502)
+        raise HTTPException(status_code=status_code, detail=result["error"])
+    
+    return {"status": "success", **result}
+
 @app.get("/samples")
 async def get_sample_queries():
     """
@@ -126,57 +298,106 @@ async def get_sample_queries():
     }
 
 @app.get("/health")
-async def health_check():
+def health_check():
     """
-    Health check endpoint to verify API status
+    Health check endpoint to verify API status and crew pool state
     """
     try:
-        # Test DCF crew initialization
-        dcf_crew = DCFCrew()
+        # Only initializes a crew if none exists yet (e.g. warm-up failed at startup)
+        if crew_pool.stats()["created"] == 0:
+            crew_pool.warm(1)
         return {
             "status": "healthy",
             "message": "DCF Analysis Crew API is running successfully",
-            "dcf_crew_status": "initialized"
+            "dcf_crew_status": "initialized",
+            "pool": crew_pool.stats()
         }
     except Exception as e:
         return {
             "status": "unhealthy",
             "message": f"DCF crew initialization failed: {str(e)}",
-            "dcf_crew_status": "failed"
+            "dcf_crew_status": "failed",
+            "pool": crew_pool.stats()
         }
 
 @app.post("/batch_analyze")
-async def batch_analyze_companies(companies: List[str]):
+def batch_analyze_companies(companies: List[str], concurrency: Optional[int] = None, stream: bool = False):
     """
-    Perform DCF analysis on multiple companies
+    Perform DCF analysis on multiple companies concurrently
+    
+    Quotes, profiles and statements for all members are prefetched in the background
+    while the analyses run on up to `concurrency` pooled crews. The response is one JSON
+    object with the results in request order; with stream=true the results come back
+    as NDJSON lines in completion order instead, followed by a summary line.
     """
+    companies = [company.strip() for company in companies if company and company.strip()]
+    if not companies:
+        raise HTTPException(status_code=400, detail="Company list cannot be empty")
+    
+    if len(companies) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_BATCH_SIZE} companies allowed per batch")
+    
     try:
-        if not companies:
-            raise HTTPException(status_code=400, detail="Company list cannot be empty")
-        
-        if len(companies) > 10:
-            raise HTTPException(status_code=400, detail="Maximum 10 companies allowed per batch")
-        
-        # Create DCF crew instance
-        dcf_crew = DCFCrew()
-        
-        results = []
-        for company in companies:
-            try:
-                query = f"Perform comprehensive DCF analysis for {company} with 5 years of annual data"
-                result = dcf_crew.analyze_company(query)
-                results.append({
-                    "company": company,
-                    "status": "success",
-                    "result": result
-                })
-            except Exception as company_error:
-                results.append({
-                    "company": company,
-                    "status": "failed",
-                    "error": str(company_error)
-                })
+        # Resolve every member's symbol on one pooled crew instance
+        with crew_pool.checkout() as dcf_crew:
+            symbols = [symbol for symbol in (dcf_crew.extract_stock_symbol(c) for c in companies) if symbol]
+    except PoolExhausted as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    concurrency = max(1, min(concurrency or BATCH_CONCURRENCY, crew_pool.max_size))
+    
+    def analyze_member(dcf_crew, member):
+        _, company = member
+        query = f"Perform comprehensive DCF analysis for {company} with 5 years of annual data"
+        result = dcf_crew.analyze_company(query)
+        return result.raw, dcf_crew.last_run
+    
+    def run_batch():
+        # Bulk quote/profile requests and concurrent statement fetches warm the shared
+        # response cache; the FMP rate limiter paces them together with the crews' calls
+        prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-prefetch")
+        prefetch = prefetcher.submit(BatchValuationEngine(get_fmp_tool()).prefetch, symbols)
+        # Reported whenever the prefetch finishes; the response never waits for it
+        prefetch.add_done_callback(report_prefetch)
+        try:
+            for (index, company), output, error in crew_pool.map_unordered(
+                    analyze_member, enumerate(companies), concurrency=concurrency, timeout=None):
+                if error is None:
+                    result, metadata = output
+                    yield index, {"company": company, "status": "success", "result": result, "metadata": metadata}
+                else:
+                    yield index, {"company": company, "status": "failed", "error": str(error)}
+        finally:
+            prefetcher.shutdown(wait=False, cancel_futures=True)
+    
+    def report_prefetch(prefetch):
+        if prefetch.cancelled():
+            return
+        if prefetch.exception() is not None:
+            print(f"⚠️ Batch prefetch failed, members fetched individually: {prefetch.exception()}")
+            return
+        failed = sum(error is not None for error in prefetch.result().values())
+        if failed:
+            print(f"⚠️ Batch prefetch failed for {failed} of {len(symbols)} symbols")
+    
+    if stream:
+        def ndjson():
+            succeeded = 0
+            for _, member_result in run_batch():
+                succeeded += member_result["status"] == "success"
+                yield json.dumps(member_result, default=str) + "\n"
+            yield json.dumps({
+                "status": "completed",
+                "total_companies": len(companies),
+                "succeeded": succeeded,
+                "failed": len(companies) - succeeded,
+                "concurrency": concurrency
+            }) + "\n"
         
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    try:
+        results = [member_result for _, member_result in sorted(run_batch(), key=lambda item: item[0])]
         return {
             "status": "completed",
             "total_companies": len(companies),
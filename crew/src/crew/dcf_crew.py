@@ -6,16 +6,36 @@ This module contains the DCF Analysis crew that processes user queries to extrac
 company information and perform comprehensive DCF analysis using Financial Modeling Prep API.
 """
 
+import copy
+import json
 import os
-import re
-from typing import Dict, List, Optional
+import uuid
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional
 from crewai import Agent, Task, Crew, Process, LLM
-from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import SerperDevTool
+from crewai.project import CrewBase, agent, task
+from crewai.project.crew_base import load_yaml
 from dotenv import load_dotenv
 # Import our custom FMP tool
+from src.crew.tools.client import FMPError
 from src.crew.tools.fmp import FMPTool
-load_dotenv()
+from src.crew.tools.symbols import SymbolResolver
+from src.crew.query_parser import parse_query
+from src.crew.report import assemble_report, build_report_data, narrative_brief
+from src.crew.task_cache import CachedTask, TaskOutputCache, fingerprint
+
+# Lowest resolver confidence accepted as a symbol match
+SYMBOL_MIN_CONFIDENCE = 0.6
+# Parse confidence above which the company research task is skipped
+FAST_PATH_CONFIDENCE = 0.85
+# Only exact matches (uppercase ticker, full company name, known brand) may skip research;
+# prefix, fuzzy and case-insensitive ticker matches are confirmed by the research task
+FAST_PATH_METHODS = ('ticker', 'name', 'alias')
+# Final report (narrative from the LLM merged with the computed figures)
+REPORT_FILE = 'final_analysis_report.md'
+# Task outputs and the report of each run go to their own directory under data_dir,
+# so concurrent runs on pooled instances never write the same files
+RUNS_DIR = 'runs'
 
 @CrewBase
 class DCFCrew:
@@ -25,6 +45,9 @@ class DCFCrew:
     tasks_config = 'config/tasks.yaml'
     
     def __init__(self):
+        # Load environment variables
+        load_dotenv()
+        
         # Initialize LLM - using Gemini if API key is available, otherwise default
         gemini_key = os.getenv('GEMINI_API_KEY')
         if gemini_key:
@@ -40,145 +63,43 @@ class DCFCrew:
         
         # Initialize tools
         self.fmp_tool = FMPTool()
-        # For web search to get company info
-        self.search_tool = SerperDevTool() if os.getenv('SERPER_API_KEY') else None
+        self._symbol_resolver = None
+        
+        # Task outputs are replayed when task, prompt, model and financial data are unchanged
+        # (CREW_TASK_CACHE_TTL seconds, 0 disables)
+        self.task_cache = None
+        cache_ttl = float(os.getenv('CREW_TASK_CACHE_TTL', str(24 * 3600)))
+        if cache_ttl > 0:
+            self.task_cache = TaskOutputCache(os.path.join(self.fmp_tool.data_dir, "crew_task_cache.sqlite3"),
+                                              ttl=cache_ttl)
+        self._cache_salt = {}
+        self.last_run = {}
+        # For web search to get company info (crewai_tools is only imported when it is used)
+        self.search_tool = None
+        if os.getenv('SERPER_API_KEY'):
+            from crewai_tools import SerperDevTool
+            self.search_tool = SerperDevTool()
+    
+    def get_symbol_resolver(self) -> SymbolResolver:
+        """Symbol index built from the FMP stock list (loaded on first use)"""
+        if self._symbol_resolver is None:
+            self._symbol_resolver = SymbolResolver.load_or_build(self.fmp_tool)
+        return self._symbol_resolver
     
     def extract_stock_symbol(self, company_name: str) -> str:
         """
-        Extract or derive stock symbol from company name
-        This is a simple mapping - in production, you'd use a more comprehensive database
+        Resolve a company name or ticker to a stock symbol using the local symbol index
+        
+        Returns:
+            The symbol, or '' when nothing matches with at least SYMBOL_MIN_CONFIDENCE
         """
         print(f"🔍 extract_stock_symbol called with: '{company_name}'")
         
-        # Common company name to stock symbol mappings
-        symbol_mapping = {
-            'apple': 'AAPL',
-            'apple inc': 'AAPL',
-            'microsoft': 'MSFT',
-            'microsoft corporation': 'MSFT',
-            'amazon': 'AMZN',
-            'amazon.com': 'AMZN',
-            'google': 'GOOGL',
-            'alphabet': 'GOOGL',
-            'meta': 'META',
-            'facebook': 'META',
-            'tesla': 'TSLA',
-            'tesla inc': 'TSLA',
-            'nvidia': 'NVDA',
-            'nvidia corporation': 'NVDA',
-            'netflix': 'NFLX',
-            'netflix inc': 'NFLX',
-            'coca-cola': 'KO',
-            'coca cola': 'KO',
-            'johnson & johnson': 'JNJ',
-            'johnson and johnson': 'JNJ',
-            'walmart': 'WMT',
-            'walmart inc': 'WMT',
-            'disney': 'DIS',
-            'walt disney': 'DIS',
-            'mcdonalds': 'MCD',
-            "mcdonald's": 'MCD',
-            'visa': 'V',
-            'visa inc': 'V',
-            'mastercard': 'MA',
-            'mastercard inc': 'MA',
-            'intel': 'INTC',
-            'intel corporation': 'INTC',
-            'ibm': 'IBM',
-            'international business machines': 'IBM',
-            'oracle': 'ORCL',
-            'oracle corporation': 'ORCL',
-            'salesforce': 'CRM',
-            'salesforce.com': 'CRM',
-            'adobe': 'ADBE',
-            'adobe inc': 'ADBE',
-            'paypal': 'PYPL',
-            'paypal holdings': 'PYPL',
-            'uber': 'UBER',
-            'uber technologies': 'UBER',
-            'airbnb': 'ABNB',
-            'airbnb inc': 'ABNB',
-            'zoom': 'ZM',
-            'zoom video': 'ZM',
-            'slack': 'WORK',
-            'slack technologies': 'WORK',
-            'spotify': 'SPOT',
-            'spotify technology': 'SPOT',
-            'twitter': 'TWTR',
-            'twitter inc': 'TWTR',
-            'snap': 'SNAP',
-            'snap inc': 'SNAP',
-            'pinterest': 'PINS',
-            'pinterest inc': 'PINS',
-            'square': 'SQ',
-            'block': 'SQ',
-            'roku': 'ROKU',
-            'roku inc': 'ROKU',
-            'peloton': 'PTON',
-            'peloton interactive': 'PTON',
-            'beyond meat': 'BYND',
-            'beyond meat inc': 'BYND',
-            'zoom': 'ZM',
-            'zoom video communications': 'ZM',
-            'crowdstrike': 'CRWD',
-            'crowdstrike holdings': 'CRWD',
-            'snowflake': 'SNOW',
-            'snowflake inc': 'SNOW',
-            'palantir': 'PLTR',
-            'palantir technologies': 'PLTR',
-            'roblox': 'RBLX',
-            'roblox corporation': 'RBLX',
-            'coinbase': 'COIN',
-            'coinbase global': 'COIN',
-            'robinhood': 'HOOD',
-            'robinhood markets': 'HOOD',
-            'upstart': 'UPST',
-            'upstart holdings': 'UPST',
-            'affirm': 'AFRM',
-            'affirm holdings': 'AFRM'
-        }
-        
-        # Clean the company name
-        clean_name = company_name.lower().strip()
-        clean_name = re.sub(r'\s+', ' ', clean_name)  # Replace multiple spaces with single space
-        clean_name = re.sub(r'[^\w\s&.-]', '', clean_name)  # Remove special characters except &, ., -
-        
-        print(f"🔍 Cleaned name: '{clean_name}'")
-        
-        # Check exact match first
-        if clean_name in symbol_mapping:
-            result = symbol_mapping[clean_name]
-            print(f"🔍 Exact match found: '{result}'")
-            return result
-        
-        # Check partial matches
-        for name, symbol in symbol_mapping.items():
-            if name in clean_name or clean_name in name:
-                print(f"🔍 Partial match found: '{name}' -> '{symbol}'")
-                return symbol
-        
-        # If no match found, return the original name (user might have provided symbol)
-        # Check if it looks like a stock symbol (2-5 uppercase letters)
-        original_upper = company_name.strip().upper()
-        if re.match(r'^[A-Z]{2,5}$', original_upper):
-            print(f"🔍 Looks like stock symbol: '{original_upper}'")
-            return original_upper
-        
-        # Check for common parsing errors
-        invalid_patterns = ['NSIVE', 'NSVE', 'COMPR', 'COMP', 'ANALY', 'ANAL', 'REPOR', 'REPO', 'STUDI', 'STUD', 'HENSI', 'HENS']
-        fallback_test = clean_name.upper().replace(' ', '')[:5]
-        if fallback_test in invalid_patterns or fallback_test[:4] in invalid_patterns:
-            # This looks like a parsing error, return empty to trigger manual handling
-            print(f"🔍 Invalid pattern detected: '{fallback_test}' - returning empty")
-            return ''
-        
-        # Default fallback - but be more careful
-        fallback = clean_name.upper().replace(' ', '')[:4]  # Limit to 4 chars to be safer
-        
-        # Only return fallback if it looks reasonable (contains actual letters, not just fragments)
-        if len(fallback) >= 2 and not any(fragment in fallback for fragment in ['NSIV', 'OMPR', 'NALY']):
-            print(f"🔍 Using fallback: '{fallback}'")
-            return fallback
+        match = self.get_symbol_resolver().resolve(company_name)
+        if match and match['confidence'] >= SYMBOL_MIN_CONFIDENCE:
+            print(f"🔍 Resolved to {match['symbol']} ({match['name']}) via {match['method']}, "
+                  f"confidence {match['confidence']:.2f}")
+            return match['symbol']
         
         # If we can't determine a good symbol, return empty string
         print(f"🔍 No valid symbol found - returning empty")
@@ -250,141 +171,281 @@ class DCFCrew:
     @task
     def extract_company_info(self) -> Task:
         """Create the company information extraction task"""
-        return Task(
+        return CachedTask(
+            output_cache=self.task_cache,
             config=self.tasks_config['extract_company_info'],
             agent=self.company_researcher(),
-            output_file='company_info.md'
+            output_file='{output_dir}/company_info.md'
         )
     
     @task
     def fetch_financial_data(self) -> Task:
         """Create the financial data fetching task"""
-        return Task(
+        return CachedTask(
+            output_cache=self.task_cache,
             config=self.tasks_config['fetch_financial_data'],
             agent=self.financial_analyst(),
-            output_file='financial_data.md'
+            output_file='{output_dir}/financial_data.md'
         )
     
     @task
     def calculate_dcf_metrics(self) -> Task:
         """Create the DCF metrics calculation task"""
-        return Task(
+        return CachedTask(
+            output_cache=self.task_cache,
             config=self.tasks_config['calculate_dcf_metrics'],
             agent=self.dcf_calculator(),
-            output_file='dcf_calculations.md'
+            output_file='{output_dir}/dcf_calculations.md'
         )
     
     @task
     def generate_analysis_report(self) -> Task:
         """Create the analysis report generation task"""
-        return Task(
+        return CachedTask(
+            output_cache=self.task_cache,
             config=self.tasks_config['generate_analysis_report'],
             agent=self.report_generator(),
-            output_file='final_analysis_report.md'
+            output_file='{output_dir}/' + REPORT_FILE
         )
     
-    @crew
-    def crew(self) -> Crew:
-        """Create the DCF analysis crew"""
+    def crew(self, skip_tasks: Iterable[str] = ()) -> Crew:
+        """
+        Create the DCF analysis crew for one run
+        
+        Deliberately not decorated with @crew, which memoizes the Crew per instance
+        and would carry its state into the next request on a pooled instance. The
+        tasks and agents are reused across runs and cleared by reset().
+        
+        Args:
+            skip_tasks: Names of tasks to leave out (e.g. 'extract_company_info' on the fast path)
+        """
+        self.tasks = [getattr(self, name)() for name in self.__crew_metadata__['original_tasks']]
+        self.agents = [getattr(self, name)() for name in self.__crew_metadata__['original_agents']]
+        tasks = [t for t in self.tasks if t.name not in skip_tasks]
         return Crew(
-            agents=self.agents,
-            tasks=self.tasks,
+            agents=[a for a in self.agents if any(t.agent is a for t in tasks)],
+            tasks=tasks,
             process=Process.sequential,
             verbose=True
         )
     
-    def analyze_company(self, query: str) -> str:
+    def analyze_company(self, query: str, progress: Optional[Callable[[Dict], None]] = None) -> str:
         """
         Main method to analyze a company based on user query
         
+        Task outputs and the report are written to data_dir/runs/<run_id>/ (run_id is
+        recorded in last_run), so concurrent runs never share files.
+        
         Args:
             query: User query containing company information and analysis requirements
+            progress: Optional callable receiving per-task progress before the run and after each task;
+                an exception it raises aborts the run (used for job cancellation)
             
         Returns:
             Final analysis report
         """
         # Extract basic info from query to help guide the analysis
         extracted_info = self._extract_basic_info(query)
+        run_id = uuid.uuid4().hex
+        output_dir = os.path.join(os.path.abspath(self.fmp_tool.data_dir), RUNS_DIR, run_id)
         
         # Prepare inputs for the crew
         inputs = {
             'query': query,
-            'company_name': extracted_info.get('company_name', 'Unknown'),
-            'stock_symbol': extracted_info.get('stock_symbol', 'Unknown'),
+            'company_name': extracted_info.get('company_name') or 'Unknown',
+            'stock_symbol': extracted_info.get('stock_symbol') or 'Unknown',
             'period': extracted_info.get('period', 'annual'),
-            'years': extracted_info.get('years', 5)
+            'years': extracted_info.get('years', 5),
+            'analysis_type': extracted_info.get('analysis_type', 'dcf'),
+            'output_dir': output_dir
         }
         
+        # A confident parse with a locally validated symbol makes the research task redundant
+        skip_tasks = []
+        if (extracted_info.get('confidence', 0) >= FAST_PATH_CONFIDENCE
+                and extracted_info.get('symbol_method') in FAST_PATH_METHODS):
+            print(f"⚡ Parsed {inputs['stock_symbol']} with confidence {extracted_info['confidence']:.2f} "
+                  f"- skipping company research")
+            skip_tasks.append('extract_company_info')
+        
+        # The report's numbers come from the tool; the LLM only writes the narrative
+        report_data = self._report_data(extracted_info.get('stock_symbol'), inputs['period'], inputs['years'])
+        inputs['report_brief'] = (narrative_brief(report_data) if report_data
+                                  else "Use the figures from the DCF analysis in the previous task.")
+        
         # Run the crew
-        result = self.crew().kickoff(inputs=inputs)
+        self._cache_salt = {
+            'model': self.llm.model if self.llm else 'default',
+            'data': self._data_fingerprint(extracted_info.get('stock_symbol'), inputs['period'], inputs['years'])
+        }
+        analysis_crew = self.crew(skip_tasks=skip_tasks)
+        on_task_done = self._progress_callback(analysis_crew.tasks, progress) if progress else None
+        for t in analysis_crew.tasks:
+            # Outputs built on financial data are only cached once the data behind them is known
+            known = self._cache_salt['data'] or t.name == 'extract_company_info'
+            t.cache_salt = self._cache_salt if known else None
+            t.callback = on_task_done
+            if t.name == 'generate_analysis_report':
+                # With the brief in the prompt the upstream outputs are redundant input tokens
+                t.context = [] if report_data else [next(u for u in analysis_crew.tasks
+                                                         if u.name == 'calculate_dcf_metrics')]
+        if not self._cache_salt['data'] and 'extract_company_info' not in skip_tasks:
+            research = next(t for t in analysis_crew.tasks if t.name == 'extract_company_info')
+            research.callback = self._salt_after_research(analysis_crew.tasks, inputs['period'], inputs['years'],
+                                                          on_task_done)
+        result = analysis_crew.kickoff(inputs=inputs)
+        self.last_run = {
+            'run_id': run_id,
+            'fast_path': bool(skip_tasks),
+            'task_cache': {t.name: t.cache_status for t in analysis_crew.tasks}
+        }
+        print(f"🗄️ Task cache: {self.last_run['task_cache']}")
+        
+        if report_data is None:
+            # The symbol was only identified by the research task
+            report_data = self._report_data(self._researched_symbol(result), inputs['period'], inputs['years'])
+        if report_data:
+            report = json.dumps({**assemble_report(report_data, result.raw), 'metadata': self.last_run}, indent=2)
+            result.raw = report
+            os.makedirs(output_dir, exist_ok=True)
+            with open(os.path.join(output_dir, REPORT_FILE), 'w', encoding='utf-8') as f:
+                f.write(report)
+        print(f"📄 Outputs saved to: {output_dir}")
         
         return result
     
+    def reset(self):
+        """Clear per-run state so a pooled instance can serve the next request"""
+        self._cache_salt = {}
+        self.last_run = {}
+        for t in getattr(self, 'tasks', None) or []:
+            t.output = None
+            t.cache_status = 'off'
+            t.callback = None
+        for a in getattr(self, 'agents', None) or []:
+            a.tools_results = []
+    
+    @staticmethod
+    def _progress_callback(tasks: List[Task], progress: Callable[[Dict], None]) -> Callable:
+        """Report initial progress and return a task callback that reports each finished task"""
+        states = {t.name: 'pending' for t in tasks}
+        
+        def report():
+            pending = [name for name, state in states.items() if state == 'pending']
+            progress({
+                'tasks': dict(states),
+                'completed': len(states) - len(pending),
+                'total': len(states),
+                'current': pending[0] if pending else None
+            })
+        
+        def on_task_done(output):
+            task = next((t for t in tasks if t.name == output.name), None)
+            if task is not None:
+                states[task.name] = 'cached' if getattr(task, 'cache_status', None) == 'hit' else 'done'
+            report()
+        
+        report()
+        return on_task_done
+    
+    def _salt_after_research(self, tasks: List[Task], period: str, years: int,
+                             then: Optional[Callable] = None) -> Callable:
+        """Callback for the research task: salt the later tasks with the data of the symbol it found"""
+        def on_research_done(output):
+            data = self._data_fingerprint(self._symbol_from_research(output.raw), period, years)
+            if data:
+                self._cache_salt = {**self._cache_salt, 'data': data}
+                for t in tasks:
+                    if t.name != 'extract_company_info':
+                        t.cache_salt = self._cache_salt
+            if then:
+                then(output)
+        
+        return on_research_done
+    
+    def _report_data(self, symbol: Optional[str], period: str, years: int) -> Optional[Dict]:
+        """Computed report sections for symbol (None if unknown or the data could not be fetched)"""
+        if not symbol:
+            return None
+        report_data = build_report_data(self.fmp_tool, symbol, period, years)
+        if 'error' in report_data:
+            print(f"⚠️ Report figures unavailable for {symbol}: {report_data['error']}")
+            return None
+        return report_data
+    
+    def _data_fingerprint(self, symbol: Optional[str], period: str, years: int) -> str:
+        """Hash of the statements and profile behind a run ('' if the symbol is unknown or unavailable)"""
+        if not symbol:
+            return ''
+        try:
+            data = self.fmp_tool.fetch_data(symbol, period, years, ("income", "cashflow", "profile"))
+        except FMPError:
+            return ''
+        return fingerprint(data)
+    
+    def _researched_symbol(self, result) -> Optional[str]:
+        """Symbol named in the extract_company_info output, if that task ran"""
+        for task_output in result.tasks_output:
+            if task_output.name == 'extract_company_info':
+                return self._symbol_from_research(task_output.raw)
+        return None
+    
+    def _symbol_from_research(self, raw: str) -> Optional[str]:
+        """Symbol named in a research task output (None below SYMBOL_MIN_CONFIDENCE)"""
+        info = parse_query(raw, self.get_symbol_resolver())
+        if info['symbol_confidence'] >= SYMBOL_MIN_CONFIDENCE:
+            return info['stock_symbol']
+        return None
+    
     def _extract_basic_info(self, query: str) -> Dict:
         """
         Extract basic information from query to help guide the analysis
-        This is a helper method for the crew
+        
+        Returns:
+            company_name, stock_symbol, period, years, analysis_type, symbol_method and the parse confidence
         """
         print(f"🔍 DCF Crew: Extracting info from query: '{query}'")
         
-        query_lower = query.lower()
+        info = parse_query(query, self.get_symbol_resolver())
+        print(f"🔍 Parsed: company='{info['company_name']}', symbol='{info['stock_symbol']}' "
+              f"({info['symbol_method']}), confidence {info['confidence']:.2f}")
         
-        # Try to extract company name using common patterns
-        company_patterns = [
-            r'analyze\s+([A-Za-z\s&.-]+?)(?:\s+stock|\s+company|\s+for|\s+dcf|$)',
-            r'(?:company|stock|ticker)[\s:]+([A-Za-z\s&.-]+?)(?:\s+analysis|\s+dcf|\s+for|$)',
-            r'dcf\s+(?:analysis\s+)?(?:for\s+)?([A-Za-z\s&.-]+?)(?:\s+company|\s+stock|$)',
-            r'([A-Z]{2,5})\s+(?:stock|company|analysis|dcf)',
-            r'(?:^|\s)([A-Za-z\s&.-]+?)\s+(?:dcf|analysis|financial|valuation)'
-        ]
-        
-        company_name = None
-        for i, pattern in enumerate(company_patterns):
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                company_name = match.group(1).strip()
-                print(f"🔍 Pattern {i+1} matched: '{company_name}'")
-                break
-        
-        print(f"🔍 Extracted company name: '{company_name}'")
-        
-        # Extract stock symbol if provided
-        stock_symbol = None
-        if company_name:
-            print(f"🔍 Converting '{company_name}' to stock symbol...")
-            stock_symbol = self.extract_stock_symbol(company_name)
-            print(f"🔍 Converted to symbol: '{stock_symbol}'")
-            
-            # If extraction failed (returned empty), try to use the original if it looks like a symbol
-            if not stock_symbol and re.match(r'^[A-Z]{2,5}$', company_name.strip()):
-                stock_symbol = company_name.strip().upper()
-                print(f"🔍 Using original as symbol: '{stock_symbol}'")
-            
-            # If still no symbol and company_name looks suspicious, reset company_name
-            if not stock_symbol and any(fragment in company_name.upper() for fragment in ['NSIVE', 'COMPREHENSIVE', 'ANALYSIS']):
-                print(f"🔍 Suspicious company name detected, resetting...")
-                company_name = None
+        stock_symbol = info['stock_symbol']
+        company_name = info['company_name']
+        if stock_symbol and info['symbol_confidence'] < SYMBOL_MIN_CONFIDENCE:
+            # Without a symbol index, a well-formed ticker is still used (unverified)
+            if info['symbol_method'] != 'unverified':
+                print(f"🔍 Weak match '{stock_symbol}' rejected")
                 stock_symbol = None
+                # Keep the name as the user wrote it, not the rejected match's
+                company_name = info['company_span'] or company_name
         
-        # Extract period preference
-        period = 'annual'
-        if 'quarter' in query_lower or 'quarterly' in query_lower:
-            period = 'quarter'
-        
-        # Extract years
-        years = 5
-        year_match = re.search(r'(\d+)\s+years?', query_lower)
-        if year_match:
-            years = int(year_match.group(1))
-        
+        # Without a symbol the name still guides the company research task
         return {
             'company_name': company_name,
             'stock_symbol': stock_symbol,
-            'period': period,
-            'years': min(years, 10)  # Cap at 10 years
+            'period': info['period'],
+            'years': info['years'],
+            'analysis_type': info['analysis_type'],
+            'symbol_method': info['symbol_method'] if stock_symbol else None,
+            'confidence': info['confidence']
         }
 
 
+@lru_cache(maxsize=None)
+def _parse_config(path: str, mtime: float) -> Dict:
+    return load_yaml(path)
+
+
+def _load_config_cached(config_path) -> Dict:
+    """agents.yaml/tasks.yaml parsed once per process (re-read if modified); each crew gets its own copy"""
+    return copy.deepcopy(_parse_config(str(config_path), os.path.getmtime(config_path)))
+
+
+# CrewBase injects its own load_yaml into the class, so the cached loader replaces it afterwards
+DCFCrew.load_yaml = staticmethod(_load_config_cached)
+
+
 # Create the DCF crew instance
 def create_dcf_crew():
     """Factory function to create DCF crew instance"""
@@ -0,0 +1,286 @@
+"""
+Background analysis jobs
+
+A submitted job gets an id immediately and runs on a bounded thread pool.
+Status, per-task progress, the result and cancellation requests live in a
+SQLite file, so any API worker process can report on or cancel a job and
+finished jobs survive restarts. Cancellation is cooperative: a queued job
+never starts, a running one stops at its next progress report. For crew runs
+that is the task boundary: report() is called from the task callback and the
+JobCancelled it raises propagates out of Crew.kickoff, so the task in progress
+(and its LLM calls) always finishes first.
+The owning process refreshes a heartbeat on its unfinished jobs; jobs whose
+heartbeat went stale (the process died) are failed by recover().
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+TERMINAL_STATES = ("succeeded", "failed", "cancelled")
+
+# Seconds between heartbeats, and heartbeat age after which a job counts as orphaned
+HEARTBEAT_INTERVAL = 15
+STALE_AFTER = 120
+
+# Columns holding JSON documents
+_JSON_COLUMNS = ("params", "progress", "result")
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once its cancellation was requested"""
+
+
+class JobQueueFull(Exception):
+    """Too many jobs are waiting for a worker"""
+
+
+def _owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobStore:
+    """SQLite table of jobs shared by all API worker processes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress TEXT,
+                result TEXT,
+                error TEXT,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                owner TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                heartbeat_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at)")
+
+    @staticmethod
+    def _row(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        if row is None:
+            return None
+        job = dict(row)
+        for column in _JSON_COLUMNS:
+            job[column] = json.loads(job[column]) if job[column] is not None else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def create(self, kind: str, params: Dict) -> Dict:
+        """Insert a queued job and return it"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, params, status, owner, created_at, heartbeat_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(params), _owner(), now, now)
+            )
+        return self.get(job_id)
+
+    def update(self, job_id: str, **fields):
+        """Set columns of a job (JSON columns are encoded)"""
+        for column in _JSON_COLUMNS:
+            if column in fields:
+                fields[column] = json.dumps(fields[column], default=str)
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row(row)
+
+    def list(self, limit: int = 50, status: Optional[str] = None) -> List[Dict]:
+        """Most recent jobs first (without results)"""
+        query = "SELECT * FROM jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, (*params, limit)).fetchall()
+        return [{**self._row(row), "result": None} for row in rows]
+
+    def request_cancel(self, job_id: str) -> Optional[Dict]:
+        """Flag a job for cancellation; a job that has not started is cancelled at once"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status NOT IN (?, ?, ?)",
+                (job_id, *TERMINAL_STATES)
+            )
+            self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (now, job_id)
+            )
+        return self.get(job_id)
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def heartbeat(self, job_ids: List[str]):
+        """Mark unfinished jobs as still owned by a live process"""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ?", [(time.time(), job_id) for job_id in job_ids]
+            )
+
+    def recover(self, stale_after: float = STALE_AFTER) -> int:
+        """
+        Fail queued/running jobs whose heartbeat is older than stale_after seconds
+
+        Returns:
+            Number of jobs marked as interrupted
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Interrupted by a server restart', finished_at = ? "
+                "WHERE status IN ('queued', 'running') AND heartbeat_at < ?",
+                (now, now - stale_after)
+            )
+        return cursor.rowcount
+
+    def purge(self, max_age: float) -> int:
+        """Delete finished jobs older than max_age seconds"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?, ?) AND finished_at < ?",
+                (*TERMINAL_STATES, time.time() - max_age)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobManager:
+    """Runs jobs from a JobStore on a bounded thread pool"""
+
+    def __init__(self, store: JobStore, runner: Callable[[Dict, Callable[[Dict], None]], Any],
+                 workers: int = 2, max_queued: int = 100):
+        """
+        Args:
+            store: Job persistence
+            runner: Callable(params, report) returning a JSON-serializable result;
+                report(progress) stores progress and raises JobCancelled when cancelled
+            workers: Jobs run concurrently
+            max_queued: Jobs accepted but not yet finished before submit() refuses more
+        """
+        self.store = store
+        self.runner = runner
+        self.workers = workers
+        self.max_queued = max_queued
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crew-job")
+        self._active: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat = threading.Thread(target=self._beat, name="crew-job-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    @classmethod
+    def from_env(cls, runner: Callable[[Dict, Callable[[Dict], None]], Any],
+                 path: Optional[str] = None) -> "JobManager":
+        """
+        Manager configured by CREW_JOB_WORKERS (default: CREW_POOL_MAX_SIZE or 4),
+        CREW_JOB_MAX_QUEUED (default 100) and CREW_JOBS_DB (default financial_data/crew_jobs.sqlite3)
+        """
+        path = path or os.getenv("CREW_JOBS_DB") or os.path.join(os.getcwd(), "financial_data", "crew_jobs.sqlite3")
+        workers = int(os.getenv("CREW_JOB_WORKERS") or os.getenv("CREW_POOL_MAX_SIZE") or "4")
+        return cls(JobStore(path), runner, workers=workers, max_queued=int(os.getenv("CREW_JOB_MAX_QUEUED", "100")))
+
+    def _beat(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            with self._lock:
+                job_ids = list(self._active)
+            if job_ids:
+                try:
+                    self.store.heartbeat(job_ids)
+                except sqlite3.Error as e:
+                    print(f"⚠️ Job heartbeat failed: {e}")
+
+    def submit(self, kind: str, params: Dict) -> Dict:
+        """
+        Queue a job and return it immediately
+
+        Raises:
+            JobQueueFull: If max_queued jobs are already pending or running
+        """
+        with self._lock:
+            if len(self._active) >= self.max_queued:
+                raise JobQueueFull(f"{len(self._active)} jobs pending; try again later")
+            job = self.store.create(kind, params)
+            self._active[job["id"]] = "queued"
+        self._executor.submit(self._run, job["id"], params)
+        return job
+
+    def _run(self, job_id: str, params: Dict):
+        try:
+            if self.store.cancel_requested(job_id):
+                return
+            self.store.update(job_id, status="running", started_at=time.time())
+            with self._lock:
+                self._active[job_id] = "running"
+
+            def report(progress: Dict):
+                self.store.update(job_id, progress=progress)
+                if self.store.cancel_requested(job_id):
+                    raise JobCancelled(job_id)
+
+            try:
+                result = self.runner(params, report)
+            except JobCancelled:
+                self.store.update(job_id, status="cancelled", finished_at=time.time())
+                print(f"🛑 Job {job_id} cancelled")
+            except Exception as e:
+                self.store.update(job_id, status="failed", error=str(e), finished_at=time.time())
+                print(f"❌ Job {job_id} failed: {e}")
+            else:
+                self.store.update(job_id, status="succeeded", result=result, finished_at=time.time())
+                print(f"✅ Job {job_id} finished")
+        finally:
+            with self._lock:
+                self._active.pop(job_id, None)
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Request cancellation (None if the job does not exist)"""
+        return self.store.request_cancel(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self.store.get(job_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            running = sum(state == "running" for state in self._active.values())
+            queued = len(self._active) - running
+        return {"workers": self.workers, "running": running, "queued": queued, "max_queued": self.max_queued}
+
+    def close(self, wait: bool = False):
+        """Stop the heartbeat and the worker threads (queued jobs are dropped)"""
+        self._stop.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,183 @@
+"""
+Process-level pool of warm crew instances
+
+Building a DCFCrew parses the agent/task configs and creates the LLM client,
+FMPTool, search tool and agents, which costs far more than most requests
+should pay. The pool creates instances up front (at app startup), hands one
+to each request and resets its per-run state when it is returned.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class PoolExhausted(Exception):
+    """No crew instance became available within the checkout timeout"""
+
+
+class CrewPool:
+    """Thread-safe pool of reusable crew instances"""
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2, max_size: Optional[int] = None):
+        """
+        Args:
+            factory: Callable creating a new crew instance
+            size: Instances created by warm()
+            max_size: Upper bound on instances; more are created on demand up to it
+        """
+        self.factory = factory
+        self.size = size
+        self.max_size = max(max_size or size, size)
+
+        self.created = 0
+        self.discarded = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.create_seconds = 0.0
+
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, factory: Callable[[], Any]) -> "CrewPool":
+        """Pool sized by CREW_POOL_SIZE (default 2) and CREW_POOL_MAX_SIZE (default 4)"""
+        return cls(factory, size=int(os.getenv("CREW_POOL_SIZE", "2")),
+                   max_size=int(os.getenv("CREW_POOL_MAX_SIZE", "4")))
+
+    def _create(self) -> Any:
+        with self._lock:
+            if self.created >= self.max_size:
+                return None
+            self.created += 1
+        start = time.perf_counter()
+        try:
+            instance = self.factory()
+        except Exception:
+            with self._lock:
+                self.created -= 1
+            raise
+        with self._lock:
+            self.create_seconds += time.perf_counter() - start
+        return instance
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """
+        Create idle instances until count (default: size) exist
+
+        Returns:
+            Number of instances created
+        """
+        target = min(count or self.size, self.max_size)
+        made = 0
+        while self.created < target:
+            instance = self._create()
+            if instance is None:
+                break
+            self._idle.put(instance)
+            made += 1
+        return made
+
+    def _acquire(self, timeout: Optional[float]) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        instance = self._create()
+        if instance is not None:
+            return instance
+
+        start = time.perf_counter()
+        with self._lock:
+            self.waits += 1
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise PoolExhausted(f"No crew instance available within {timeout}s ({self.max_size} in use)")
+        finally:
+            with self._lock:
+                self.wait_seconds += time.perf_counter() - start
+
+    def _release(self, instance: Any):
+        try:
+            reset = getattr(instance, "reset", None)
+            if reset is not None:
+                reset()
+        except Exception as e:
+            # An instance that cannot be reset is dropped; a fresh one is created on demand
+            print(f"⚠️ Discarding crew instance after failed reset: {e}")
+            with self._lock:
+                self.created -= 1
+                self.discarded += 1
+            return
+        self._idle.put(instance)
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = 60) -> Iterator[Any]:
+        """
+        Borrow an instance for the duration of a with block
+
+        Raises:
+            PoolExhausted: If every instance stays busy for timeout seconds
+        """
+        instance = self._acquire(timeout)
+        with self._lock:
+            self.checkouts += 1
+        try:
+            yield instance
+        finally:
+            self._release(instance)
+
+    def map_unordered(self, fn: Callable[[Any, Any], Any], items: Iterable[Any],
+                      concurrency: Optional[int] = None,
+                      timeout: Optional[float] = None) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+        """
+        Call fn(instance, item) for every item on pooled instances, yielding in completion order
+
+        Args:
+            fn: Work to run with a checked-out instance
+            items: Work items
+            concurrency: Calls in flight at once (capped at max_size; default max_size)
+            timeout: Checkout timeout for each call (None waits indefinitely)
+
+        Returns:
+            Iterator of (item, result, error) tuples; error is the exception fn raised, if any.
+            Closing the iterator early cancels the calls that have not started.
+        """
+        concurrency = max(1, min(concurrency or self.max_size, self.max_size))
+
+        def call(item):
+            with self.checkout(timeout) as instance:
+                return fn(instance, item)
+
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="crew-map")
+        try:
+            futures = {executor.submit(call, item): item for item in items}
+            for future in as_completed(futures):
+                error = future.exception()
+                yield futures[future], None if error else future.result(), error
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Instance counts, checkout/wait counters and average creation time"""
+        with self._lock:
+            idle = self._idle.qsize()
+            return {
+                "size": self.size,
+                "max_size": self.max_size,
+                "created": self.created,
+                "idle": idle,
+                "in_use": self.created - idle,
+                "discarded": self.discarded,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "avg_wait_ms": round(self.wait_seconds / self.waits * 1000, 1) if self.waits else 0.0,
+                "avg_create_seconds": round(self.create_seconds / self.created, 2) if self.created else 0.0,
+            }
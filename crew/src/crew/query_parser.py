@@ -0,0 +1,122 @@
+"""
+Deterministic query parser
+
+Tokenizes an analysis request in a single pass of one compiled regex and
+extracts the company, period, years and analysis type. The company span is
+resolved with the local symbol index, so a confident parse can replace the
+company research task (one LLM round trip and a web search) entirely.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# Maximum years of history the crew fetches
+MAX_YEARS = 10
+DEFAULT_YEARS = 5
+
+# Words that never belong to a company name
+FILLER_WORDS = {
+    "a", "an", "the", "of", "for", "on", "in", "with", "and", "to", "me", "my", "please", "can", "you",
+    "analyze", "analyse", "analysis", "analyzing", "run", "do", "perform", "give", "show", "get", "calculate",
+    "compute", "study", "report", "compare", "versus", "vs", "stock", "stocks", "share", "shares", "company",
+    "companies", "corp",
+    "financial", "financials", "data", "history", "historical", "including", "calculation", "value",
+    "intrinsic", "fair", "price", "target", "model", "detailed", "full", "complete", "using", "based",
+    "last", "past", "over", "what", "is", "whats", "how", "much", "worth",
+}
+
+_TOKEN = re.compile(r"""
+      (?P<years>\b\d{1,2})\s*-?\s*(?:years?|yrs?)\b
+    | (?P<quarter>\b(?:quarter(?:ly|s)?|q[1-4]|ttm|trailing)\b)
+    | (?P<annual>\b(?:annual(?:ly)?|yearly|fy)\b)
+    | (?P<analysis>\b(?:dcf|ufcf|valuation|comprehensive|sensitivity|monte\s+carlo|simulation)\b)
+    | \$(?P<cashtag>[A-Za-z]{1,5})\b
+    | \((?P<paren>[A-Z]{1,5}(?:[.\-][A-Z])?)\)
+    | \b(?:ticker|symbol)\s*[:=]?\s*(?P<labeled>[A-Za-z]{1,5}(?:[.\-][A-Za-z])?)\b
+    | (?P<word>[A-Za-z][A-Za-z0-9&'.\-]*)
+    | (?P<separator>[,;:!?]|\s-\s)
+""", re.IGNORECASE | re.VERBOSE)
+
+# Share of the parse confidence that comes from the query structure itself
+_SINGLE_SPAN = 1.0
+_SEVERAL_SPANS = 0.8
+
+
+def _tokenize(query: str) -> Dict:
+    """One pass over the query: period, years, analysis type, explicit tickers and name spans"""
+    parsed = {"period": None, "years": None, "analysis_type": None, "tickers": [], "spans": []}
+    span: List[str] = []
+
+    def close_span():
+        if span:
+            parsed["spans"].append(" ".join(span).strip(".-'"))
+            span.clear()
+
+    for match in _TOKEN.finditer(query):
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "word":
+            if text.lower().strip(".'") in FILLER_WORDS:
+                close_span()
+            else:
+                span.append(text)
+            continue
+
+        close_span()
+        if kind == "years" and parsed["years"] is None:
+            parsed["years"] = int(text)
+        elif kind == "quarter":
+            parsed["period"] = "quarter"
+        elif kind == "annual" and parsed["period"] is None:
+            parsed["period"] = "annual"
+        elif kind == "analysis" and parsed["analysis_type"] in (None, "dcf"):
+            parsed["analysis_type"] = re.sub(r"\s+", "_", text.lower())
+        elif kind in ("cashtag", "paren", "labeled"):
+            parsed["tickers"].append(text.upper())
+    close_span()
+    return parsed
+
+
+def parse_query(query: str, resolver=None) -> Dict:
+    """
+    Parse an analysis request
+
+    Args:
+        query: Free-text request, e.g. "Analyze Apple for DCF with 5 years of quarterly data"
+        resolver: SymbolResolver used to turn the company span into a validated symbol
+
+    Returns:
+        Dictionary with company_name, company_span (the query text it came from),
+        stock_symbol, period, years, analysis_type, symbol_method, symbol_confidence
+        (the resolver's) and confidence (0-1, the parse as a whole; 0 when no symbol
+        could be validated)
+    """
+    parsed = _tokenize(query or "")
+
+    # Explicit tickers ($AAPL, (AAPL), ticker: AAPL) come first, then name spans in order
+    candidates = parsed["tickers"] + parsed["spans"]
+    best: Optional[Dict] = None
+    best_span = None
+    for candidate in candidates:
+        match = resolver.resolve(candidate) if resolver is not None else None
+        if match and (best is None or match["confidence"] > best["confidence"]):
+            best, best_span = match, candidate
+        if best and best["confidence"] >= 1.0:
+            break
+
+    structure = _SINGLE_SPAN if len(candidates) == 1 else _SEVERAL_SPANS
+    validated = best is not None and best["method"] != "unverified"
+    years = parsed["years"] or DEFAULT_YEARS
+    span = best_span or (parsed["spans"][0] if parsed["spans"] else None)
+
+    return {
+        "company_name": (best or {}).get("name") or span,
+        "company_span": span,
+        "stock_symbol": best["symbol"] if best else None,
+        "period": parsed["period"] or "annual",
+        "years": max(1, min(years, MAX_YEARS)),
+        "analysis_type": parsed["analysis_type"] or "dcf",
+        "symbol_method": best["method"] if best else None,
+        "symbol_confidence": best["confidence"] if best else 0.0,
+        "confidence": round(best["confidence"] * structure, 3) if validated else 0.0,
+    }
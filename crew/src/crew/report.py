@@ -0,0 +1,226 @@
+"""
+Hybrid analysis report
+
+Every number in the report JSON (financial metrics, UFCF table, valuation) is
+assembled here from the FMPTool results, converted to USD billions in code.
+The LLM only writes the narrative sections (executive_summary,
+company_overview, trends, key_insights) from a compact brief, which keeps the
+report task to a few hundred output tokens.
+"""
+
+import json
+import re
+from typing import Dict, List, Optional
+
+BILLION = 1e9
+
+NARRATIVE_KEYS = ("executive_summary", "company_overview", "trends", "key_insights")
+TREND_KEYS = ("revenue_trend", "profitability_trend", "cash_flow_trend")
+
+METHODOLOGY = "UFCF = EBIT × (1 - Tax Rate) + Depreciation - CapEx - ΔWorking Capital"
+
+# Report metric name -> (panel column, unit)
+FINANCIAL_METRICS = {
+    "revenue": ("revenue", "USD_billions"),
+    "ebit": ("ebit", "USD_billions"),
+    "net_income": ("net_income", "USD_billions"),
+    "tax_rate": ("tax_rate_percent", "percent"),
+    "capex": ("capex", "USD_billions"),
+    "working_capital_change": ("working_capital_change", "USD_billions"),
+}
+
+
+def _billions(value) -> Optional[float]:
+    return round(float(value) / BILLION, 2) if value is not None and value == value else None
+
+
+def _metric(year, value, unit: str) -> Dict:
+    if unit == "percent":
+        return {"year": year, "value": round(float(value), 2) if value == value else None, "unit": unit}
+    return {"year": year, "value": _billions(value), "currency": unit}
+
+
+def _growth(values: List[float]) -> Optional[float]:
+    """Compound annual growth in percent from the oldest to the newest value (newest first)"""
+    if len(values) < 2 or not values[-1] or values[-1] < 0 or values[0] < 0:
+        return None
+    return round(((values[0] / values[-1]) ** (1 / (len(values) - 1)) - 1) * 100, 1)
+
+
+def build_report_data(fmp_tool, symbol: str, period: str = "annual", years: int = 5) -> Dict:
+    """
+    Deterministic sections of the analysis report
+
+    Args:
+        fmp_tool: FMPTool instance
+        symbol: Stock symbol
+        period: 'annual' or 'quarter' (TTM figures sampled yearly)
+        years: Number of years of historical data
+
+    Returns:
+        Report dictionary without the narrative sections, or {'error', 'error_type'}
+    """
+    from src.crew.tools.client import FMPError
+
+    try:
+        data = fmp_tool.fetch_data(symbol, period, years, fmp_tool.fetch_plan("valuation"))
+        panel = fmp_tool.valuation_panel(symbol, period, years, data)
+    except FMPError as e:
+        return {"error": f"Failed to fetch financial data: {e}", "error_type": e.kind}
+    except ValueError as e:
+        return {"error": str(e), "error_type": "no_data"}
+
+    valuation = fmp_tool.calculate_dcf_valuation(symbol, period, years, data=data)
+    if "error" in valuation:
+        return valuation
+
+    frame = panel.frame
+    year_column = [int(y) if str(y).isdigit() else y for y in frame["calendarYear"]]
+    financial_metrics = {
+        name: [_metric(year, value, unit) for year, value in zip(year_column, frame[column])]
+        for name, (column, unit) in FINANCIAL_METRICS.items()
+    }
+    ufcf_calculations = [
+        {
+            "year": year,
+            "ebit": _billions(row.ebit),
+            "tax_rate": round(float(row.tax_rate_percent), 2),
+            "depreciation": _billions(row.depreciation_amortization),
+            "capex": _billions(row.capex),
+            "wc_change": _billions(row.working_capital_change),
+            "ufcf": _billions(row.unlevered_free_cash_flow),
+        }
+        for year, row in zip(year_column, frame.itertuples(index=False))
+    ]
+
+    market = valuation["market_comparison"]
+    intrinsic_value, current_price = market["intrinsic_value"], market["current_price"]
+    upside = None
+    if intrinsic_value is not None and current_price:
+        upside = round((intrinsic_value - current_price) / current_price * 100, 1)
+
+    notes = [f"{len(frame)} {'TTM (quarterly)' if period == 'quarter' else 'annual'} periods from "
+             f"Financial Modeling Prep; amounts in USD billions."]
+    if len(frame) < years:
+        notes.append(f"Only {len(frame)} of the requested {years} years were available.")
+    if intrinsic_value is None:
+        notes.append("Shares outstanding unavailable, so no per-share value was computed.")
+    notes.append("Net debt is estimated at 5% of enterprise value.")
+
+    profile = valuation.get("company_profile") or {}
+    return {
+        "symbol": symbol,
+        "company_name": profile.get("companyName") or symbol,
+        "financial_metrics": financial_metrics,
+        "dcf_analysis": {"ufcf_calculations": ufcf_calculations},
+        "valuation": {
+            "intrinsic_value": intrinsic_value,
+            "current_price": current_price,
+            "recommendation": market["recommendation"].replace(" ", "_"),
+            "upside_potential": upside,
+            "enterprise_value": _billions(valuation["valuation_summary"]["enterprise_value"]),
+            "discount_rate": valuation["assumptions"]["discount_rate"],
+            "terminal_growth_rate": valuation["assumptions"]["terminal_growth_rate"],
+        },
+        "data_quality_notes": " ".join(notes),
+        "methodology": METHODOLOGY,
+        "_profile": {key: profile.get(key) for key in ("sector", "industry", "description") if profile.get(key)},
+    }
+
+
+def narrative_brief(report: Dict) -> str:
+    """Compact text the LLM writes the narrative from (latest figures, growth and valuation)"""
+    metrics = report["financial_metrics"]
+    lines = [f"Company: {report['company_name']} ({report['symbol']})"]
+    profile = report.get("_profile", {})
+    if profile.get("sector"):
+        lines.append(f"Sector: {profile['sector']} / {profile.get('industry', '')}")
+    if profile.get("description"):
+        lines.append(f"Business: {profile['description'][:400]}")
+
+    for name in ("revenue", "ebit", "net_income"):
+        values = [m["value"] for m in metrics[name] if m["value"] is not None]
+        if values:
+            growth = _growth(values)
+            lines.append(f"{name}: latest ${values[0]}B ({metrics[name][0]['year']}), "
+                         f"history ${', $'.join(map(str, values))}B"
+                         + (f", CAGR {growth}%" if growth is not None else ""))
+    ufcf = [row["ufcf"] for row in report["dcf_analysis"]["ufcf_calculations"] if row["ufcf"] is not None]
+    if ufcf:
+        lines.append(f"UFCF: ${', $'.join(map(str, ufcf))}B (newest first)")
+    tax = [m["value"] for m in metrics["tax_rate"] if m["value"] is not None]
+    if tax:
+        lines.append(f"Tax rate: {tax[0]}% latest")
+
+    valuation = report["valuation"]
+    lines.append(f"Valuation: intrinsic ${valuation['intrinsic_value']} vs price ${valuation['current_price']}, "
+                 f"upside {valuation['upside_potential']}%, {valuation['recommendation']} "
+                 f"(WACC {valuation['discount_rate']:.0%}, terminal growth {valuation['terminal_growth_rate']:.0%})")
+    return "\n".join(lines)
+
+
+def _default_narrative(report: Dict) -> Dict:
+    """Plain narrative from the numbers alone, used when the LLM output is unusable"""
+    metrics = report["financial_metrics"]
+    valuation = report["valuation"]
+
+    def trend(values: List[float], label: str) -> str:
+        values = [value for value in values if value is not None]
+        growth = _growth(values)
+        if growth is None:
+            return f"Not enough {label} history to describe a trend."
+        return f"{label[0].upper() + label[1:]} changed at a compound {growth:+}% per year over {len(values)} periods."
+
+    return {
+        "executive_summary": (f"{report['company_name']} has an estimated intrinsic value of "
+                              f"${valuation['intrinsic_value']} per share against a price of "
+                              f"${valuation['current_price']}: {valuation['recommendation'].replace('_', ' ')}."),
+        "company_overview": report.get("_profile", {}).get("description", report["company_name"]),
+        "trends": {
+            "revenue_trend": trend([m["value"] for m in metrics["revenue"]], "revenue"),
+            "profitability_trend": trend([m["value"] for m in metrics["ebit"]], "EBIT"),
+            "cash_flow_trend": trend([row["ufcf"] for row in report["dcf_analysis"]["ufcf_calculations"]],
+                                     "unlevered free cash flow"),
+        },
+        "key_insights": [],
+    }
+
+
+def parse_narrative(text: str) -> Dict:
+    """Narrative sections from the LLM output (a JSON object, optionally in a ```json block)"""
+    match = re.search(r"\{.*\}", text or "", re.DOTALL)
+    if not match:
+        return {}
+    try:
+        narrative = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(narrative, dict):
+        return {}
+    return {key: narrative[key] for key in NARRATIVE_KEYS if narrative.get(key)}
+
+
+def assemble_report(report: Dict, narrative_text: str) -> Dict:
+    """
+    Final report JSON: deterministic sections plus the LLM narrative
+
+    Missing or malformed narrative sections fall back to text generated from the numbers.
+    """
+    narrative = {**_default_narrative(report), **parse_narrative(narrative_text)}
+    trends = narrative["trends"] if isinstance(narrative["trends"], dict) else {}
+    trends = {key: trends.get(key) or _default_narrative(report)["trends"][key] for key in TREND_KEYS}
+    insights = narrative["key_insights"]
+    if not isinstance(insights, list):
+        insights = [str(insights)]
+
+    return {
+        "executive_summary": narrative["executive_summary"],
+        "company_overview": narrative["company_overview"],
+        "financial_metrics": report["financial_metrics"],
+        "dcf_analysis": {**report["dcf_analysis"], "trends": trends},
+        "valuation": {key: report["valuation"][key]
+                      for key in ("intrinsic_value", "current_price", "recommendation", "upside_potential")},
+        "key_insights": insights,
+        "data_quality_notes": report["data_quality_notes"],
+        "methodology": report["methodology"],
+    }
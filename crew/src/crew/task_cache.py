@@ -0,0 +1,185 @@
+"""
+Persistent cache for crew task outputs
+
+Task outputs are stored in a SQLite file keyed by a fingerprint of the task
+name, the rendered prompt (description, expected output and the context
+passed from earlier tasks), the model name and a hash of the financial data
+behind the run. A rerun with the same inputs and unchanged FMP data replays
+the stored outputs instead of calling the LLM. Entries expire after a TTL and
+the total size is capped with least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from crewai import Task
+from crewai.tasks.task_output import TaskOutput
+from pydantic import Field
+
+
+DEFAULT_TTL = 24 * 3600
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable SHA-256 of JSON-serializable parts"""
+    data = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class TaskOutputCache:
+    """SQLite-backed task output cache with a TTL and LRU size eviction"""
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, max_bytes: int = 16 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS task_outputs (
+                key TEXT PRIMARY KEY,
+                task TEXT NOT NULL,
+                raw TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_task_outputs_accessed ON task_outputs(accessed_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored raw output, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT raw, expires_at FROM task_outputs WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM task_outputs WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE task_outputs SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return row[0]
+
+    def set(self, key: str, task: str, raw: str):
+        """Store a raw output and evict least recently used entries if the size cap is exceeded"""
+        now = time.time()
+        size = len(raw.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO task_outputs (key, task, raw, size, created_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, task, raw, size, now, now + self.ttl, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        self._conn.execute("DELETE FROM task_outputs WHERE expires_at <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM task_outputs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM task_outputs ORDER BY accessed_at ASC"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM task_outputs WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def clear(self):
+        """Remove every cached output"""
+        with self._lock:
+            self._conn.execute("DELETE FROM task_outputs")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current cache size"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM task_outputs"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedTask(Task):
+    """
+    Task whose output is replayed from a TaskOutputCache when its fingerprint matches
+
+    cache_salt carries the run-level parts of the key (model name, data hash);
+    None bypasses the cache for the run. cache_status is 'hit', 'miss' or 'off'
+    after execution.
+    """
+
+    output_cache: Optional[Any] = Field(default=None, exclude=True)
+    cache_salt: Optional[Dict[str, Any]] = Field(default_factory=dict, exclude=True)
+    cache_status: str = Field(default="off", exclude=True)
+
+    def cache_key(self, context: Optional[str]) -> str:
+        """Fingerprint of the task name, rendered prompt, context and run salt"""
+        return fingerprint(self.name, self.description, self.expected_output, context or "", self.cache_salt)
+
+    def execute_sync(self, agent=None, context: Optional[str] = None, tools=None) -> TaskOutput:
+        if self.output_cache is None or self.cache_salt is None:
+            self.cache_status = "off"
+            return super().execute_sync(agent, context, tools)
+
+        key = self.cache_key(context)
+        raw = self.output_cache.get(key)
+        if raw is None:
+            self.cache_status = "miss"
+            output = super().execute_sync(agent, context, tools)
+            self.output_cache.set(key, self.name or "", output.raw)
+            return output
+
+        self.cache_status = "hit"
+        agent = agent or self.agent
+        self.output = TaskOutput(
+            name=self.name or self.description,
+            description=self.description,
+            expected_output=self.expected_output,
+            raw=raw,
+            agent=agent.role if agent else "",
+            output_format=self._get_output_format(),
+        )
+        # Callbacks fire as for an executed task (progress reporting, cancellation)
+        if self.callback:
+            self.callback(self.output)
+        crew = getattr(agent, "crew", None)
+        if crew and not isinstance(crew, str) and crew.task_callback and crew.task_callback != self.callback:
+            crew.task_callback(self.output)
+        if self.output_file:
+            self._save_file(raw)
+        return self.output
@@ -0,0 +1,215 @@
+"""
+Universe-scale batch DCF valuation
+
+Values hundreds or thousands of symbols without any LLM involvement: quotes
+and profiles come from batched requests, statements are fetched concurrently
+through FMPTool (so the response cache and shared rate limiter apply), the
+UFCF vectors are stacked into one matrix and every valuation is computed in a
+single vectorized pass. Output is one DataFrame, optionally written to Parquet.
+
+Usage:
+    python -m src.crew.tools.batch AAPL MSFT NVDA --output valuations.parquet
+    python -m src.crew.tools.batch --symbols-file sp500.txt --output valuations.parquet
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .client import FMPError
+from .fmp import FMPToolBase
+from .ttm import annual_samples, compute_ttm, stack_panels
+from .valuation import batch_dcf_valuation, shares_outstanding_from_profile
+
+
+class BatchValuationEngine:
+    """Deterministic DCF valuation for many symbols in one vectorized pass"""
+
+    def __init__(self, fmp_tool: Optional[FMPToolBase] = None, max_workers: int = 8):
+        # No agents are involved, so the crewai-free base class is enough
+        self.fmp_tool = fmp_tool or FMPToolBase()
+        self.max_workers = max_workers
+
+    def prefetch(self, symbols: List[str], period: str = "annual", years: int = 5,
+                 endpoints: tuple = ("income", "cashflow")) -> Dict[str, Optional[str]]:
+        """
+        Warm the response cache for many symbols before per-symbol work starts
+
+        Quotes and profiles are fetched with batched requests; statements are
+        fetched concurrently (max_workers at a time) under the shared rate limiter.
+
+        Returns:
+            Mapping of symbol to an error message, or None if its data was fetched
+        """
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        try:
+            self.fmp_tool.get_current_prices(symbols)
+            self.fmp_tool.get_company_profiles(symbols)
+        except FMPError as e:
+            print(f"⚠️ Batched quote/profile prefetch failed: {e}")
+
+        def fetch(symbol: str) -> Optional[str]:
+            try:
+                self.fmp_tool.fetch_data(symbol, period, years, endpoints)
+            except (FMPError, ValueError) as e:
+                return f"{type(e).__name__}: {e}"
+            return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(symbols, executor.map(fetch, symbols)))
+
+    def fetch_ufcf(self, symbols: List[str], period: str = "annual", years: int = 5) -> Dict[str, object]:
+        """
+        Fetch statements for every symbol concurrently and return each UFCF vector
+
+        Quarterly statements are turned into yearly TTM UFCF for all symbols in
+        one vectorized pass.
+
+        Returns:
+            Mapping of symbol to UFCF vector, or to an error message string
+        """
+        def fetch(symbol: str):
+            try:
+                return self.fmp_tool.get_financial_panel(symbol, period, years)
+            except (FMPError, ValueError) as e:
+                return f"{type(e).__name__}: {e}"
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            panels = dict(zip(symbols, executor.map(fetch, symbols)))
+
+        if period != "quarter":
+            return {s: p if isinstance(p, str) else p.ufcf for s, p in panels.items()}
+
+        # One TTM pass over all symbols, sampled yearly
+        fetched = [p for p in panels.values() if not isinstance(p, str)]
+        ufcf_by_symbol = {}
+        if fetched:
+            yearly = annual_samples(compute_ttm(stack_panels(fetched)))
+            for symbol, ufcf in yearly.groupby("symbol", sort=False)["unlevered_free_cash_flow"]:
+                ufcf_by_symbol[symbol] = ufcf.to_numpy(dtype="float64")[:years]
+        return {
+            s: p if isinstance(p, str) else ufcf_by_symbol.get(
+                s, f"ValueError: Not enough consecutive quarters for {s} to compute TTM figures")
+            for s, p in panels.items()
+        }
+
+    def run(self, symbols: List[str], period: str = "annual", years: int = 5,
+            discount_rate: float = 0.10, terminal_growth_rate: float = 0.03) -> pd.DataFrame:
+        """
+        Value every symbol and return one row per symbol
+
+        Args:
+            symbols: Stock symbols to value
+            period: 'annual' or 'quarter'
+            years: Number of years of historical data
+            discount_rate: WACC/discount rate
+            terminal_growth_rate: Long-term growth rate
+
+        Returns:
+            DataFrame with valuation summary, market comparison and per-symbol errors
+        """
+        started = time.perf_counter()
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+
+        prices = self.fmp_tool.get_current_prices(symbols)
+        profiles = self.fmp_tool.get_company_profiles(symbols)
+        ufcf_by_symbol = self.fetch_ufcf(symbols, period, years)
+
+        # Stack UFCF vectors into one NaN-padded (symbols, periods) matrix
+        width = max([len(v) for v in ufcf_by_symbol.values() if not isinstance(v, str)] or [1])
+        matrix = np.full((len(symbols), width), np.nan)
+        errors = []
+        for row, symbol in enumerate(symbols):
+            ufcf = ufcf_by_symbol[symbol]
+            if isinstance(ufcf, str):
+                errors.append(ufcf)
+            else:
+                matrix[row, :len(ufcf)] = ufcf
+                errors.append(None)
+
+        current_price = np.array([prices.get(s) if prices.get(s) is not None else np.nan for s in symbols],
+                                 dtype="float64")
+        shares = np.array([shares_outstanding_from_profile(profiles.get(s), prices.get(s)) or np.nan
+                           for s in symbols], dtype="float64")
+
+        values = batch_dcf_valuation(matrix, discount_rate, terminal_growth_rate, shares_outstanding=shares)
+
+        intrinsic = values["intrinsic_value_per_share"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance_percent = (current_price - intrinsic) / intrinsic * 100
+        recommendation = np.select(
+            [np.isnan(variance_percent), variance_percent > 20, variance_percent < -20],
+            ["N/A", "OVERVALUED", "UNDERVALUED"],
+            default="FAIRLY VALUED"
+        )
+
+        frame = pd.DataFrame({
+            "symbol": symbols,
+            "company_name": [(profiles.get(s) or {}).get("companyName") for s in symbols],
+            "valuation_date": datetime.now().strftime("%Y-%m-%d"),
+            "period": period,
+            "discount_rate": discount_rate,
+            "terminal_growth_rate": terminal_growth_rate,
+            "years_analyzed": values["years_analyzed"].astype("int64"),
+            "latest_ufcf": matrix[:, 0],
+            "sum_pv_fcf": values["sum_pv_fcf"],
+            "terminal_pv": values["terminal_pv"],
+            "enterprise_value": values["enterprise_value"],
+            "net_debt": values["net_debt"],
+            "equity_value": values["equity_value"],
+            "shares_outstanding": shares,
+            "intrinsic_value_per_share": np.round(intrinsic, 2),
+            "current_price": current_price,
+            "price_variance_percent": np.round(variance_percent, 1),
+            "recommendation": recommendation,
+            "error": errors,
+        })
+        frame.attrs["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        return frame
+
+    @staticmethod
+    def to_parquet(frame: pd.DataFrame, path: str) -> str:
+        """Write a batch result table to Parquet (requires pyarrow)"""
+        frame.to_parquet(path, index=False)
+        return path
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point for a universe refresh"""
+    parser = argparse.ArgumentParser(description="Batch DCF valuation without the LLM crew")
+    parser.add_argument("symbols", nargs="*", help="Stock symbols to value")
+    parser.add_argument("--symbols-file", help="File with one symbol per line")
+    parser.add_argument("--period", default="annual", choices=["annual", "quarter"])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--discount-rate", type=float, default=0.10)
+    parser.add_argument("--terminal-growth-rate", type=float, default=0.03)
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent statement fetches")
+    parser.add_argument("--output", help="Parquet file to write (prints a summary otherwise)")
+    args = parser.parse_args(argv)
+
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols.extend(line.strip() for line in f if line.strip())
+    if not symbols:
+        parser.error("No symbols given")
+
+    engine = BatchValuationEngine(max_workers=args.workers)
+    frame = engine.run(symbols, args.period, args.years, args.discount_rate, args.terminal_growth_rate)
+    print(f"✅ Valued {len(frame)} symbols in {frame.attrs['elapsed_seconds']}s "
+          f"({frame['error'].notna().sum()} failed)")
+
+    if args.output:
+        print(f"Saved to: {engine.to_parquet(frame, args.output)}")
+    else:
+        print(frame[["symbol", "intrinsic_value_per_share", "current_price", "recommendation"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
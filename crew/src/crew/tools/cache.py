@@ -0,0 +1,152 @@
+"""
+Persistent response cache for the Financial Modeling Prep API
+
+Responses are stored in a SQLite file keyed by endpoint + query parameters
+(the API key is never part of the key). Each endpoint family has its own TTL
+so annual statements can live for days while quotes expire within a minute,
+and the total payload size is capped with least-recently-used eviction.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+
+# Default time-to-live per endpoint family, in seconds
+DEFAULT_TTLS = {
+    "statement": 7 * 24 * 3600,
+    "profile": 24 * 3600,
+    "quote": 60,
+}
+
+# Endpoint prefixes mapped to their TTL family
+ENDPOINT_FAMILIES = {
+    "/income-statement": "statement",
+    "/cash-flow-statement": "statement",
+    "/balance-sheet-statement": "statement",
+    "/profile": "profile",
+    "/quote": "quote",
+}
+
+
+class ResponseCache:
+    """SQLite-backed FMP response cache with per-endpoint TTLs and LRU eviction"""
+
+    def __init__(self, path: str, ttls: Optional[Dict[str, float]] = None,
+                 max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """Build a cache key from an endpoint and its query parameters, ignoring the API key"""
+        items = sorted((k, str(v)) for k, v in (params or {}).items() if k.lower() != "apikey")
+        return f"{endpoint}?{urlencode(items)}" if items else endpoint
+
+    def ttl_for(self, endpoint: str) -> float:
+        """TTL in seconds for an endpoint, based on its family"""
+        for prefix, family in ENDPOINT_FAMILIES.items():
+            if endpoint.startswith(prefix):
+                return self.ttls[family]
+        return self.ttls["profile"]
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """Return the cached payload for a request, or None on a miss or expired entry"""
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, endpoint: str, params: Optional[Dict], payload: Any):
+        """Store a payload and evict least recently used entries if the size cap is exceeded"""
+        key = self.make_key(endpoint, params)
+        data = json.dumps(payload, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, payload, size, created_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, data, len(data), now, now + self.ttl_for(endpoint), now)
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current cache size"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,153 @@
+"""
+HTTP client for the Financial Modeling Prep API
+
+A small wrapper around a pooled ``requests.Session`` that adds connect/read
+timeouts, retries with exponential backoff and jitter on 429/5xx responses,
+and typed errors so callers can tell "no data" apart from "transport failed".
+"""
+
+import logging
+import random
+import time
+from typing import Dict, List, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class FMPError(Exception):
+    """Base class for errors raised by the FMP client"""
+
+    kind = "error"
+
+    def __init__(self, message: str, endpoint: str = "", status_code: Optional[int] = None):
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.status_code = status_code
+
+
+class FMPNoDataError(FMPError):
+    """The request succeeded but FMP had no data for it (unknown symbol, empty payload, ...)"""
+
+    kind = "no_data"
+
+
+class FMPTransportError(FMPError):
+    """The request could not be completed (network error, timeout, HTTP error after retries)"""
+
+    kind = "transport"
+
+
+class FMPClient:
+    """
+    Pooled, keep-alive HTTP client for the FMP API
+
+    One instance owns one ``requests.Session`` so repeated calls reuse the same
+    TLS connections instead of paying a handshake per request.
+    """
+
+    # Status codes that are worth retrying
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, base_url: str, api_key: str, connect_timeout: float = 3.05,
+                 read_timeout: float = 30.0, max_retries: int = 3, backoff_factor: float = 0.5,
+                 backoff_max: float = 30.0, pool_maxsize: int = 10,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        # Retries are handled in get() so that backoff and error typing stay in one place
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before the next attempt: honour Retry-After, else exponential backoff with full jitter"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** attempt)))
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Union[List[Dict], Dict]:
+        """
+        GET an FMP endpoint and return the decoded JSON payload
+
+        Args:
+            endpoint: Path relative to the base URL (e.g. '/profile/AAPL')
+            params: Query parameters (the API key is added automatically)
+
+        Raises:
+            FMPNoDataError: FMP answered but returned no usable data
+            FMPTransportError: The request failed after all retries
+        """
+        url = f"{self.base_url}{endpoint}"
+        query = dict(params or {})
+        query["apikey"] = self.api_key
+
+        last_error = ""
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            # Every attempt, retries included, draws from the shared per-minute budget
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, params=query, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                # Connection, timeout and body decoding errors are all transport failures;
+                # they echo the full URL, so keep the API key out of the message
+                last_error = f"{type(e).__name__}: {e}".replace(self.api_key, "***")
+                status_code = None
+            else:
+                status_code = response.status_code
+                if status_code == 404:
+                    raise FMPNoDataError(f"No data found at {endpoint}", endpoint, status_code)
+                if status_code not in self.RETRY_STATUSES:
+                    return self._decode(response, endpoint)
+                last_error = f"HTTP {status_code}"
+                retry_after = response.headers.get("Retry-After")
+
+            if attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, retry_after)
+                logger.warning("FMP request to %s failed (%s), retrying in %.2fs (attempt %d/%d)",
+                               endpoint, last_error, delay, attempt + 1, self.max_retries)
+                time.sleep(delay)
+
+        raise FMPTransportError(
+            f"Request to {endpoint} failed after {self.max_retries + 1} attempts: {last_error}",
+            endpoint, status_code
+        )
+
+    def _decode(self, response: requests.Response, endpoint: str) -> Union[List[Dict], Dict]:
+        """Turn a non-retryable response into a payload or a typed error"""
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            raise FMPTransportError(str(e).replace(self.api_key, "***"), endpoint, response.status_code) from e
+
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise FMPTransportError(f"Invalid JSON from {endpoint}: {e}", endpoint, response.status_code) from e
+
+        # FMP reports some failures (bad symbol, plan limits) as a 200 with an error message
+        if isinstance(payload, dict) and "Error Message" in payload:
+            raise FMPNoDataError(payload["Error Message"], endpoint, response.status_code)
+        if not payload:
+            raise FMPNoDataError(f"Empty response from {endpoint}", endpoint, response.status_code)
+        return payload
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
@@ -0,0 +1,139 @@
+"""
+Partitioned Parquet dataset for exported financial data
+
+Every export appends one file to a single Hive-partitioned dataset:
+
+    financial_data/dataset/symbol=AAPL/data_type=DCF/run_date=2025-01-31/part-....parquet
+
+Numeric and all-null columns are stored as float64, string columns are
+dictionary-encoded and every row carries the export timestamp, so months of
+runs can be read back with one columnar scan (see read_dataset). Columns whose
+type drifted between runs are promoted to a common type when read.
+"""
+
+import os
+import uuid
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+
+# Partition keys, in directory order. Columns with these names are dropped from
+# the files themselves because their value is carried by the partition path.
+PARTITION_KEYS = ("symbol", "data_type", "run_date")
+
+
+def _is_numeric(data_type) -> bool:
+    import pyarrow as pa
+
+    return pa.types.is_integer(data_type) or pa.types.is_floating(data_type) or pa.types.is_decimal(data_type)
+
+
+def _unify_schemas(schemas: list):
+    """
+    Common schema for files written by different runs
+
+    Compatible drift (null vs double, int vs float) is promoted by Arrow; columns
+    that are still incompatible become float64 if every variant is numeric or
+    null, else plain strings. The dataset scanner casts each file to the result.
+    """
+    import pyarrow as pa
+
+    try:
+        return pa.unify_schemas(schemas, promote_options="permissive")
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        pass
+
+    types = {}
+    for schema in schemas:
+        for field in schema:
+            types.setdefault(field.name, []).append(field.type)
+
+    fields = []
+    for name, variants in types.items():
+        if all(t == variants[0] for t in variants):
+            fields.append(pa.field(name, variants[0]))
+        elif all(_is_numeric(t) or pa.types.is_null(t) for t in variants):
+            fields.append(pa.field(name, pa.float64()))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+def _typed_table(frame: pd.DataFrame, generated_at: datetime):
+    """Arrow table with float64 numerics, dictionary-encoded strings and a generated_at column
+
+    All-null columns are typed float64 (FMP fields are overwhelmingly numeric), so a
+    sparse run does not give a column a different type than the runs around it.
+    """
+    import pyarrow as pa
+
+    frame = frame.drop(columns=[c for c in PARTITION_KEYS if c in frame.columns])
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+
+    fields = []
+    for field in table.schema:
+        if _is_numeric(field.type) or pa.types.is_null(field.type):
+            fields.append(pa.field(field.name, pa.float64()))
+        elif pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            fields.append(pa.field(field.name, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(field)
+    table = table.cast(pa.schema(fields))
+
+    timestamps = pa.array([generated_at] * table.num_rows, type=pa.timestamp("ms"))
+    return table.append_column("generated_at", timestamps)
+
+
+def write_partition(dataset_dir: str, frame: pd.DataFrame, symbol: str, data_type: str,
+                    generated_at: Optional[datetime] = None) -> str:
+    """
+    Append a frame to the dataset under its symbol/data_type/run_date partition
+
+    Returns:
+        Path of the written Parquet file
+    """
+    import pyarrow.parquet as pq
+
+    generated_at = generated_at or datetime.now()
+    partition_dir = os.path.join(
+        dataset_dir,
+        f"symbol={symbol.upper()}",
+        f"data_type={data_type.replace('-', '_').upper()}",
+        f"run_date={generated_at.strftime('%Y-%m-%d')}",
+    )
+    os.makedirs(partition_dir, exist_ok=True)
+
+    path = os.path.join(partition_dir, f"part-{generated_at.strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet")
+    pq.write_table(_typed_table(frame, generated_at), path, compression="zstd")
+    return path
+
+
+def read_dataset(dataset_dir: str, symbol: Optional[str] = None, data_type: Optional[str] = None,
+                 columns: Optional[list] = None) -> pd.DataFrame:
+    """
+    Read the dataset (optionally one symbol and/or data type) in a single scan
+
+    Partition keys come back as columns, so rows from many runs can be grouped by
+    symbol, data_type, run_date and generated_at.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(dataset_dir, format="parquet", partitioning="hive")
+    expression = None
+    if symbol:
+        expression = ds.field("symbol") == symbol.upper()
+    if data_type:
+        condition = ds.field("data_type") == data_type.replace('-', '_').upper()
+        expression = condition if expression is None else expression & condition
+
+    # Data types have different columns and column types can drift between runs, so
+    # unify the schemas of the selected files instead of taking the first file's schema
+    fragments = list(dataset.get_fragments(filter=expression))
+    if not fragments:
+        return pd.DataFrame(columns=columns or [])
+    schema = _unify_schemas([f.physical_schema for f in fragments] + [dataset.partitioning.schema])
+    selected = ds.dataset([f.path for f in fragments], schema=schema, format="parquet",
+                          partitioning=dataset.partitioning, partition_base_dir=dataset_dir)
+    return selected.to_table(columns=columns).to_pandas()
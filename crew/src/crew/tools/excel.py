@@ -0,0 +1,143 @@
+"""
+Streaming Excel export
+
+Workbooks are written with openpyxl's write-only mode: rows are appended to
+each sheet as they are produced and flushed to disk, so memory stays flat no
+matter how many quarters or data types a workbook holds. Rows are taken
+straight from the tool's record dicts; no DataFrames are built.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Excel limits sheet names to 31 characters
+MAX_SHEET_NAME = 31
+
+# Keys left out of the flattened valuation summary sheet (written as their own sheets)
+VALUATION_TABLES = ("cash_flow_projections", "company_profile")
+
+
+def _cell(value):
+    """Excel-safe cell value (nested structures are written as text)"""
+    if value is None or isinstance(value, (str, int, float, bool, datetime)):
+        return value
+    return str(value)
+
+
+def _columns(records: List[Dict]) -> List[str]:
+    """Union of record keys in first-seen order"""
+    columns = {}
+    for record in records:
+        for key in record:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def record_rows(records: List[Dict]) -> Tuple[List[str], Iterable[list]]:
+    """Header and a lazy row iterator for a list of record dicts"""
+    columns = _columns(records)
+    return columns, ([_cell(record.get(c)) for c in columns] for record in records)
+
+
+def _flatten(data: Dict, prefix: str = "") -> Dict:
+    """Flatten nested dicts into underscore-joined keys"""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}_"))
+        else:
+            flat[name] = value
+    return flat
+
+
+def data_sheets(data: Union[Dict, List], name: str = "Financial_Data",
+                include_summary: bool = True) -> Dict[str, Tuple[List[str], Iterable[list]]]:
+    """
+    Sheets (name -> header, rows) for one tool output
+
+    DCF data and raw statements go to a Financial_Data sheet, UFCF to
+    UFCF_Calculations and a valuation to a flattened Valuation sheet plus its
+    projections. The Summary sheet mirrors the one the tool has always written.
+    """
+    generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    sheets = {}
+
+    if isinstance(data, list):  # Direct API response
+        sheets[name] = record_rows(data)
+    elif "data" in data:  # DCF data structure
+        sheets[name] = record_rows(data["data"])
+        if include_summary:
+            sheets["Summary"] = (["Symbol", "Period", "Years_of_Data", "Generated_Date"],
+                                 [[data.get("symbol", "N/A"), data.get("period", "N/A"),
+                                   data.get("years_of_data", 0), generated]])
+    elif "ufcf_calculations" in data:  # UFCF data structure
+        sheets["UFCF_Calculations" if name == "Financial_Data" else name] = record_rows(data["ufcf_calculations"])
+        if include_summary:
+            sheets["Summary"] = (["Symbol", "Generated_Date"], [[data.get("symbol", "N/A"), generated]])
+    elif "valuation_summary" in data:  # Valuation structure
+        summary = _flatten({k: v for k, v in data.items() if k not in VALUATION_TABLES})
+        sheets["Valuation" if name == "Financial_Data" else name] = (["Item", "Value"],
+                                                                     ([k, _cell(v)] for k, v in summary.items()))
+        if data.get("cash_flow_projections"):
+            sheets["Cash_Flow_Projections"] = record_rows(data["cash_flow_projections"])
+    return sheets
+
+
+def write_workbook(path: str, sheets: Dict[str, Tuple[List[str], Iterable[list]]]) -> str:
+    """
+    Stream sheets into a write-only workbook
+
+    Args:
+        path: Output .xlsx path
+        sheets: Sheet name -> (header, row iterable), in sheet order
+
+    Returns:
+        The written path
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    used = set()
+    for name, (header, rows) in sheets.items():
+        title = name[:MAX_SHEET_NAME]
+        suffix = 2
+        while title in used:
+            title = f"{name[:MAX_SHEET_NAME - 3]}_{suffix}"
+            suffix += 1
+        used.add(title)
+
+        sheet = workbook.create_sheet(title)
+        sheet.append(list(header))
+        for row in rows:
+            sheet.append(row)
+
+    if not used:
+        workbook.create_sheet("Summary").append(["No data"])
+    workbook.save(path)
+    return path
+
+
+def write_symbol_workbook(path: str, symbol: str, sections: Dict[str, Union[Dict, List]],
+                          generated_at: Optional[datetime] = None) -> str:
+    """
+    One workbook with a sheet per data type for a symbol
+
+    Args:
+        path: Output .xlsx path
+        symbol: Stock symbol
+        sections: Data type (e.g. 'dcf', 'income-statement') -> tool output
+
+    Returns:
+        The written path
+    """
+    generated_at = generated_at or datetime.now()
+    sheets = {"Summary": (["Symbol", "Data_Types", "Generated_Date"],
+                          [[symbol, ", ".join(sections), generated_at.strftime("%Y-%m-%d %H:%M:%S")]])}
+    for data_type, data in sections.items():
+        if not data or (isinstance(data, dict) and "error" in data):
+            continue
+        name = data_type.replace("-", "_").upper()
+        for sheet_name, sheet in data_sheets(data, name, include_summary=False).items():
+            sheets[sheet_name if sheet_name == name else f"{name}_{sheet_name}"] = sheet
+    return write_workbook(path, sheets)
@@ -0,0 +1,132 @@
+"""
+Background export queue
+
+File writes (Parquet, CSV, Excel) are handed to a small thread pool so the
+tool can return its result to the agent as soon as the data is computed.
+The number of queued writes is bounded: submit() blocks once max_pending
+writes are outstanding, which keeps memory flat when an agent fires many
+calls. Finished writes are recorded with their path (or error) and
+flush()/close() drain the queue; close() also runs at interpreter exit.
+"""
+
+import atexit
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+class ExportQueue:
+    """Bounded queue of file writes executed on background threads"""
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 32, history: int = 1000):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fmp-export")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._completed = deque(maxlen=history)
+        self._submitted = 0
+        self._failed = 0
+        self._closed = False
+        atexit.register(self.close)
+
+    def submit(self, key: str, func: Callable[..., str], *args, **kwargs) -> Future:
+        """
+        Queue one write; func returns the written path
+
+        Blocks while max_pending writes are outstanding. The returned future
+        resolves to the path (or raises the write's exception).
+        """
+        if self._closed:
+            raise RuntimeError("Export queue is closed")
+
+        self._slots.acquire()
+        started = time.perf_counter()
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except RuntimeError:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._submitted += 1
+            self._pending.add(future)
+        future.add_done_callback(lambda f: self._record(key, f, started))
+        return future
+
+    def _record(self, key: str, future: Future, started: float):
+        """Store the outcome of a finished write and free its slot"""
+        entry = {"key": key, "path": None, "error": None,
+                 "seconds": round(time.perf_counter() - started, 3)}
+        error = future.exception()
+        if error is not None:
+            entry["error"] = f"{type(error).__name__}: {error}"
+        else:
+            path = future.result()
+            # save_to_* report problems as "Error: ..." strings instead of raising
+            if isinstance(path, str) and path.startswith("Error:"):
+                entry["error"] = path
+            else:
+                entry["path"] = path
+
+        with self._lock:
+            self._pending.discard(future)
+            self._completed.append(entry)
+            if entry["error"]:
+                self._failed += 1
+        self._slots.release()
+
+        if entry["error"]:
+            print(f"❌ Background export {key} failed: {entry['error']}")
+
+    def flush(self, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Wait until every queued write has finished
+
+        Returns:
+            The recorded outcomes (key, path, error, seconds), oldest first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                pending = list(self._pending)
+            if not pending:
+                break
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            for future in pending:
+                try:
+                    future.exception(timeout=remaining)
+                except Exception:
+                    pass
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        return self.completed()
+
+    def completed(self) -> List[Dict]:
+        """Outcomes of finished writes, oldest first"""
+        with self._lock:
+            return list(self._completed)
+
+    def stats(self) -> Dict:
+        """Queue depth and write counters"""
+        with self._lock:
+            return {
+                "submitted": self._submitted,
+                "pending": len(self._pending),
+                "completed": self._submitted - len(self._pending),
+                "failed": self._failed,
+                "max_pending": self.max_pending,
+                "workers": self.max_workers,
+            }
+
+    def close(self, timeout: Optional[float] = None):
+        """Flush outstanding writes and stop the worker threads"""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._executor.shutdown(wait=timeout is None)
+        atexit.unregister(self.close)
@@ -1,17 +1,57 @@
+import asyncio
 import os
 import re
-import requests
-import pandas as pd
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 from dotenv import load_dotenv
-from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-# Load environment variables
-load_dotenv()
+from .cache import ResponseCache
+from .client import FMPClient, FMPError, FMPNoDataError
+from .excel import data_sheets, write_symbol_workbook, write_workbook
+from .export import ExportQueue
+from .history import StatementHistory
+from .montecarlo import simulate_dcf
+from .rate_limit import RateLimiter
+from .store import ExportStore, payload_digest
+from .valuation import QUARTERS_PER_YEAR, dcf_sensitivity_grid, grid_to_lists, shares_outstanding_from_profile
+
+# pandas (and the panel/TTM/Parquet modules built on it) is imported where it is
+# used, and crewai only when the FMPTool class is first accessed, so importing this
+# module stays cheap for CLIs, tests and server boot
+if TYPE_CHECKING:
+    import pandas as pd
+    from .panel import FinancialPanel
+
+# Endpoints each data_type needs. Derived calculations receive the fetched
+# bundle instead of calling the API again, so each endpoint is hit once per call graph.
+FETCH_PLANS = {
+    "income-statement": ("income",),
+    "cash-flow-statement": ("cashflow",),
+    "dcf": ("income", "cashflow"),
+    "ufcf": ("income", "cashflow"),
+    "ttm": ("income", "cashflow"),
+    "valuation": ("income", "cashflow", "quote", "profile"),
+    "comprehensive": ("income", "cashflow"),
+}
+
+# Alternative data_type spellings accepted from LLM/agent calls
+DATA_TYPE_ALIASES = {
+    "income": "income-statement",
+    "cashflow": "cash-flow-statement",
+    "cash-flow": "cash-flow-statement",
+}
+
+class FMPToolBase(BaseModel):
+    """
+    FMP data access, valuation and export logic without the crewai tool interface
+
+    Use it directly where no agent is involved (batch jobs, CLIs); FMPTool adds
+    crewai's BaseTool on top for the agents.
+    """
 
-class FMPTool(BaseTool):
     name: str = "FMP Financial Data Tool"
     description: str = """
     Fetches financial data from Financial Modeling Prep API for DCF analysis.
@@ -24,11 +64,12 @@ class FMPTool(BaseTool):
         * 'cash-flow-statement' - Cash flow statement data
         * 'ufcf' - Unlevered Free Cash Flow calculations
         * 'valuation' - Complete DCF valuation with intrinsic value
+        * 'ttm' - Trailing-twelve-month figures from quarterly statements
         * 'comprehensive' - All data types
-    - period (str): 'annual' or 'quarter' (default: 'annual')
-    - years (int): Number of years of data (default: 5)
+    - period (str): 'annual' or 'quarter' (default: 'annual'); quarterly valuations use TTM figures
+    - years (int): Number of years of data (default: 5, i.e. 20 quarters for period='quarter')
     - save_to_file (bool): Save results to files (default: True)
-    - save_format (str): 'csv', 'excel', or 'both' (default: 'both')
+    - save_format (str): 'parquet', 'csv', 'excel', or 'both' (csv + excel) (default: 'parquet')
     
     Returns: Financial data and analysis results
     """
@@ -38,7 +79,55 @@ class FMPTool(BaseTool):
     base_url: str = Field(default="https://financialmodelingprep.com/api/v3")
     data_dir: str = Field(default="")
     
+    # HTTP client settings
+    connect_timeout: float = Field(default=3.05)
+    read_timeout: float = Field(default=30.0)
+    max_retries: int = Field(default=3)
+    backoff_factor: float = Field(default=0.5)
+    # Maximum number of FMP requests in flight for one call
+    max_concurrency: int = Field(default=4)
+    
+    # Response cache settings (TTLs in seconds, cache_path defaults to data_dir/fmp_cache.sqlite3)
+    cache_enabled: bool = Field(default=True)
+    cache_path: str = Field(default="")
+    cache_max_bytes: int = Field(default=64 * 1024 * 1024)
+    statement_ttl: float = Field(default=7 * 24 * 3600)
+    profile_ttl: float = Field(default=24 * 3600)
+    quote_ttl: float = Field(default=60)
+    
+    # Shared rate limit across threads and worker processes (0 disables it);
+    # defaults to FMP_CALLS_PER_MINUTE or 300, state in data_dir/fmp_ratelimit.sqlite3
+    calls_per_minute: int = Field(default=300)
+    rate_limit_path: str = Field(default="")
+    
+    # Incremental statement sync: keep each symbol's statement history in
+    # data_dir/fmp_history.sqlite3 and only fetch the newest sync_probe_periods periods
+    incremental_sync: bool = Field(default=False)
+    sync_probe_periods: int = Field(default=2)
+    
+    # File exports run on a bounded background queue so _run returns once data is computed
+    background_exports: bool = Field(default=True)
+    export_workers: int = Field(default=4)
+    export_queue_size: int = Field(default=32)
+    
+    # Identical CSV/Excel payloads reuse the earlier file instead of writing a new timestamped copy;
+    # retention of those exports is applied by compact_exports() / python -m src.crew.tools.store compact
+    dedupe_exports: bool = Field(default=True)
+    retention_keep_last: int = Field(default=10)
+    retention_max_age_days: float = Field(default=90)
+    retention_max_bytes: int = Field(default=1024 * 1024 * 1024)
+    
+    _client: FMPClient = PrivateAttr(default=None)
+    _rate_limiter: Optional[RateLimiter] = PrivateAttr(default=None)
+    _cache: Optional[ResponseCache] = PrivateAttr(default=None)
+    _exports: ExportQueue = PrivateAttr(default=None)
+    _store: Optional[ExportStore] = PrivateAttr(default=None)
+    _history: Optional[StatementHistory] = PrivateAttr(default=None)
+    
     def __init__(self, **kwargs):
+        # Load environment variables
+        load_dotenv()
+        
         # Get API key from environment
         api_key = os.getenv('FMP_API_KEY', '')
         if not api_key:
@@ -48,6 +137,8 @@ class FMPTool(BaseTool):
         data_dir = os.path.join(os.getcwd(), "financial_data")
         os.makedirs(data_dir, exist_ok=True)
         
+        kwargs.setdefault('calls_per_minute', int(os.getenv('FMP_CALLS_PER_MINUTE', '300')))
+        
         # Initialize with proper field values
         super().__init__(
             api_key=api_key,
@@ -55,21 +146,123 @@ class FMPTool(BaseTool):
             data_dir=data_dir,
             **kwargs
         )
+        
+        if self.calls_per_minute > 0:
+            self._rate_limiter = RateLimiter(
+                self.rate_limit_path or os.path.join(self.data_dir, "fmp_ratelimit.sqlite3"),
+                calls_per_minute=self.calls_per_minute
+            )
+        
+        # One pooled, keep-alive client per tool instance
+        self._client = FMPClient(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            max_retries=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            rate_limiter=self._rate_limiter
+        )
+        
+        if self.cache_enabled:
+            self._cache = ResponseCache(
+                self.cache_path or os.path.join(self.data_dir, "fmp_cache.sqlite3"),
+                ttls={"statement": self.statement_ttl, "profile": self.profile_ttl, "quote": self.quote_ttl},
+                max_bytes=self.cache_max_bytes
+            )
+        
+        if self.incremental_sync:
+            self._history = StatementHistory(
+                os.path.join(self.data_dir, "fmp_history.sqlite3"),
+                probe_periods=self.sync_probe_periods
+            )
+        
+        self._exports = ExportQueue(max_workers=self.export_workers, max_pending=self.export_queue_size)
+        if self.dedupe_exports:
+            self._store = ExportStore(self.data_dir)
     
-    def _make_request(self, endpoint: str) -> Optional[List[Dict]]:
-        """Make a request to the FMP API"""
-        url = f"{self.base_url}{endpoint}"
-        params = {"apikey": self.api_key}
+    def _make_request(self, endpoint: str, params: Optional[Dict] = None,
+                      refresh: bool = False) -> Union[List[Dict], Dict]:
+        """
+        Make a request to the FMP API, serving it from the response cache when possible
         
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching data from {url}: {e}")
-            return None
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
+            refresh: Skip the cache lookup and replace the cached response
+        
+        Raises:
+            FMPNoDataError: FMP returned no data for the request
+            FMPTransportError: The request failed after retries
+        """
+        if self._cache is not None and not refresh:
+            cached = self._cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+        
+        data = self._client.get(endpoint, params)
+        
+        if self._cache is not None:
+            self._cache.set(endpoint, params, data)
+        return data
+    
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters and size of the response cache"""
+        if self._cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._cache.stats()}
+    
+    def rate_limit_stats(self) -> Dict:
+        """Wait-time metrics of the shared FMP rate limiter"""
+        if self._rate_limiter is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._rate_limiter.stats()}
+    
+    def sync_stats(self) -> Dict:
+        """Full/incremental sync counters of the local statement history"""
+        if self._history is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._history.stats()}
+    
+    def export_stats(self) -> Dict:
+        """Depth and counters of the background export queue"""
+        stats = {"background": self.background_exports, **self._exports.stats()}
+        if self._store is not None:
+            stats["store"] = self._store.stats()
+        return stats
+    
+    def flush_exports(self, timeout: Optional[float] = None) -> List[Dict]:
+        """Wait for queued file exports and return their outcomes (key, path, error, seconds)"""
+        return self._exports.flush(timeout)
+    
+    def compact_exports(self, limit: int = 1000) -> Dict:
+        """
+        One incremental pass of export deduplication and retention
+        
+        Untracked CSV/Excel exports in data_dir are indexed (byte-identical copies
+        become hard links) and objects outside the retention_* policy are removed,
+        at most limit of each per call. The Parquet dataset is never pruned.
+        """
+        store = self._store or ExportStore(self.data_dir)
+        return store.compact(
+            keep_last=self.retention_keep_last or None,
+            max_age=self.retention_max_age_days * 86400 if self.retention_max_age_days else None,
+            max_bytes=self.retention_max_bytes or None,
+            limit=limit
+        )
+    
+    def close(self):
+        """Flush pending exports and release the HTTP session, cache and export index"""
+        self._exports.close()
+        self._client.close()
+        if self._cache is not None:
+            self._cache.close()
+        if self._store is not None:
+            self._store.close()
+        if self._history is not None:
+            self._history.close()
     
-    def get_income_statement(self, symbol: str, period: str = "annual", limit: int = 5) -> Optional[List[Dict]]:
+    def get_income_statement(self, symbol: str, period: str = "annual", limit: int = 5) -> List[Dict]:
         """
         Get income statement data for a company
         
@@ -77,12 +270,13 @@ class FMPTool(BaseTool):
             symbol: Stock symbol (e.g., 'AAPL')
             period: 'annual' or 'quarter'
             limit: Number of periods to fetch
+        
+        Raises:
+            FMPError: If the statement could not be fetched
         """
-        endpoint = f"/income-statement/{symbol}"
-        params = f"?period={period}&limit={limit}"
-        return self._make_request(endpoint + params)
+        return self._get_statement(f"/income-statement/{symbol}", "income", symbol, period, limit)
     
-    def get_cash_flow_statement(self, symbol: str, period: str = "annual", limit: int = 5) -> Optional[List[Dict]]:
+    def get_cash_flow_statement(self, symbol: str, period: str = "annual", limit: int = 5) -> List[Dict]:
         """
         Get cash flow statement data for a company
         
@@ -90,12 +284,97 @@ class FMPTool(BaseTool):
             symbol: Stock symbol (e.g., 'AAPL')
             period: 'annual' or 'quarter'
             limit: Number of periods to fetch
+        
+        Raises:
+            FMPError: If the statement could not be fetched
         """
-        endpoint = f"/cash-flow-statement/{symbol}"
-        params = f"?period={period}&limit={limit}"
-        return self._make_request(endpoint + params)
+        return self._get_statement(f"/cash-flow-statement/{symbol}", "cashflow", symbol, period, limit)
     
-    def get_dcf_data(self, symbol: str, period: str = "annual", years: int = 5) -> Dict:
+    def _get_statement(self, endpoint: str, statement: str, symbol: str, period: str, limit: int) -> List[Dict]:
+        """Fetch a statement, through the local history when incremental_sync is on"""
+        if self._history is None:
+            return self._make_request(endpoint, {"period": period, "limit": limit})
+        return self._history.sync(
+            symbol, statement, period, limit,
+            lambda count: self._make_request(endpoint, {"period": period, "limit": count}),
+            probe=lambda count: self._make_request(endpoint, {"period": period, "limit": count}, refresh=True)
+        )
+    
+    def fetch_plan(self, data_type: str) -> tuple:
+        """Return the endpoints ('income', 'cashflow', 'quote', 'profile') a data_type needs"""
+        return FETCH_PLANS.get(data_type, ())
+    
+    def fetch_data(self, symbol: str, period: str = "annual", years: int = 5,
+                   endpoints: tuple = ("income", "cashflow"), data: Optional[Dict] = None) -> Dict:
+        """
+        Fetch each requested endpoint exactly once
+        
+        Args:
+            symbol: Stock symbol (e.g., 'AAPL')
+            period: 'annual' or 'quarter'
+            years: Number of periods of statement data
+            endpoints: Endpoint names from FETCH_PLANS
+            data: Previously fetched bundle; endpoints already present are not fetched again
+        
+        Returns:
+            Bundle mapping endpoint name to its payload
+        
+        Raises:
+            FMPError: If a statement could not be fetched
+        """
+        fetchers = self._fetchers(symbol, period, years)
+        bundle = dict(data or {})
+        missing = [name for name in endpoints if name not in bundle]
+        
+        # The endpoints are independent, so fetch them side by side on the pooled client
+        if len(missing) > 1 and self.max_concurrency > 1:
+            with ThreadPoolExecutor(max_workers=min(len(missing), self.max_concurrency)) as executor:
+                futures = {name: executor.submit(fetchers[name]) for name in missing}
+                for name, future in futures.items():
+                    bundle[name] = future.result()
+        else:
+            for name in missing:
+                bundle[name] = fetchers[name]()
+        return bundle
+    
+    async def afetch_data(self, symbol: str, period: str = "annual", years: int = 5,
+                          endpoints: tuple = ("income", "cashflow"), data: Optional[Dict] = None) -> Dict:
+        """
+        Async version of fetch_data: issues the endpoint requests concurrently,
+        at most max_concurrency at a time
+        
+        Raises:
+            FMPError: If a statement could not be fetched
+        """
+        fetchers = self._fetchers(symbol, period, years)
+        bundle = dict(data or {})
+        missing = [name for name in endpoints if name not in bundle]
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        
+        async def fetch(name: str):
+            async with semaphore:
+                return await asyncio.to_thread(fetchers[name])
+        
+        results = await asyncio.gather(*(fetch(name) for name in missing))
+        bundle.update(zip(missing, results))
+        return bundle
+    
+    def statement_limit(self, period: str, years: int) -> int:
+        """Number of statement periods covering the requested years (4 per year for quarterly data)"""
+        return years * QUARTERS_PER_YEAR if period == "quarter" else years
+    
+    def _fetchers(self, symbol: str, period: str, years: int) -> Dict:
+        """Callables that fetch each endpoint of a bundle"""
+        limit = self.statement_limit(period, years)
+        return {
+            "income": lambda: self.get_income_statement(symbol, period, limit),
+            "cashflow": lambda: self.get_cash_flow_statement(symbol, period, limit),
+            "quote": lambda: self.get_current_price(symbol),
+            "profile": lambda: self.get_company_profile(symbol),
+        }
+    
+    def get_dcf_data(self, symbol: str, period: str = "annual", years: int = 5,
+                     data: Optional[Dict] = None) -> Dict:
         """
         Get all necessary data for DCF analysis
         
@@ -103,68 +382,86 @@ class FMPTool(BaseTool):
             symbol: Stock symbol (e.g., 'AAPL')
             period: 'annual' or 'quarter'
             years: Number of years of data to fetch
+            data: Pre-fetched bundle from fetch_data (fetched here if missing)
         
         Returns:
-            Dictionary containing all DCF relevant data
+            Dictionary containing all DCF relevant data (quarterly data also
+            includes the TTM figures under 'ttm')
         """
-        # Get income statement and cash flow data
-        income_data = self.get_income_statement(symbol, period, years)
-        cashflow_data = self.get_cash_flow_statement(symbol, period, years)
+        try:
+            panel = self.get_financial_panel(symbol, period, years, data)
+        except FMPError as e:
+            return {"error": f"Failed to fetch financial data: {e}", "error_type": e.kind}
+        except ValueError as e:
+            return {"error": str(e), "error_type": "no_data"}
+        
+        result = panel.to_dcf_dict()
+        if period == "quarter":
+            from .ttm import ttm_panel
+            result["ttm"] = ttm_panel(panel).to_dcf_dict()["data"]
+        return result
+    
+    def get_ttm_data(self, symbol: str, years: int = 5, data: Optional[Dict] = None) -> Dict:
+        """
+        Get trailing-twelve-month figures for every quarter with four quarters of history
         
-        if not income_data or not cashflow_data:
-            return {"error": "Failed to fetch financial data"}
+        Flow items are summed over the trailing four quarters and tax rate and UFCF
+        are derived from those sums.
         
-        dcf_data = {
-            "symbol": symbol,
-            "period": period,
-            "years_of_data": len(income_data),
-            "data": []
-        }
+        Args:
+            symbol: Stock symbol (e.g., 'AAPL')
+            years: Number of years of quarterly data to fetch
+            data: Pre-fetched quarterly bundle from fetch_data (fetched here if missing)
+        """
+        from .ttm import ttm_panel
         
-        # Process each year's data
-        for i in range(min(len(income_data), len(cashflow_data))):
-            income = income_data[i]
-            cashflow = cashflow_data[i]
-            
-            # Calculate tax rate (Income Tax Expense / Income Before Tax)
-            income_before_tax = income.get('incomeBeforeTax', 0)
-            income_tax_expense = income.get('incomeTaxExpense', 0)
-            tax_rate = (income_tax_expense / income_before_tax * 100) if income_before_tax != 0 else 0
-            
-            # Calculate working capital change
-            # Working Capital = Current Assets - Current Liabilities
-            # Change in Working Capital = Previous Year WC - Current Year WC
-            working_capital_change = cashflow.get('changeInWorkingCapital', 0)
-            
-            year_data = {
-                "date": income.get('date'),
-                "calendarYear": income.get('calendarYear'),
-                "period": income.get('period'),
-                
-                # DCF Components
-                "ebit": income.get('operatingIncome', 0),  # EBIT = Operating Income
-                "ebitda": income.get('ebitda', 0),
-                "tax_rate_percent": round(tax_rate, 2),
-                "tax_expense": income_tax_expense,
-                "income_before_tax": income_before_tax,
-                
-                # Cash Flow Components
-                "depreciation_amortization": cashflow.get('depreciationAndAmortization', 0),
-                "capex": abs(cashflow.get('capitalExpenditure', 0)),  # Make positive for DCF
-                "working_capital_change": working_capital_change,
-                
-                # Additional useful metrics
-                "revenue": income.get('revenue', 0),
-                "net_income": income.get('netIncome', 0),
-                "free_cash_flow": cashflow.get('freeCashFlow', 0),
-                "operating_cash_flow": cashflow.get('operatingCashFlow', 0),
-            }
-            
-            dcf_data["data"].append(year_data)
+        try:
+            panel = ttm_panel(self.get_financial_panel(symbol, "quarter", years, data))
+        except FMPError as e:
+            return {"error": f"Failed to fetch financial data: {e}", "error_type": e.kind}
+        except ValueError as e:
+            return {"error": str(e), "error_type": "no_data"}
+        
+        result = panel.to_dcf_dict()
+        for record, ufcf in zip(result["data"], panel.ufcf.tolist()):
+            record["unlevered_free_cash_flow"] = ufcf
+        return result
+    
+    def valuation_panel(self, symbol: str, period: str = "annual", years: int = 5,
+                        data: Optional[Dict] = None) -> "FinancialPanel":
+        """
+        Panel with one row per discounting year (TTM sampled yearly for quarterly data)
         
-        return dcf_data
+        Raises:
+            FMPError: If a statement could not be fetched
+            ValueError: If the statements share no fiscal period or lack four consecutive quarters
+        """
+        from .ttm import annualize
+        
+        return annualize(self.get_financial_panel(symbol, period, years, data), years)
     
-    def calculate_unlevered_free_cash_flow(self, symbol: str, period: str = "annual", years: int = 5) -> Dict:
+    def get_financial_panel(self, symbol: str, period: str = "annual", years: int = 5,
+                            data: Optional[Dict] = None) -> "FinancialPanel":
+        """
+        Get income and cash flow statements joined into a columnar FinancialPanel
+        
+        Args:
+            symbol: Stock symbol (e.g., 'AAPL')
+            period: 'annual' or 'quarter'
+            years: Number of years of data to fetch
+            data: Pre-fetched bundle from fetch_data (fetched here if missing)
+        
+        Raises:
+            FMPError: If a statement could not be fetched
+            ValueError: If the statements share no fiscal period
+        """
+        from .panel import FinancialPanel
+        
+        data = self.fetch_data(symbol, period, years, self.fetch_plan("dcf"), data)
+        return FinancialPanel.from_statements(symbol, period, data["income"], data["cashflow"])
+    
+    def calculate_unlevered_free_cash_flow(self, symbol: str, period: str = "annual", years: int = 5,
+                                           data: Optional[Dict] = None) -> Dict:
         """
         Calculate Unlevered Free Cash Flow (UFCF) for DCF analysis
         UFCF = EBIT * (1 - Tax Rate) + Depreciation - CapEx - Change in Working Capital
@@ -173,46 +470,19 @@ class FMPTool(BaseTool):
             symbol: Stock symbol
             period: 'annual' or 'quarter'
             years: Number of years of data
+            data: Pre-fetched bundle from fetch_data (fetched here if missing)
         """
-        dcf_data = self.get_dcf_data(symbol, period, years)
-        
-        if "error" in dcf_data:
-            return dcf_data
-        
-        ufcf_data = {
-            "symbol": symbol,
-            "ufcf_calculations": []
-        }
-        
-        for year_data in dcf_data["data"]:
-            ebit = year_data["ebit"]
-            tax_rate = year_data["tax_rate_percent"] / 100
-            depreciation = year_data["depreciation_amortization"]
-            capex = year_data["capex"]
-            wc_change = year_data["working_capital_change"]
-            
-            # UFCF Calculation
-            ebit_after_tax = ebit * (1 - tax_rate)
-            ufcf = ebit_after_tax + depreciation - capex - wc_change
-            
-            ufcf_calc = {
-                "date": year_data["date"],
-                "year": year_data["calendarYear"],
-                "ebit": ebit,
-                "tax_rate": tax_rate,
-                "ebit_after_tax": round(ebit_after_tax, 0),
-                "depreciation_amortization": depreciation,
-                "capex": capex,
-                "working_capital_change": wc_change,
-                "unlevered_free_cash_flow": round(ufcf, 0)
-            }
-            
-            ufcf_data["ufcf_calculations"].append(ufcf_calc)
+        try:
+            panel = self.get_financial_panel(symbol, period, years, data)
+        except FMPError as e:
+            return {"error": f"Failed to fetch financial data: {e}", "error_type": e.kind}
+        except ValueError as e:
+            return {"error": str(e), "error_type": "no_data"}
         
-        return ufcf_data
+        return panel.to_ufcf_dict()
     
     def _run(self, symbol: str = None, data_type: str = "dcf", period: str = "annual", 
-             years: int = 5, save_to_file: bool = True, save_format: str = "both", 
+             years: int = 5, save_to_file: bool = True, save_format: str = "parquet", 
              **kwargs) -> str:
         """
         Main execution method for the tool
@@ -223,12 +493,55 @@ class FMPTool(BaseTool):
             period: 'annual' or 'quarter'
             years: Number of years of data
             save_to_file: Whether to save data to files
-            save_format: 'csv', 'excel', or 'both'
+            save_format: 'parquet', 'csv', 'excel', or 'both' (csv + excel)
             **kwargs: Additional parameters for flexibility (handles various parameter names from LLM)
         """
         # Debug logging
         print(f"🔍 FMP Tool called with: symbol={symbol}, data_type={data_type}, kwargs={kwargs}")
         
+        symbol, data_type, period, years, save_to_file = self._normalize_args(
+            symbol, data_type, period, years, save_to_file, kwargs
+        )
+        
+        print(f"🔍 After parameter processing: symbol={symbol}, data_type={data_type}")
+        
+        error = self._validate_symbol(symbol)
+        if error:
+            return error
+        
+        return self._execute(symbol.upper(), data_type, period, years, save_to_file, save_format)
+    
+    async def _arun(self, symbol: str = None, data_type: str = "dcf", period: str = "annual",
+                    years: int = 5, save_to_file: bool = True, save_format: str = "parquet",
+                    **kwargs) -> str:
+        """
+        Async execution method for the tool
+        
+        Fetches every endpoint the data_type needs concurrently, then runs the same
+        calculations and file saving as _run in a worker thread.
+        """
+        print(f"🔍 FMP Tool (async) called with: symbol={symbol}, data_type={data_type}, kwargs={kwargs}")
+        
+        symbol, data_type, period, years, save_to_file = self._normalize_args(
+            symbol, data_type, period, years, save_to_file, kwargs
+        )
+        
+        error = self._validate_symbol(symbol)
+        if error:
+            return error
+        symbol = symbol.upper()
+        
+        try:
+            data = await self.afetch_data(symbol, period, years, self.fetch_plan(data_type))
+        except FMPError as e:
+            return self._format_fetch_error(e, symbol, data_type)
+        
+        return await asyncio.to_thread(
+            self._execute, symbol, data_type, period, years, save_to_file, save_format, data
+        )
+    
+    def _normalize_args(self, symbol, data_type, period, years, save_to_file, kwargs: Dict) -> tuple:
+        """Map the various parameter names used by LLM/agent calls onto the tool's arguments"""
         # Handle various parameter name variations from LLM/agent calls
         if symbol is None:
             symbol = kwargs.get('stock_symbol', kwargs.get('ticker', ''))
@@ -238,6 +551,7 @@ class FMPTool(BaseTool):
             data_type = kwargs['datatype']
         elif 'type' in kwargs:
             data_type = kwargs['type']
+        data_type = DATA_TYPE_ALIASES.get(data_type, data_type)
         
         # Handle period variations
         if 'timeframe' in kwargs:
@@ -255,8 +569,14 @@ class FMPTool(BaseTool):
         if 'sav' in kwargs or 'save' in kwargs:
             save_to_file = kwargs.get('sav', kwargs.get('save', save_to_file))
         
-        print(f"🔍 After parameter processing: symbol={symbol}, data_type={data_type}")
+        # TTM figures are always built from quarterly statements
+        if data_type == "ttm":
+            period = "quarter"
         
+        return symbol, data_type, period, years, save_to_file
+    
+    def _validate_symbol(self, symbol: Optional[str]) -> Optional[str]:
+        """Return an error message if the symbol is missing or malformed, else None"""
         if not symbol:
             return "Error: No stock symbol provided. Please specify a symbol parameter."
         
@@ -270,46 +590,119 @@ class FMPTool(BaseTool):
         invalid_symbols = ['NSIVE', 'NSVE', 'COMPR', 'COMP', 'ANALY', 'ANAL', 'REPOR', 'REPO', 'STUDI', 'STUD', 'HENSI', 'HENS']
         if symbol in invalid_symbols:
             return f"Error: '{symbol}' appears to be a parsing error, not a valid stock symbol. Please provide a valid company name or stock symbol."
-        
+        return None
+    
+    def _format_fetch_error(self, error: FMPError, symbol: str, data_type: str) -> str:
+        """Describe a fetch failure, distinguishing missing data from transport problems"""
+        if isinstance(error, FMPNoDataError):
+            return f"No {data_type} data available for {symbol}: {error}"
+        return f"Error: FMP API request failed for {symbol} ({data_type}): {error}"
+    
+    def _execute(self, symbol: str, data_type: str, period: str, years: int, save_to_file: bool,
+                 save_format: str, data: Optional[Dict] = None) -> str:
+        """Compute the requested data_type (from a pre-fetched bundle if given) and save it"""
         # Handle different data_type variations
-        if data_type in ["income-statement", "income"]:
-            result = self.get_income_statement(symbol, period, years)
-        elif data_type in ["cash-flow-statement", "cashflow", "cash-flow"]:
-            result = self.get_cash_flow_statement(symbol, period, years)
-        elif data_type == "dcf":
-            result = self.get_dcf_data(symbol, period, years)
-        elif data_type == "ufcf":
-            result = self.calculate_unlevered_free_cash_flow(symbol, period, years)
-        elif data_type == "valuation":
-            result = self.calculate_dcf_valuation(symbol, period, years)
-        elif data_type == "comprehensive":
-            # Create comprehensive report with all data types
-            file_paths = self.create_comprehensive_report(symbol, period, years, save_format)
-            return f"Comprehensive report created for {symbol}. Files saved: {file_paths}"
-        else:
-            return f"Invalid data_type '{data_type}'. Choose from: 'dcf', 'income-statement', 'cash-flow-statement', 'ufcf', 'valuation', 'comprehensive'"
+        try:
+            if data_type == "income-statement":
+                result = self.fetch_data(symbol, period, years, ("income",), data)["income"]
+            elif data_type == "cash-flow-statement":
+                result = self.fetch_data(symbol, period, years, ("cashflow",), data)["cashflow"]
+            elif data_type == "dcf":
+                result = self.get_dcf_data(symbol, period, years, data)
+            elif data_type == "ufcf":
+                result = self.calculate_unlevered_free_cash_flow(symbol, period, years, data)
+            elif data_type == "ttm":
+                result = self.get_ttm_data(symbol, years, data)
+            elif data_type == "valuation":
+                result = self.calculate_dcf_valuation(symbol, period, years, data=data)
+            elif data_type == "comprehensive":
+                # Create comprehensive report with all data types
+                file_paths = self.create_comprehensive_report(symbol, period, years, save_format, data,
+                                                              wait=not self.background_exports)
+                if "error" in file_paths:
+                    return f"Failed to create comprehensive report for {symbol}: {file_paths['error']}"
+                if self.background_exports:
+                    return f"Comprehensive report created for {symbol}. Files queued for export to {self.data_dir}: {list(file_paths)}"
+                return f"Comprehensive report created for {symbol}. Files saved: {file_paths}"
+            else:
+                return f"Invalid data_type '{data_type}'. Choose from: 'dcf', 'income-statement', 'cash-flow-statement', 'ufcf', 'ttm', 'valuation', 'comprehensive'"
+        except FMPError as e:
+            return self._format_fetch_error(e, symbol, data_type)
         
         if result and "error" not in result:
             # Save to file if requested
             if save_to_file:
-                file_paths = []
                 filename = f"{symbol}_{data_type.replace('-', '_').upper()}_Data"
+                jobs = {}
+                
+                if save_format == "parquet":
+                    jobs["Parquet"] = (self.save_to_parquet, result, symbol, data_type)
                 
                 if save_format in ["csv", "both"]:
-                    csv_path = self.save_to_csv(result, filename)
-                    file_paths.append(f"CSV: {csv_path}")
+                    jobs["CSV"] = (self.save_to_csv, result, filename)
                 
                 if save_format in ["excel", "both"]:
-                    excel_path = self.save_to_excel(result, filename)
-                    file_paths.append(f"Excel: {excel_path}")
+                    jobs["Excel"] = (self.save_to_excel, result, filename)
                 
-                file_info = " | ".join(file_paths) if file_paths else ""
+                file_paths = self._export(jobs, wait=not self.background_exports, label=filename)
+                if self.background_exports:
+                    file_info = f"{', '.join(file_paths)} (queued for export to {self.data_dir})"
+                else:
+                    file_info = " | ".join(f"{kind}: {path}" for kind, path in file_paths.items())
                 return f"Data fetched for {symbol} ({data_type}). Files saved: {file_info}\n\nData preview:\n{str(result)[:500]}..."
             
             return str(result)
         else:
+            if isinstance(result, dict) and result.get("error"):
+                return f"Failed to fetch {data_type} data for {symbol}: {result['error']}"
             return f"Failed to fetch {data_type} data for {symbol}"
     
+    def _export(self, jobs: Dict[str, tuple], wait: bool = True, label: str = "") -> Dict[str, str]:
+        """
+        Run file writes on the export queue
+        
+        Args:
+            jobs: Mapping of result key to (save function, *args)
+            wait: Block until all writes finish and return their paths; otherwise
+                  return right after queueing (outcomes via flush_exports)
+            label: Prefix for the keys recorded by the export queue
+        
+        Returns:
+            Mapping of result key to written path ('queued' when not waiting)
+        """
+        futures = {key: self._exports.submit(f"{label}:{key}" if label else key, func, *args)
+                   for key, (func, *args) in jobs.items()}
+        if not wait:
+            return {key: "queued" for key in futures}
+        
+        results = {}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                results[key] = f"Error: {e}"
+        return results
+    
+    def _stored(self, fmt: str, name: str, symbol: str, data_type: str, payload, write) -> str:
+        """
+        Write a timestamped CSV/Excel export unless an identical one exists
+        
+        Returns the existing file's path when the payload digest is already in the
+        export store, otherwise calls write() and indexes the new file.
+        """
+        if self._store is None:
+            return write()
+        
+        digest = payload_digest(fmt, name, payload)
+        existing = self._store.lookup(digest)
+        if existing is not None:
+            return existing
+        
+        path = write()
+        if path.startswith("Error:"):
+            return path
+        return self._store.add(digest, path, symbol, data_type, fmt)
+    
     def save_to_csv(self, data: Dict, filename: str) -> str:
         """
         Save financial data to CSV file
@@ -324,29 +717,70 @@ class FMPTool(BaseTool):
         if "error" in data:
             return f"Error: {data['error']}"
         
-        # Convert data to DataFrame based on data structure
-        if "data" in data:  # DCF data structure
-            df = pd.DataFrame(data["data"])
-        elif "ufcf_calculations" in data:  # UFCF data structure
-            df = pd.DataFrame(data["ufcf_calculations"])
-        elif isinstance(data, list):  # Direct API response
-            df = pd.DataFrame(data)
-        else:
+        df = self._to_frame(data)
+        if df is None:
             return "Error: Unsupported data format for CSV export"
         
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        csv_filename = f"{filename}_{timestamp}.csv"
-        csv_path = os.path.join(self.data_dir, csv_filename)
+        def write() -> str:
+            # Generate filename with timestamp
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            csv_filename = f"{filename}_{timestamp}.csv"
+            csv_path = os.path.join(self.data_dir, csv_filename)
+            
+            # Save to CSV
+            df.to_csv(csv_path, index=False)
+            return csv_path
+        
+        symbol, _, data_type = filename.partition("_")
+        return self._stored("csv", filename, symbol, data_type or filename, data, write)
+    
+    def _to_frame(self, data: Union[Dict, List]) -> Optional["pd.DataFrame"]:
+        """Convert tool output to a DataFrame based on its structure (None if unsupported)"""
+        import pandas as pd
         
-        # Save to CSV
-        df.to_csv(csv_path, index=False)
-        return csv_path
+        if isinstance(data, list):  # Direct API response
+            return pd.DataFrame(data)
+        if "data" in data:  # DCF data structure
+            return pd.DataFrame(data["data"])
+        if "ufcf_calculations" in data:  # UFCF data structure
+            return pd.DataFrame(data["ufcf_calculations"])
+        if "valuation_summary" in data:  # Valuation structure, flattened to one row
+            summary = {k: v for k, v in data.items() if k not in ("cash_flow_projections", "company_profile")}
+            return pd.json_normalize(summary, sep="_")
+        return None
+    
+    def save_to_parquet(self, data: Union[Dict, List], symbol: str, data_type: str) -> str:
+        """
+        Append financial data to the partitioned Parquet dataset in data_dir/dataset
+        
+        Args:
+            data: Financial data (tool output)
+            symbol: Stock symbol (partition key)
+            data_type: Data type, e.g. 'dcf' or 'income-statement' (partition key)
+        
+        Returns:
+            Full path to the written Parquet file
+        """
+        if isinstance(data, dict) and "error" in data:
+            return f"Error: {data['error']}"
+        
+        df = self._to_frame(data)
+        if df is None:
+            return "Error: Unsupported data format for Parquet export"
+        
+        from .dataset import write_partition
+        
+        # The dataset is an append-only history with one file per run, so it is neither
+        # deduplicated nor touched by compact_exports() retention
+        return write_partition(os.path.join(self.data_dir, "dataset"), df, symbol, data_type)
     
     def save_to_excel(self, data: Dict, filename: str, include_summary: bool = True) -> str:
         """
         Save financial data to Excel file with multiple sheets
         
+        Rows are streamed into a write-only workbook, so memory stays flat for
+        long quarterly histories.
+        
         Args:
             data: Financial data dictionary
             filename: Name of the Excel file (without extension)
@@ -355,50 +789,45 @@ class FMPTool(BaseTool):
         Returns:
             Full path to the saved Excel file
         """
-        if "error" in data:
+        if isinstance(data, dict) and "error" in data:
             return f"Error: {data['error']}"
         
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        excel_filename = f"{filename}_{timestamp}.xlsx"
-        excel_path = os.path.join(self.data_dir, excel_filename)
+        def write() -> str:
+            # Generate filename with timestamp
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            excel_filename = f"{filename}_{timestamp}.xlsx"
+            excel_path = os.path.join(self.data_dir, excel_filename)
+            
+            return write_workbook(excel_path, data_sheets(data, include_summary=include_summary))
         
-        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-            if "data" in data:  # DCF data structure
-                df = pd.DataFrame(data["data"])
-                df.to_excel(writer, sheet_name='Financial_Data', index=False)
-                
-                if include_summary:
-                    # Create summary sheet
-                    summary_data = {
-                        'Symbol': [data.get('symbol', 'N/A')],
-                        'Period': [data.get('period', 'N/A')],
-                        'Years_of_Data': [data.get('years_of_data', 0)],
-                        'Generated_Date': [datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
-                    }
-                    summary_df = pd.DataFrame(summary_data)
-                    summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                    
-            elif "ufcf_calculations" in data:  # UFCF data structure
-                df = pd.DataFrame(data["ufcf_calculations"])
-                df.to_excel(writer, sheet_name='UFCF_Calculations', index=False)
-                
-                if include_summary:
-                    summary_data = {
-                        'Symbol': [data.get('symbol', 'N/A')],
-                        'Generated_Date': [datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
-                    }
-                    summary_df = pd.DataFrame(summary_data)
-                    summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                    
-            elif isinstance(data, list):  # Direct API response
-                df = pd.DataFrame(data)
-                df.to_excel(writer, sheet_name='Financial_Data', index=False)
-        
-        return excel_path
+        symbol, _, data_type = filename.partition("_")
+        return self._stored("xlsx", f"{filename}:{include_summary}", symbol, data_type or filename, data, write)
+    
+    def save_symbol_workbook(self, symbol: str, sections: Dict[str, Union[Dict, List]],
+                             filename: Optional[str] = None) -> str:
+        """
+        Save all of a symbol's data types to one multi-sheet Excel workbook
+        
+        Args:
+            symbol: Stock symbol
+            sections: Data type (e.g. 'dcf', 'income-statement') -> tool output
+            filename: Name of the Excel file without extension (default: SYMBOL_Report)
+        
+        Returns:
+            Full path to the saved Excel file
+        """
+        filename = filename or f"{symbol}_Report"
+        
+        def write() -> str:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            excel_path = os.path.join(self.data_dir, f"{filename}_{timestamp}.xlsx")
+            return write_symbol_workbook(excel_path, symbol, sections)
+        
+        return self._stored("xlsx", filename, symbol, filename.partition("_")[2] or filename, sections, write)
     
     def create_comprehensive_report(self, symbol: str, period: str = "annual", years: int = 5, 
-                                  save_format: str = "both") -> Dict[str, str]:
+                                  save_format: str = "parquet", data: Optional[Dict] = None,
+                                  wait: bool = True) -> Dict[str, str]:
         """
         Create a comprehensive financial report with all data types
         
@@ -406,42 +835,55 @@ class FMPTool(BaseTool):
             symbol: Stock symbol
             period: 'annual' or 'quarter'
             years: Number of years of data
-            save_format: 'csv', 'excel', or 'both'
+            save_format: 'parquet', 'csv', 'excel', or 'both' (csv + excel)
+            data: Pre-fetched bundle from fetch_data (fetched here if missing)
+            wait: Wait for the files to be written (False returns once they are queued)
         
         Returns:
-            Dictionary with file paths of saved reports
+            Dictionary with file paths of saved reports ('queued' when not waiting)
         """
         symbol = symbol.upper()
-        results = {}
+        jobs = {}
         
-        # Get all data types
-        dcf_data = self.get_dcf_data(symbol, period, years)
-        ufcf_data = self.calculate_unlevered_free_cash_flow(symbol, period, years)
-        income_data = self.get_income_statement(symbol, period, years)
-        cashflow_data = self.get_cash_flow_statement(symbol, period, years)
+        # Fetch the statements once and derive every data type from them
+        try:
+            data = self.fetch_data(symbol, period, years, self.fetch_plan("comprehensive"), data)
+        except FMPError as e:
+            return {"error": f"Failed to fetch financial data: {e}"}
         
-        # Save data based on format preference
-        if save_format in ["csv", "both"]:
+        dcf_data = self.get_dcf_data(symbol, period, years, data)
+        ufcf_data = self.calculate_unlevered_free_cash_flow(symbol, period, years, data)
+        income_data = data["income"]
+        cashflow_data = data["cashflow"]
+        
+        # Queue every file at once so the writes run in parallel
+        if save_format == "parquet":
             if dcf_data and "error" not in dcf_data:
-                results["dcf_csv"] = self.save_to_csv(dcf_data, f"{symbol}_DCF_Data")
+                jobs["dcf_parquet"] = (self.save_to_parquet, dcf_data, symbol, "dcf")
             if ufcf_data and "error" not in ufcf_data:
-                results["ufcf_csv"] = self.save_to_csv(ufcf_data, f"{symbol}_UFCF_Data")
+                jobs["ufcf_parquet"] = (self.save_to_parquet, ufcf_data, symbol, "ufcf")
             if income_data:
-                results["income_csv"] = self.save_to_csv(income_data, f"{symbol}_Income_Statement")
+                jobs["income_parquet"] = (self.save_to_parquet, income_data, symbol, "income-statement")
             if cashflow_data:
-                results["cashflow_csv"] = self.save_to_csv(cashflow_data, f"{symbol}_Cash_Flow")
+                jobs["cashflow_parquet"] = (self.save_to_parquet, cashflow_data, symbol, "cash-flow-statement")
         
-        if save_format in ["excel", "both"]:
+        if save_format in ["csv", "both"]:
             if dcf_data and "error" not in dcf_data:
-                results["dcf_excel"] = self.save_to_excel(dcf_data, f"{symbol}_DCF_Data")
+                jobs["dcf_csv"] = (self.save_to_csv, dcf_data, f"{symbol}_DCF_Data")
             if ufcf_data and "error" not in ufcf_data:
-                results["ufcf_excel"] = self.save_to_excel(ufcf_data, f"{symbol}_UFCF_Data")
+                jobs["ufcf_csv"] = (self.save_to_csv, ufcf_data, f"{symbol}_UFCF_Data")
             if income_data:
-                results["income_excel"] = self.save_to_excel(income_data, f"{symbol}_Income_Statement")
+                jobs["income_csv"] = (self.save_to_csv, income_data, f"{symbol}_Income_Statement")
             if cashflow_data:
-                results["cashflow_excel"] = self.save_to_excel(cashflow_data, f"{symbol}_Cash_Flow")
+                jobs["cashflow_csv"] = (self.save_to_csv, cashflow_data, f"{symbol}_Cash_Flow")
         
-        return results
+        if save_format in ["excel", "both"]:
+            # One workbook with a sheet per data type
+            sections = {"dcf": dcf_data, "ufcf": ufcf_data,
+                        "income-statement": income_data, "cash-flow-statement": cashflow_data}
+            jobs["excel"] = (self.save_symbol_workbook, symbol, sections, f"{symbol}_Comprehensive_Report")
+        
+        return self._export(jobs, wait, label=f"{symbol}_Comprehensive")
 
     def get_current_price(self, symbol: str) -> Optional[float]:
         """
@@ -451,10 +893,16 @@ class FMPTool(BaseTool):
             symbol: Stock symbol (e.g., 'AAPL')
             
         Returns:
-            Current stock price or None if error
+            Current stock price or None if FMP has no quote
+        
+        Raises:
+            FMPTransportError: If the request failed
         """
         endpoint = f"/quote-short/{symbol}"
-        data = self._make_request(endpoint)
+        try:
+            data = self._make_request(endpoint)
+        except FMPNoDataError:
+            return None
         
         if data and len(data) > 0:
             return data[0].get('price', None)
@@ -468,18 +916,122 @@ class FMPTool(BaseTool):
             symbol: Stock symbol (e.g., 'AAPL')
             
         Returns:
-            Company profile data
+            Company profile data or None if FMP has no profile
+        
+        Raises:
+            FMPTransportError: If the request failed
         """
         endpoint = f"/profile/{symbol}"
-        data = self._make_request(endpoint)
+        try:
+            data = self._make_request(endpoint)
+        except FMPNoDataError:
+            return None
         
         if data and len(data) > 0:
             return data[0]
         return None
     
+    def get_current_prices(self, symbols: List[str], chunk_size: int = 50) -> Dict[str, Optional[float]]:
+        """
+        Get current stock prices for many companies with batched quote requests
+        
+        Args:
+            symbols: Stock symbols (e.g., ['AAPL', 'MSFT'])
+            chunk_size: Maximum symbols per request
+            
+        Returns:
+            Mapping of symbol to price (None if FMP has no quote)
+        """
+        quotes = self._fetch_batch(symbols, "/quote", "/quote-short", chunk_size,
+                                   lambda item: {"symbol": item["symbol"], "price": item.get("price"),
+                                                 "volume": item.get("volume")})
+        return {symbol: (quote.get("price") if quote else None) for symbol, quote in quotes.items()}
+    
+    def get_company_profiles(self, symbols: List[str], chunk_size: int = 50) -> Dict[str, Optional[Dict]]:
+        """
+        Get company profiles for many companies with batched profile requests
+        
+        Args:
+            symbols: Stock symbols (e.g., ['AAPL', 'MSFT'])
+            chunk_size: Maximum symbols per request
+            
+        Returns:
+            Mapping of symbol to profile (None if FMP has no profile)
+        """
+        return self._fetch_batch(symbols, "/profile", "/profile", chunk_size, lambda item: item)
+
+    def get_symbol_list(self) -> List[Dict]:
+        """
+        Get every listed stock and ETF (symbol, name, exchange, type)
+
+        The lists are several megabytes, so they bypass the response cache;
+        SymbolResolver keeps its own index built from them.
+
+        Raises:
+            FMPError: If the stock list could not be fetched
+        """
+        stocks = self._client.get("/stock/list")
+        try:
+            etfs = self._client.get("/etf/list")
+        except FMPNoDataError:
+            etfs = []
+        return [dict(item, type=item.get("type") or "etf") for item in etfs] + list(stocks)
+
+    def _fetch_batch(self, symbols: List[str], batch_prefix: str, single_prefix: str,
+                     chunk_size: int, to_single) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch a per-symbol endpoint for many symbols using comma-separated batch requests
+        
+        Symbols already in the response cache are served from it, and each batch item is
+        written back under its single-symbol key so later per-symbol calls hit the cache.
+        A chunk whose batch request fails falls back to one request per symbol; symbols
+        that still fail map to None.
+        """
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols if symbol))
+        results: Dict[str, Optional[Dict]] = {}
+        
+        missing = []
+        for symbol in symbols:
+            cached = self._cache.get(f"{single_prefix}/{symbol}") if self._cache is not None else None
+            if cached:
+                results[symbol] = cached[0]
+            else:
+                missing.append(symbol)
+        
+        def fetch_chunk(chunk: List[str]) -> List[Dict]:
+            try:
+                return self._client.get(f"{batch_prefix}/{','.join(chunk)}")
+            except FMPNoDataError:
+                return []
+            except FMPError as e:
+                # One failed chunk must not sink every other symbol in the batch
+                print(f"⚠️ Batch request for {len(chunk)} symbols failed ({e}), fetching them individually")
+            payload = []
+            for symbol in chunk:
+                try:
+                    data = self._client.get(f"{single_prefix}/{symbol}")
+                except FMPError:
+                    continue
+                payload.extend(data if isinstance(data, list) else [data])
+            return payload
+        
+        chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+        with ThreadPoolExecutor(max_workers=max(1, min(len(chunks), self.max_concurrency))) as executor:
+            for payload in executor.map(fetch_chunk, chunks):
+                for item in payload:
+                    symbol = item.get("symbol")
+                    if not symbol:
+                        continue
+                    single = to_single(item)
+                    results[symbol] = single
+                    if self._cache is not None:
+                        self._cache.set(f"{single_prefix}/{symbol}", None, [single])
+        
+        return {symbol: results.get(symbol) for symbol in symbols}
+    
     def calculate_dcf_valuation(self, symbol: str, period: str = "annual", years: int = 5,
                                terminal_growth_rate: float = 0.03, discount_rate: float = 0.10,
-                               net_debt: Optional[float] = None) -> Dict:
+                               net_debt: Optional[float] = None, data: Optional[Dict] = None) -> Dict:
         """
         Calculate complete DCF valuation including intrinsic value per share
         
@@ -490,22 +1042,29 @@ class FMPTool(BaseTool):
             terminal_growth_rate: Long-term growth rate (default 3%)
             discount_rate: WACC/discount rate (default 10%)
             net_debt: Net debt amount (if None, will estimate)
+            data: Pre-fetched bundle from fetch_data (fetched here if missing)
             
         Returns:
             Complete DCF valuation results
         """
-        # Get UFCF data
-        ufcf_data = self.calculate_unlevered_free_cash_flow(symbol, period, years)
+        # Fetch statements, quote and profile once for the whole valuation
+        try:
+            data = self.fetch_data(symbol, period, years, self.fetch_plan("valuation"), data)
+        except FMPError as e:
+            return {"error": f"Failed to fetch financial data: {e}", "error_type": e.kind}
         
-        if "error" in ufcf_data:
-            return ufcf_data
+        # Get UFCF data (TTM figures sampled yearly for quarterly data)
+        try:
+            panel = self.valuation_panel(symbol, period, years, data)
+        except ValueError as e:
+            return {"error": str(e), "error_type": "no_data"}
         
         # Get current stock price and company profile
-        current_price = self.get_current_price(symbol)
-        company_profile = self.get_company_profile(symbol)
+        current_price = data["quote"]
+        company_profile = data["profile"]
         
         # Extract UFCF values
-        ufcf_values = [calc["unlevered_free_cash_flow"] for calc in ufcf_data["ufcf_calculations"]]
+        ufcf_values = panel.ufcf.tolist()
         
         # Calculate present values
         present_values = []
@@ -539,11 +1098,7 @@ class FMPTool(BaseTool):
         equity_value = enterprise_value - net_debt
         
         # Get shares outstanding
-        shares_outstanding = None
-        if company_profile:
-            shares_outstanding = company_profile.get('mktCap', 0) / current_price if current_price else None
-            if not shares_outstanding:
-                shares_outstanding = company_profile.get('sharesOutstanding', 0)
+        shares_outstanding = shares_outstanding_from_profile(company_profile, current_price)
         
         # Calculate intrinsic value per share
         intrinsic_value_per_share = None
@@ -598,46 +1153,233 @@ class FMPTool(BaseTool):
             },
             "company_profile": company_profile
         }
+
+    def get_valuation_snapshot(self, symbol: str, period: str = "annual", years: int = 5,
+                               terminal_growth_rate: float = 0.03, discount_rate: float = 0.10) -> Dict:
+        """
+        Structured valuation, UFCF table and assumptions computed directly, without agents
+
+        Args:
+            symbol: Stock symbol
+            period: 'annual' or 'quarter' (TTM figures sampled yearly)
+            years: Number of years of historical data
+            terminal_growth_rate: Long-term growth rate
+            discount_rate: WACC/discount rate
+
+        Returns:
+            Dictionary with symbol, period, assumptions, ufcf and valuation sections,
+            or {'error', 'error_type'} ('invalid_symbol', 'no_data', 'transport', ...)
+        """
+        error = self._validate_symbol(symbol)
+        if error:
+            return {"error": error, "error_type": "invalid_symbol"}
+        symbol = symbol.upper()
+
+        try:
+            data = self.fetch_data(symbol, period, years, self.fetch_plan("valuation"))
+        except FMPError as e:
+            return {"error": f"Failed to fetch financial data: {e}", "error_type": e.kind}
+
+        valuation = self.calculate_dcf_valuation(symbol, period, years, terminal_growth_rate,
+                                                 discount_rate, data=data)
+        if "error" in valuation:
+            return valuation
+        ufcf = self.valuation_panel(symbol, period, years, data).to_ufcf_dict()["ufcf_calculations"]
+
+        profile = valuation.pop("company_profile") or {}
+        valuation.pop("symbol")
+        return {
+            "symbol": symbol,
+            "company_name": profile.get("companyName"),
+            "period": period,
+            "valuation_date": valuation.pop("valuation_date"),
+            "assumptions": valuation.pop("assumptions"),
+            "ufcf": ufcf,
+            "valuation": valuation
+        }
+
+    def calculate_dcf_sensitivity(self, symbol: str, discount_rates: List[float], growth_rates: List[float],
+                                  period: str = "annual", years: int = 5, net_debt: Optional[float] = None,
+                                  data: Optional[Dict] = None) -> Dict:
+        """
+        Calculate a WACC x terminal growth sensitivity table in one vectorized pass
         
-# Create an instance of the tool for easy import
-fmp_tool = FMPTool()
+        Args:
+            symbol: Stock symbol
+            discount_rates: Discount rates/WACC (table rows), e.g. [0.08, 0.09, 0.10]
+            growth_rates: Terminal growth rates (table columns), e.g. [0.02, 0.03]
+            period: 'annual' or 'quarter'
+            years: Number of years of historical data
+            net_debt: Net debt amount (if None, 5% of enterprise value)
+            data: Pre-fetched bundle from fetch_data (fetched here if missing)
+            
+        Returns:
+            Enterprise value, equity value and intrinsic value per share grids;
+            cells where growth >= discount rate are None
+        """
+        try:
+            data = self.fetch_data(symbol, period, years, self.fetch_plan("valuation"), data)
+            panel = self.valuation_panel(symbol, period, years, data)
+        except FMPError as e:
+            return {"error": f"Failed to fetch financial data: {e}", "error_type": e.kind}
+        except ValueError as e:
+            return {"error": str(e), "error_type": "no_data"}
+        
+        shares_outstanding = shares_outstanding_from_profile(data["profile"], data["quote"])
+        grid = dcf_sensitivity_grid(panel.ufcf, discount_rates, growth_rates, net_debt, shares_outstanding)
+        
+        return {
+            "symbol": symbol,
+            "valuation_date": datetime.now().strftime("%Y-%m-%d"),
+            "discount_rates": list(discount_rates),
+            "growth_rates": list(growth_rates),
+            "current_price": data["quote"],
+            "shares_outstanding": shares_outstanding,
+            "enterprise_value": grid_to_lists(grid["enterprise_value"], 0),
+            "equity_value": grid_to_lists(grid["equity_value"], 0),
+            "intrinsic_value_per_share": grid_to_lists(grid["intrinsic_value_per_share"], 2),
+        }
+    
+    def simulate_dcf_valuation(self, symbol: str, period: str = "annual", years: int = 5,
+                               paths: int = 1_000_000, seed: Optional[int] = None,
+                               distributions: Optional[Dict] = None,
+                               chunk_size: int = 100_000, workers: int = 1,
+                               net_debt: Optional[float] = None, data: Optional[Dict] = None) -> Dict:
+        """
+        Monte Carlo DCF valuation: discount rate, terminal growth and UFCF growth are
+        drawn per path around the same UFCF schedule and horizon as calculate_dcf_valuation
+        
+        Args:
+            symbol: Stock symbol
+            period: 'annual' or 'quarter'
+            years: Number of years of historical data
+            paths: Number of simulated paths
+            seed: Seed for reproducible results
+            distributions: Overrides for montecarlo.DEFAULT_DISTRIBUTIONS
+            chunk_size: Paths valued per chunk (bounds peak memory)
+            workers: Processes to spread chunks across
+            net_debt: Net debt amount (if None, 5% of enterprise value)
+            data: Pre-fetched bundle from fetch_data (fetched here if missing)
+            
+        Returns:
+            Percentiles of intrinsic value per share and probability of being undervalued
+        """
+        try:
+            data = self.fetch_data(symbol, period, years, self.fetch_plan("valuation"), data)
+            panel = self.valuation_panel(symbol, period, years, data)
+        except FMPError as e:
+            return {"error": f"Failed to fetch financial data: {e}", "error_type": e.kind}
+        except ValueError as e:
+            return {"error": str(e), "error_type": "no_data"}
+        
+        current_price = data["quote"]
+        result = simulate_dcf(
+            base_ufcf=panel.ufcf.tolist(),
+            paths=paths,
+            seed=seed,
+            distributions=distributions,
+            chunk_size=chunk_size,
+            workers=workers,
+            net_debt=net_debt,
+            shares_outstanding=shares_outstanding_from_profile(data["profile"], current_price),
+            current_price=current_price
+        )
+        return {"symbol": symbol, "valuation_date": datetime.now().strftime("%Y-%m-%d"), **result}
+    
+    async def acalculate_dcf_valuation(self, symbol: str, period: str = "annual", years: int = 5,
+                                       terminal_growth_rate: float = 0.03, discount_rate: float = 0.10,
+                                       net_debt: Optional[float] = None) -> Dict:
+        """
+        Async DCF valuation: statements, quote and profile are fetched concurrently,
+        so latency is that of the slowest request rather than the sum of all four
+        """
+        try:
+            data = await self.afetch_data(symbol, period, years, self.fetch_plan("valuation"))
+        except FMPError as e:
+            return {"error": f"Failed to fetch financial data: {e}", "error_type": e.kind}
+        return self.calculate_dcf_valuation(symbol, period, years, terminal_growth_rate,
+                                            discount_rate, net_debt, data)
+
+_fmp_tool_class = None
+_fmp_tool_class_lock = threading.Lock()
+
+def _tool_class() -> type:
+    """The crewai tool class, built (and crewai imported) on first use"""
+    global _fmp_tool_class
+    with _fmp_tool_class_lock:
+        if _fmp_tool_class is None:
+            from crewai.tools import BaseTool
+
+            class FMPTool(FMPToolBase, BaseTool):
+                __qualname__ = "FMPTool"
+                __doc__ = FMPToolBase.__doc__
+
+            _fmp_tool_class = FMPTool
+        return _fmp_tool_class
+
+# Shared instance for the convenience functions, created on first use so that
+# importing this module neither needs FMP_API_KEY nor creates financial_data/
+_fmp_tool: Optional["FMPTool"] = None
+_fmp_tool_lock = threading.Lock()
+
+def get_fmp_tool() -> "FMPTool":
+    """Return the shared FMPTool, creating it on first call"""
+    global _fmp_tool
+    if _fmp_tool is None:
+        with _fmp_tool_lock:
+            if _fmp_tool is None:
+                _fmp_tool = _tool_class()()
+    return _fmp_tool
+
+def __getattr__(name: str):
+    # `from crew.tools.fmp import FMPTool` imports crewai and builds the tool class then
+    if name == "FMPTool":
+        return _tool_class()
+    # Keep `from crew.tools.fmp import fmp_tool` working without creating the tool at import
+    if name == "fmp_tool":
+        return get_fmp_tool()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Convenience functions for direct use
 def get_dcf_data(symbol: str, period: str = "annual", years: int = 5, save_to_file: bool = False):
     """Get DCF analysis data for a company"""
+    fmp_tool = get_fmp_tool()
     data = fmp_tool.get_dcf_data(symbol, period, years)
     if save_to_file and data and "error" not in data:
-        csv_path = fmp_tool.save_to_csv(data, f"{symbol}_DCF_Data")
-        excel_path = fmp_tool.save_to_excel(data, f"{symbol}_DCF_Data")
-        print(f"Data saved to: {csv_path} and {excel_path}")
+        parquet_path = fmp_tool.save_to_parquet(data, symbol, "dcf")
+        print(f"Data saved to: {parquet_path}")
     return data
 
 def get_ufcf_data(symbol: str, period: str = "annual", years: int = 5, save_to_file: bool = False):
     """Get Unlevered Free Cash Flow calculations for a company"""
+    fmp_tool = get_fmp_tool()
     data = fmp_tool.calculate_unlevered_free_cash_flow(symbol, period, years)
     if save_to_file and data and "error" not in data:
-        csv_path = fmp_tool.save_to_csv(data, f"{symbol}_UFCF_Data")
-        excel_path = fmp_tool.save_to_excel(data, f"{symbol}_UFCF_Data")
-        print(f"Data saved to: {csv_path} and {excel_path}")
+        parquet_path = fmp_tool.save_to_parquet(data, symbol, "ufcf")
+        print(f"Data saved to: {parquet_path}")
     return data
 
 def get_dcf_valuation(symbol: str, period: str = "annual", years: int = 5, save_to_file: bool = False):
     """Get complete DCF valuation with market comparison"""
+    fmp_tool = get_fmp_tool()
     data = fmp_tool.calculate_dcf_valuation(symbol, period, years)
     if save_to_file and data and "error" not in data:
-        csv_path = fmp_tool.save_to_csv(data, f"{symbol}_DCF_Valuation")
-        excel_path = fmp_tool.save_to_excel(data, f"{symbol}_DCF_Valuation")
-        print(f"Valuation data saved to: {csv_path} and {excel_path}")
+        parquet_path = fmp_tool.save_to_parquet(data, symbol, "valuation")
+        print(f"Valuation data saved to: {parquet_path}")
     return data
 
 def save_data_to_csv(data: Dict, filename: str) -> str:
     """Save any financial data to CSV"""
-    return fmp_tool.save_to_csv(data, filename)
+    return get_fmp_tool().save_to_csv(data, filename)
+
+def save_data_to_parquet(data: Dict, symbol: str, data_type: str) -> str:
+    """Append any financial data to the partitioned Parquet dataset"""
+    return get_fmp_tool().save_to_parquet(data, symbol, data_type)
 
 def save_data_to_excel(data: Dict, filename: str) -> str:
     """Save any financial data to Excel"""
-    return fmp_tool.save_to_excel(data, filename)
+    return get_fmp_tool().save_to_excel(data, filename)
 
-def create_comprehensive_report(symbol: str, period: str = "annual", years: int = 5, save_format: str = "both"):
+def create_comprehensive_report(symbol: str, period: str = "annual", years: int = 5, save_format: str = "parquet"):
     """Create comprehensive financial report with all data types"""
-    return fmp_tool.create_comprehensive_report(symbol, period, years, save_format)
\ No newline at end of file
+    return get_fmp_tool().create_comprehensive_report(symbol, period, years, save_format)
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+Local statement history for incremental sync
+
+Income and cash flow statements are stored one row per
+symbol/statement/period/fiscal date in a SQLite file. Once a symbol's
+history is deep enough for a request, only the newest few periods are
+fetched from FMP, merged by date and upserted when their content changed,
+so a ten-year history costs the same bandwidth as a one-year fetch.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class StatementHistory:
+    """SQLite store of fetched statement periods with incremental sync"""
+
+    def __init__(self, path: str, probe_periods: int = 2):
+        self.path = path
+        self.probe_periods = probe_periods
+
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        self.rows_written = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS statements (
+                symbol TEXT NOT NULL,
+                statement TEXT NOT NULL,
+                period TEXT NOT NULL,
+                date TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (symbol, statement, period, date)
+            )
+        """)
+        # depth: largest limit fully fetched; exhausted: FMP returned fewer rows than asked (no older data)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                symbol TEXT NOT NULL,
+                statement TEXT NOT NULL,
+                period TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                exhausted INTEGER NOT NULL,
+                synced_at REAL NOT NULL,
+                PRIMARY KEY (symbol, statement, period)
+            )
+        """)
+
+    def _state(self, symbol: str, statement: str, period: str) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT depth, exhausted FROM sync_state WHERE symbol = ? AND statement = ? AND period = ?",
+                (symbol, statement, period)
+            ).fetchone()
+
+    def load(self, symbol: str, statement: str, period: str, limit: Optional[int] = None) -> List[Dict]:
+        """Stored periods, most recent first"""
+        query = "SELECT payload FROM statements WHERE symbol = ? AND statement = ? AND period = ? ORDER BY date DESC"
+        params = (symbol, statement, period)
+        if limit:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self._lock:
+            return [json.loads(row[0]) for row in self._conn.execute(query, params)]
+
+    def merge(self, symbol: str, statement: str, period: str, records: List[Dict]) -> int:
+        """
+        Upsert fetched records by fiscal date, rewriting only rows whose content changed
+
+        Returns:
+            Number of rows inserted or updated
+        """
+        now = time.time()
+        rows = {}
+        for record in records:
+            if record.get("date"):
+                rows[record["date"]] = json.dumps(record, sort_keys=True)
+
+        written = 0
+        with self._lock:
+            existing = dict(self._conn.execute(
+                f"SELECT date, payload FROM statements WHERE symbol = ? AND statement = ? AND period = ? "
+                f"AND date IN ({','.join('?' * len(rows))})",
+                (symbol, statement, period, *rows)
+            ).fetchall()) if rows else {}
+            changed = [(symbol, statement, period, date, payload, now)
+                       for date, payload in rows.items() if existing.get(date) != payload]
+            if changed:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO statements (symbol, statement, period, date, payload, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", changed
+                )
+                written = len(changed)
+            self.rows_written += written
+        return written
+
+    def sync(self, symbol: str, statement: str, period: str, limit: int,
+             fetch: Callable[[int], List[Dict]],
+             probe: Optional[Callable[[int], List[Dict]]] = None) -> List[Dict]:
+        """
+        Return the newest limit periods, fetching only what the local history lacks
+
+        Args:
+            symbol: Stock symbol
+            statement: Statement name, e.g. 'income' or 'cashflow'
+            period: 'annual' or 'quarter'
+            limit: Number of periods wanted
+            fetch: Callable fetching the newest n periods from FMP
+            probe: Callable fetching the newest n periods past any response cache, used to
+                look for new periods (defaults to fetch)
+
+        Raises:
+            Whatever fetch raises when there is no usable local history
+        """
+        symbol = symbol.upper()
+        state = self._state(symbol, statement, period)
+        deep_enough = state is not None and (state[0] >= limit or state[1])
+
+        if deep_enough:
+            # Only the latest periods can be new (or restated); older ones are already stored.
+            # A cached response would hide them, so the probe always goes to FMP
+            count = min(limit, self.probe_periods)
+            records = (probe or fetch)(count)
+            newest = self.load(symbol, statement, period, 1)
+            newest_date = newest[0].get("date", "") if newest else ""
+            if len(records) >= count and all((r.get("date") or "") > newest_date for r in records):
+                # Every probed period is new, so more may be missing: fall back to a full fetch,
+                # which must not be served from a cached response predating them either
+                deep_enough = False
+                fetch = probe or fetch
+            else:
+                self.merge(symbol, statement, period, records)
+                self.incremental_syncs += 1
+                depth, exhausted = state
+
+        if not deep_enough:
+            records = fetch(limit)
+            self.merge(symbol, statement, period, records)
+            self.full_syncs += 1
+            depth, exhausted = limit, len(records) < limit
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (symbol, statement, period, depth, exhausted, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (symbol, statement, period, max(depth, state[0] if state else 0), int(exhausted), time.time())
+            )
+        return self.load(symbol, statement, period, limit)
+
+    def stats(self) -> Dict:
+        """Sync counters and stored row count"""
+        with self._lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM statements").fetchone()[0]
+        return {
+            "full_syncs": self.full_syncs,
+            "incremental_syncs": self.incremental_syncs,
+            "rows_written": self.rows_written,
+            "rows_stored": rows,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,156 @@
+"""
+Monte Carlo DCF simulation
+
+Draws the discount rate, terminal growth rate and UFCF growth rate for each
+path from configurable distributions, scales a base UFCF schedule by the drawn
+growth and values every path with vectorized NumPy. Given the UFCF series used
+by FMPTool.calculate_dcf_valuation and zero-variance inputs, each path equals
+that deterministic valuation, so the distribution is centred on it. Paths are
+processed in chunks to bound memory; each chunk gets its own child seed so
+results are reproducible for a given seed whether chunks run serially or in a
+process pool.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from .valuation import DEFAULT_NET_DEBT_RATIO
+
+
+# Distribution specs per simulated input. Supported dists:
+#   normal(mean, std), uniform(low, high), triangular(left, mode, right),
+#   lognormal(mean, sigma) and fixed(value); optional min/max clip the draws.
+DEFAULT_DISTRIBUTIONS = {
+    "discount_rate": {"dist": "normal", "mean": 0.10, "std": 0.015, "min": 0.04, "max": 0.25},
+    "terminal_growth": {"dist": "normal", "mean": 0.03, "std": 0.005, "min": -0.02, "max": 0.05},
+    # Annual deviation from the base UFCF schedule (0 reproduces the deterministic DCF)
+    "ufcf_growth": {"dist": "normal", "mean": 0.0, "std": 0.03, "min": -0.5, "max": 0.5},
+}
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+
+def _draw(rng: np.random.Generator, spec: Dict, size: int) -> np.ndarray:
+    """Draw samples for one input from its distribution spec"""
+    dist = spec.get("dist", "normal")
+    if dist == "normal":
+        values = rng.normal(spec["mean"], spec["std"], size)
+    elif dist == "uniform":
+        values = rng.uniform(spec["low"], spec["high"], size)
+    elif dist == "triangular":
+        values = rng.triangular(spec["left"], spec["mode"], spec["right"], size)
+    elif dist == "lognormal":
+        values = rng.lognormal(spec["mean"], spec["sigma"], size)
+    elif dist == "fixed":
+        values = np.full(size, float(spec["value"]))
+    else:
+        raise ValueError(f"Unsupported distribution '{dist}'")
+
+    if "min" in spec or "max" in spec:
+        values = np.clip(values, spec.get("min", -np.inf), spec.get("max", np.inf))
+    return values
+
+
+def _simulate_chunk(args: tuple) -> np.ndarray:
+    """Value one chunk of paths; returns per-share values (or equity values without shares), NaN if invalid"""
+    seed_seq, size, schedule, distributions, net_debt, shares_outstanding = args
+    rng = np.random.default_rng(seed_seq)
+
+    r = _draw(rng, distributions["discount_rate"], size)
+    g = _draw(rng, distributions["terminal_growth"], size)
+    growth = _draw(rng, distributions["ufcf_growth"], size)
+
+    # (size, horizon) projected UFCF and discount factors
+    t = np.arange(1, len(schedule) + 1, dtype="float64")
+    ufcf = schedule * (1.0 + growth)[:, None] ** t
+    pv_factors = (1.0 + r)[:, None] ** -t
+    sum_pv = np.einsum("ij,ij->i", ufcf, pv_factors)
+
+    valid = g < r
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terminal_value = np.where(valid, ufcf[:, -1] * (1.0 + g) / (r - g), np.nan)
+    enterprise_value = sum_pv + terminal_value * pv_factors[:, -1]
+
+    debt = enterprise_value * DEFAULT_NET_DEBT_RATIO if net_debt is None else net_debt
+    equity_value = enterprise_value - debt
+    if shares_outstanding:
+        return equity_value / shares_outstanding
+    return equity_value
+
+
+def simulate_dcf(base_ufcf: Union[float, Sequence[float]], paths: int = 1_000_000, seed: Optional[int] = None,
+                 distributions: Optional[Dict] = None, horizon: int = 5, chunk_size: int = 100_000,
+                 workers: int = 1, net_debt: Optional[float] = None,
+                 shares_outstanding: Optional[float] = None, current_price: Optional[float] = None) -> Dict:
+    """
+    Run a Monte Carlo DCF simulation
+
+    Args:
+        base_ufcf: UFCF schedule valued as years 1..n (terminal value from the last entry),
+            or a single UFCF repeated over the horizon; scaled by (1 + simulated growth) ** year
+        paths: Number of simulated paths
+        seed: Seed for reproducible results
+        distributions: Overrides for DEFAULT_DISTRIBUTIONS, keyed by input name
+        horizon: Projection years when base_ufcf is a single value
+        chunk_size: Paths valued per chunk (bounds peak memory)
+        workers: Processes to spread chunks across (1 runs in-process)
+        net_debt: Net debt (if None, 5% of enterprise value per path)
+        shares_outstanding: Shares for per-share values (equity values are reported without it)
+        current_price: Market price used for the probability of being undervalued
+
+    Returns:
+        Percentiles, mean and std of intrinsic value per share, probability of
+        being undervalued, and path counts. Paths with terminal growth at or above
+        the discount rate have no value (invalid_paths); they are left out of the
+        percentiles but count as not undervalued, so the probability is over all paths
+    """
+    specs = {**DEFAULT_DISTRIBUTIONS, **(distributions or {})}
+    started = time.perf_counter()
+
+    schedule = np.atleast_1d(np.asarray(base_ufcf, dtype="float64"))
+    if schedule.size == 1:
+        schedule = np.full(horizon, schedule[0])
+
+    sizes = [min(chunk_size, paths - start) for start in range(0, paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(seed_seq, size, schedule, specs, net_debt, shares_outstanding)
+             for seed_seq, size in zip(seeds, sizes)]
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_simulate_chunk, tasks))
+    else:
+        chunks = [_simulate_chunk(task) for task in tasks]
+
+    values = np.concatenate(chunks) if chunks else np.empty(0)
+    values = values[np.isfinite(values)]
+
+    result = {
+        "paths": paths,
+        "valid_paths": int(values.size),
+        "invalid_paths": paths - int(values.size),
+        "seed": seed,
+        "horizon_years": len(schedule),
+        "base_ufcf": schedule.tolist(),
+        "distributions": specs,
+        "value_basis": "per_share" if shares_outstanding else "equity_value",
+        "mean": None,
+        "std": None,
+        "percentiles": {},
+        "current_price": current_price,
+        "probability_undervalued": None,
+    }
+    if values.size:
+        result["mean"] = round(float(values.mean()), 2)
+        result["std"] = round(float(values.std()), 2)
+        result["percentiles"] = {
+            f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+        }
+        if current_price and shares_outstanding:
+            result["probability_undervalued"] = round(float(np.count_nonzero(values > current_price)) / paths, 4)
+
+    result["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return result
@@ -0,0 +1,154 @@
+"""
+Columnar financial statement panel
+
+Income and cash-flow statements are joined on their fiscal date and held as
+one float64 column per line item, so DCF inputs and UFCF are computed as
+vectorized column expressions. Dict views are only built when serializing.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+# FMP income statement fields mapped to panel columns
+INCOME_COLUMNS = {
+    "operatingIncome": "ebit",  # EBIT = Operating Income
+    "ebitda": "ebitda",
+    "incomeTaxExpense": "tax_expense",
+    "incomeBeforeTax": "income_before_tax",
+    "revenue": "revenue",
+    "netIncome": "net_income",
+}
+
+# FMP cash flow statement fields mapped to panel columns
+CASHFLOW_COLUMNS = {
+    "depreciationAndAmortization": "depreciation_amortization",
+    "capitalExpenditure": "capex",
+    "changeInWorkingCapital": "working_capital_change",
+    "freeCashFlow": "free_cash_flow",
+    "operatingCashFlow": "operating_cash_flow",
+}
+
+# Column order of the DCF data records (matches the historical get_dcf_data output)
+DCF_RECORD_COLUMNS = [
+    "date", "calendarYear", "period",
+    "ebit", "ebitda", "tax_rate_percent", "tax_expense", "income_before_tax",
+    "depreciation_amortization", "capex", "working_capital_change",
+    "revenue", "net_income", "free_cash_flow", "operating_cash_flow",
+]
+
+UFCF_RECORD_COLUMNS = [
+    "date", "year", "ebit", "tax_rate", "ebit_after_tax", "depreciation_amortization",
+    "capex", "working_capital_change", "unlevered_free_cash_flow",
+]
+
+
+def _to_float(value) -> float:
+    """FMP numeric field as float (missing or non-numeric -> 0.0)"""
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _column(records: List[Dict], field: str) -> np.ndarray:
+    """One line item across records as a float64 vector"""
+    return np.fromiter((_to_float(r.get(field)) for r in records), dtype="float64", count=len(records))
+
+
+def derive_ufcf_columns(columns):
+    """
+    Add tax rate, after-tax EBIT and UFCF to a mapping (dict or DataFrame) of line-item columns
+
+    UFCF = EBIT * (1 - Tax Rate) + Depreciation - CapEx - Change in Working Capital
+    """
+    # Effective tax rate = Income Tax Expense / Income Before Tax
+    before_tax = np.asarray(columns["income_before_tax"], dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tax_rate = np.where(before_tax != 0, np.asarray(columns["tax_expense"], dtype="float64") / before_tax * 100, 0.0)
+    columns["tax_rate_percent"] = np.round(tax_rate, 2)
+
+    ebit_after_tax = np.asarray(columns["ebit"], dtype="float64") * (1 - columns["tax_rate_percent"] / 100)
+    columns["ebit_after_tax"] = np.round(ebit_after_tax, 0)
+    columns["unlevered_free_cash_flow"] = np.round(
+        ebit_after_tax + np.asarray(columns["depreciation_amortization"], dtype="float64")
+        - np.asarray(columns["capex"], dtype="float64")
+        - np.asarray(columns["working_capital_change"], dtype="float64"),
+        0
+    )
+    return columns
+
+
+class FinancialPanel:
+    """One symbol's joined income + cash flow statements, one float64 column per line item"""
+
+    def __init__(self, symbol: str, period: str, frame: pd.DataFrame):
+        self.symbol = symbol
+        self.period = period
+        self.frame = frame
+
+    @classmethod
+    def from_statements(cls, symbol: str, period: str, income: List[Dict],
+                        cashflow: List[Dict]) -> "FinancialPanel":
+        """
+        Join FMP income and cash flow statements on fiscal date
+
+        Raises:
+            ValueError: If the statements share no fiscal period
+        """
+        # Pair each income statement with the cash flow statement of the same fiscal date,
+        # falling back to fiscal year/period when filings report slightly different dates
+        by_date = {r.get("date"): r for r in cashflow}
+        by_year = {(r.get("calendarYear"), r.get("period")): r for r in cashflow}
+        pairs = []
+        for income_record in income:
+            cashflow_record = by_date.get(income_record.get("date")) or \
+                by_year.get((income_record.get("calendarYear"), income_record.get("period")))
+            if cashflow_record is not None:
+                pairs.append((income_record, cashflow_record))
+        if not pairs:
+            raise ValueError(f"Income and cash flow statements for {symbol} share no fiscal period")
+
+        # Most recent period first, as FMP returns it
+        pairs.sort(key=lambda pair: pair[0].get("date") or "", reverse=True)
+        income_records = [pair[0] for pair in pairs]
+        cashflow_records = [pair[1] for pair in pairs]
+
+        columns = {key: [r.get(key) for r in income_records] for key in ("date", "calendarYear", "period")}
+        for source, target in INCOME_COLUMNS.items():
+            columns[target] = _column(income_records, source)
+        for source, target in CASHFLOW_COLUMNS.items():
+            columns[target] = _column(cashflow_records, source)
+
+        columns["capex"] = np.abs(columns["capex"])  # Make positive for DCF
+
+        frame = pd.DataFrame(derive_ufcf_columns(columns))
+        return cls(symbol, period, frame)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def ufcf(self) -> np.ndarray:
+        """UFCF per period as a float64 vector, most recent first"""
+        return self.frame["unlevered_free_cash_flow"].to_numpy(dtype="float64")
+
+    def to_dcf_dict(self) -> Dict:
+        """Serialize to the get_dcf_data structure"""
+        return {
+            "symbol": self.symbol,
+            "period": self.period,
+            "years_of_data": len(self.frame),
+            "data": self.frame[DCF_RECORD_COLUMNS].to_dict(orient="records"),
+        }
+
+    def to_ufcf_dict(self) -> Dict:
+        """Serialize to the calculate_unlevered_free_cash_flow structure"""
+        frame = self.frame.rename(columns={"calendarYear": "year"})
+        frame["tax_rate"] = frame["tax_rate_percent"] / 100
+        return {
+            "symbol": self.symbol,
+            "ufcf_calculations": frame[UFCF_RECORD_COLUMNS].to_dict(orient="records"),
+        }
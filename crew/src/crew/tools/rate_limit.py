@@ -0,0 +1,116 @@
+"""
+Cross-process token-bucket rate limiter
+
+The bucket state lives in a SQLite file, so every thread and every worker
+process that points at the same file draws from one shared budget. Callers
+reserve a token inside an IMMEDIATE transaction; if the bucket is empty the
+reservation drives the balance negative and the caller sleeps until its slot
+comes up, which queues bursts smoothly instead of failing them.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    """Token bucket shared across threads and processes through a SQLite file"""
+
+    def __init__(self, path: str, calls_per_minute: int = 300, burst: Optional[int] = None,
+                 name: str = "fmp"):
+        if calls_per_minute <= 0:
+            raise ValueError("calls_per_minute must be positive")
+        self.path = path
+        self.name = name
+        self.rate = calls_per_minute / 60.0
+        # Allow short bursts of up to ~10 seconds worth of calls by default
+        self.capacity = float(burst if burst is not None else max(1, calls_per_minute // 6))
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.acquisitions = 0
+        self.waits = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS buckets (
+                name TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute(
+            "INSERT OR IGNORE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+            (name, self.capacity, time.time())
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; SQLite locking coordinates threads and processes"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            tokens, updated_at = conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            now = time.time()
+            tokens = min(self.capacity, tokens + max(0.0, now - updated_at) * self.rate) - 1
+            conn.execute(
+                "UPDATE buckets SET tokens = ?, updated_at = ? WHERE name = ?",
+                (tokens, now, self.name)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return -tokens / self.rate if tokens < 0 else 0.0
+
+    def acquire(self) -> float:
+        """
+        Block until a call is allowed under the shared budget
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+        with self._stats_lock:
+            self.acquisitions += 1
+            if wait > 0:
+                self.waits += 1
+                self.total_wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        return wait
+
+    def stats(self) -> Dict:
+        """Wait-time metrics for this process and the current shared bucket level"""
+        tokens, updated_at = self._connection().execute(
+            "SELECT tokens, updated_at FROM buckets WHERE name = ?", (self.name,)
+        ).fetchone()
+        available = min(self.capacity, tokens + max(0.0, time.time() - updated_at) * self.rate)
+        with self._stats_lock:
+            return {
+                "calls_per_minute": round(self.rate * 60),
+                "capacity": self.capacity,
+                "available_tokens": round(available, 2),
+                "acquisitions": self.acquisitions,
+                "waits": self.waits,
+                "total_wait_seconds": round(self.total_wait_seconds, 3),
+                "max_wait_seconds": round(self.max_wait_seconds, 3),
+                "avg_wait_seconds": round(self.total_wait_seconds / self.waits, 3) if self.waits else 0.0,
+            }
@@ -0,0 +1,313 @@
+"""
+Content-addressed export store with retention
+
+Every exported file is indexed in a SQLite file by SHA-256 digests. For new
+exports the key is the digest of the canonical serialized payload (format,
+name and the data itself), so a run that produces exactly the same data as
+an earlier one gets the earlier file's path back instead of writing another
+timestamped copy. Each object also records the digest of its file bytes;
+compact() adopts files that predate the store and replaces byte-identical
+copies with hard links to one object.
+
+Retention keeps the last N objects per symbol/data type, drops objects not
+used for max_age seconds and trims the least recently used objects above
+max_bytes. compact() works in bounded batches so it can run as a periodic
+job on a directory with hundreds of thousands of files. Only the CSV/Excel
+exports are managed: the Parquet dataset under data_dir/dataset is
+append-only history and is never adopted or pruned.
+
+Usage:
+    python -m src.crew.tools.store compact --data-dir financial_data --keep-last 10 --max-age-days 90
+    python -m src.crew.tools.store stats --data-dir financial_data
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+# Timestamped export files: SYMBOL_DATA_TYPE_YYYYmmdd_HHMMSS.ext
+EXPORT_FILE_PATTERN = re.compile(r"^([A-Z]{1,5})_(.+)_\d{8}_\d{6}\.(csv|xlsx)$")
+
+HASH_CHUNK = 1024 * 1024
+
+
+def payload_digest(fmt: str, name: str, data: Any) -> str:
+    """SHA-256 of the canonical serialization of an export (format, name and payload)"""
+    body = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{fmt}\n{name}\n{body}".encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExportStore:
+    """SQLite index of exported files keyed by content digest"""
+
+    def __init__(self, data_dir: str, index_path: Optional[str] = None):
+        self.data_dir = os.path.abspath(data_dir)
+        self.index_path = index_path or os.path.join(self.data_dir, "fmp_store.sqlite3")
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS objects (
+                digest TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                format TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                uses INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS paths (
+                path TEXT PRIMARY KEY,
+                digest TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_objects_series ON objects(symbol, data_type, format, last_used_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_objects_used ON objects(last_used_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_objects_content ON objects(content)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_paths_digest ON paths(digest)")
+        # Earlier versions adopted the Parquet dataset; forget those rows (the files stay)
+        self._conn.execute("DELETE FROM paths WHERE digest IN (SELECT digest FROM objects WHERE format = 'parquet')")
+        self._conn.execute("DELETE FROM objects WHERE format = 'parquet'")
+
+    def lookup(self, digest: str) -> Optional[str]:
+        """
+        Path of an existing file with this digest (marking it used), or None
+
+        Index rows whose files were removed outside the store are dropped.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT path FROM paths WHERE digest = ?", (digest,)).fetchall()
+            for (path,) in rows:
+                if os.path.exists(path):
+                    self._conn.execute(
+                        "UPDATE objects SET last_used_at = ?, uses = uses + 1 WHERE digest = ?",
+                        (time.time(), digest)
+                    )
+                    return path
+                self._conn.execute("DELETE FROM paths WHERE path = ?", (path,))
+            if rows:
+                self._conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+        return None
+
+    def add(self, digest: str, path: str, symbol: str, data_type: str, fmt: str) -> str:
+        """Index a freshly written file under its digest; returns the path"""
+        now = time.time()
+        path = os.path.abspath(path)
+        content = file_digest(path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO objects (digest, content, symbol, data_type, format, size, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (digest, content, symbol.upper(), data_type.upper(), fmt, os.path.getsize(path), now, now)
+            )
+            self._conn.execute("INSERT OR REPLACE INTO paths (path, digest) VALUES (?, ?)", (path, digest))
+        return path
+
+    def _indexed(self, path: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM paths WHERE path = ?", (path,)).fetchone() is not None
+
+    def _untracked_files(self):
+        """Export files under data_dir that are not in the index yet"""
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and EXPORT_FILE_PATTERN.match(entry.name) and not self._indexed(entry.path):
+                    yield entry.path
+
+    def adopt(self, path: str) -> bool:
+        """
+        Index an existing export file, hard-linking it to an identical object if there is one
+
+        Returns:
+            True if the file was a duplicate of an indexed object
+
+        Raises:
+            ValueError: If the file name is not a timestamped CSV/Excel export
+        """
+        path = os.path.abspath(path)
+        match = EXPORT_FILE_PATTERN.match(os.path.basename(path))
+        if not match:
+            raise ValueError(f"Not an export file: {path}")
+        symbol, data_type, fmt = match.group(1), match.group(2), match.group(3)
+
+        content = file_digest(path)
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM objects WHERE content = ?", (content,)).fetchone()
+        digest = row[0] if row else content
+        existing = self.lookup(digest) if row else None
+        if existing is None or os.path.samefile(existing, path):
+            with self._lock:
+                mtime = os.path.getmtime(path)
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO objects (digest, content, symbol, data_type, format, size, created_at, last_used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (digest, content, symbol.upper(), data_type.upper(), fmt, os.path.getsize(path), mtime, mtime)
+                )
+                self._conn.execute("INSERT OR REPLACE INTO paths (path, digest) VALUES (?, ?)", (path, digest))
+            return False
+
+        # Replace the duplicate with a hard link so the path keeps working but the bytes are stored once
+        temporary = f"{path}.link"
+        try:
+            os.link(existing, temporary)
+            os.replace(temporary, path)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO paths (path, digest) VALUES (?, ?)", (path, digest))
+        return True
+
+    def _remove(self, digest: str) -> int:
+        """Delete every file of an object and its index rows; returns bytes freed"""
+        with self._lock:
+            paths = [row[0] for row in self._conn.execute("SELECT path FROM paths WHERE digest = ?", (digest,))]
+            size = self._conn.execute("SELECT size FROM objects WHERE digest = ?", (digest,)).fetchone()
+            self._conn.execute("DELETE FROM paths WHERE digest = ?", (digest,))
+            self._conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return size[0] if size else 0
+
+    def expired(self, keep_last: Optional[int] = None, max_age: Optional[float] = None,
+                max_bytes: Optional[int] = None, limit: int = 1000) -> List[str]:
+        """Digests the retention policy would remove (at most limit)"""
+        doomed = []
+        with self._lock:
+            if keep_last:
+                doomed += [row[0] for row in self._conn.execute("""
+                    SELECT digest FROM (
+                        SELECT digest, ROW_NUMBER() OVER (
+                            PARTITION BY symbol, data_type, format ORDER BY last_used_at DESC
+                        ) AS position FROM objects
+                    ) WHERE position > ? LIMIT ?
+                """, (keep_last, limit))]
+            if max_age:
+                doomed += [row[0] for row in self._conn.execute(
+                    "SELECT digest FROM objects WHERE last_used_at < ? LIMIT ?", (time.time() - max_age, limit)
+                )]
+            if max_bytes:
+                # Budget what remains after the removals above, then trim least recently used
+                doomed = list(dict.fromkeys(doomed))
+                ordered = self._conn.execute("SELECT digest, size FROM objects ORDER BY last_used_at").fetchall()
+                removed = set(doomed)
+                total = sum(size for digest, size in ordered if digest not in removed)
+                for digest, size in ordered:
+                    if total <= max_bytes or len(doomed) >= limit:
+                        break
+                    if digest not in removed:
+                        doomed.append(digest)
+                        total -= size
+        return list(dict.fromkeys(doomed))[:limit]
+
+    def compact(self, keep_last: Optional[int] = None, max_age: Optional[float] = None,
+                max_bytes: Optional[int] = None, limit: int = 1000) -> Dict:
+        """
+        One incremental compaction pass
+
+        Adopts up to limit untracked CSV/Excel exports (deduplicating them), then
+        removes up to limit objects that fall outside the retention policy. Run it again
+        until 'adopted' and 'removed' are both below limit to finish a backlog.
+        """
+        started = time.perf_counter()
+        adopted = duplicates = 0
+        for path in self._untracked_files():
+            if adopted >= limit:
+                break
+            duplicates += self.adopt(path)
+            adopted += 1
+
+        removed = freed = 0
+        for digest in self.expired(keep_last, max_age, max_bytes, limit):
+            freed += self._remove(digest)
+            removed += 1
+
+        return {
+            "adopted": adopted,
+            "duplicates_linked": duplicates,
+            "removed": removed,
+            "bytes_freed": freed,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            **self.stats(),
+        }
+
+    def stats(self) -> Dict:
+        """Object, path and byte counts of the index"""
+        with self._lock:
+            objects, size, uses = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(uses), 0) FROM objects"
+            ).fetchone()
+            paths = self._conn.execute("SELECT COUNT(*) FROM paths").fetchone()[0]
+        return {"objects": objects, "paths": paths, "size_bytes": size, "uses": uses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _parse_bytes(value: str) -> int:
+    """Parse sizes like 500M or 2G"""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    value = value.strip().upper()
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point for compaction"""
+    parser = argparse.ArgumentParser(description="Deduplicate and apply retention to exported financial data")
+    parser.add_argument("command", choices=["compact", "stats"])
+    parser.add_argument("--data-dir", default=os.path.join(os.getcwd(), "financial_data"))
+    parser.add_argument("--keep-last", type=int, help="Objects kept per symbol/data type/format")
+    parser.add_argument("--max-age-days", type=float, help="Remove objects not used for this many days")
+    parser.add_argument("--max-bytes", type=_parse_bytes, help="Total size budget, e.g. 500M or 2G")
+    parser.add_argument("--limit", type=int, default=1000, help="Files adopted/removed per pass")
+    parser.add_argument("--until-done", action="store_true", help="Repeat passes until the backlog is cleared")
+    args = parser.parse_args(argv)
+
+    store = ExportStore(args.data_dir)
+    if args.command == "stats":
+        print(json.dumps(store.stats(), indent=2))
+        return
+
+    max_age = args.max_age_days * 86400 if args.max_age_days else None
+    while True:
+        result = store.compact(args.keep_last, max_age, args.max_bytes, args.limit)
+        print(f"✅ Adopted {result['adopted']} files ({result['duplicates_linked']} duplicates linked), "
+              f"removed {result['removed']} objects ({result['bytes_freed'] / 1024 / 1024:.1f} MB) "
+              f"in {result['elapsed_seconds']}s")
+        if not args.until_done or (result["adopted"] < args.limit and result["removed"] < args.limit):
+            break
+    print(json.dumps(store.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Company name / ticker resolver backed by a local FMP symbol master
+
+The FMP stock and ETF lists are fetched once, ranked (major US exchanges and
+common stock first) and turned into three indexes:
+
+* exact: normalized company name -> entry and ticker -> entry
+* prefix: sorted normalized names searched with bisect (a flat, serializable trie)
+* fuzzy: trigram postings lists, scored with the Dice coefficient via bincount
+
+The indexes are pickled to data_dir/symbol_index.pkl and rebuilt when older
+than max_age, so lookups need neither the network nor an LLM and return in
+microseconds with a confidence score.
+"""
+
+import bisect
+import os
+import pickle
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+INDEX_VERSION = 1
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+# Brand names that do not appear in the listed company names
+ALIASES = {
+    "google": "GOOGL",
+    "facebook": "META",
+    "instagram": "META",
+    "square": "SQ",
+    "disney": "DIS",
+    "coke": "KO",
+}
+
+# Listing venues preferred when several securities share a name
+EXCHANGE_RANK = {"NASDAQ": 0, "NYSE": 0, "AMEX": 1, "NYSEARCA": 1, "BATS": 1, "OTC": 3}
+
+# Corporate suffixes and filler words dropped from names before indexing
+NAME_STOPWORDS = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited", "plc",
+    "llc", "lp", "sa", "nv", "ag", "se", "holdings", "holding", "group", "the", "class", "common",
+    "stock", "shares", "ordinary", "adr", "ads",
+}
+
+TICKER_PATTERN = re.compile(r"^[A-Z][A-Z0-9.\-]{0,9}$")
+
+# Confidence of each match kind (prefix and fuzzy scale with match quality)
+CONFIDENCE = {"ticker": 1.0, "name": 0.97, "alias": 0.95, "ticker_case": 0.7, "prefix": 0.9, "fuzzy": 0.85}
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, '&' -> 'and', punctuation and corporate suffixes removed"""
+    text = name.lower().replace("&", " and ").replace("'", "")
+    words = re.sub(r"[^a-z0-9]+", " ", text).split()
+    kept = [w for w in words if w not in NAME_STOPWORDS]
+    return " ".join(kept or words)
+
+
+def _trigrams(text: str) -> List[str]:
+    padded = f"  {text} "
+    return list({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+class SymbolResolver:
+    """Exact, prefix and trigram-fuzzy lookup of tickers by company name or symbol"""
+
+    def __init__(self, entries: List[Tuple[str, str, str, str]], built_at: Optional[float] = None):
+        """
+        Args:
+            entries: (symbol, name, exchange, type) tuples from the FMP symbol lists
+        """
+        self.built_at = built_at or time.time()
+
+        def rank(entry):
+            symbol, _, exchange, kind = entry
+            return (EXCHANGE_RANK.get(exchange, 2), kind != "stock", "." in symbol or "-" in symbol, len(symbol))
+
+        # Best-ranked entry first, so the lowest id wins every tie
+        entries = sorted({e[0]: e for e in entries if e[0] and e[1]}.values(), key=rank)
+        self.symbols = [e[0] for e in entries]
+        self.names = [e[1] for e in entries]
+        self.normalized = [normalize_name(e[1]) for e in entries]
+
+        self._by_ticker = {}
+        self._by_name = {}
+        for i, (symbol, normalized) in enumerate(zip(self.symbols, self.normalized)):
+            self._by_ticker.setdefault(symbol, i)
+            self._by_name.setdefault(normalized, i)
+
+        # Prefix index: names sorted once, each key paired with its entry id
+        order = sorted(range(len(entries)), key=lambda i: (self.normalized[i], i))
+        self._prefix_keys = [self.normalized[i] for i in order]
+        self._prefix_ids = np.array(order, dtype=np.int32)
+
+        # Trigram postings as int32 arrays, plus each name's trigram count for Dice scoring
+        postings: Dict[str, List[int]] = {}
+        self._trigram_counts = np.zeros(len(entries), dtype=np.int32)
+        for i, normalized in enumerate(self.normalized):
+            grams = _trigrams(normalized)
+            self._trigram_counts[i] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._by_ticker
+
+    def _match(self, i: int, confidence: float, method: str) -> Dict:
+        return {
+            "symbol": self.symbols[i],
+            "name": self.names[i],
+            "confidence": round(confidence, 3),
+            "method": method,
+        }
+
+    def _prefix(self, normalized: str) -> Optional[Dict]:
+        start = bisect.bisect_left(self._prefix_keys, normalized)
+        end = bisect.bisect_left(self._prefix_keys, normalized + "\uffff", lo=start)
+        if start == end:
+            return None
+        best = int(self._prefix_ids[start:end].min())
+        coverage = len(normalized) / max(len(self.normalized[best]), 1)
+        # Whole leading words ("berkshire" for "berkshire hathaway") are far likelier than fragments ("micro")
+        if self.normalized[best].startswith(normalized + " "):
+            coverage = 0.75 + 0.25 * coverage
+        ambiguity = 1.0 if end - start == 1 else 0.85
+        return self._match(best, CONFIDENCE["prefix"] * coverage * ambiguity, "prefix")
+
+    def _fuzzy(self, normalized: str) -> Optional[Dict]:
+        grams = [g for g in _trigrams(normalized) if g in self._postings]
+        if not grams:
+            return None
+        common = np.bincount(np.concatenate([self._postings[g] for g in grams]), minlength=len(self.symbols))
+        dice = 2.0 * common / (len(_trigrams(normalized)) + self._trigram_counts)
+        best = int(dice.argmax())
+        return self._match(best, CONFIDENCE["fuzzy"] * float(dice[best]), "fuzzy")
+
+    def resolve(self, query: str) -> Optional[Dict]:
+        """
+        Resolve a company name or ticker
+
+        Returns:
+            {'symbol', 'name', 'confidence' (0-1), 'method'} or None if nothing matches
+        """
+        raw = (query or "").strip()
+        if not raw:
+            return None
+
+        # A ticker typed as one (AAPL) wins over names
+        if TICKER_PATTERN.match(raw) and raw in self._by_ticker:
+            return self._match(self._by_ticker[raw], CONFIDENCE["ticker"], "ticker")
+
+        normalized = normalize_name(raw)
+        if normalized in self._by_name:
+            return self._match(self._by_name[normalized], CONFIDENCE["name"], "name")
+
+        alias = ALIASES.get(normalized)
+        if alias and (not self.symbols or alias in self._by_ticker):
+            i = self._by_ticker.get(alias)
+            if i is None:
+                return {"symbol": alias, "name": None, "confidence": CONFIDENCE["alias"], "method": "alias"}
+            return self._match(i, CONFIDENCE["alias"], "alias")
+
+        if not self.symbols:
+            # No symbol master available: accept well-formed tickers unverified
+            if re.match(r"^[A-Z]{1,5}$", raw):
+                return {"symbol": raw, "name": None, "confidence": 0.5, "method": "unverified"}
+            return None
+
+        # A word that only matches a ticker when upper-cased ("ford" -> FORD) is weaker
+        # evidence than a company name starting with it ("ford" -> Ford Motor, F)
+        candidates = [self._prefix(normalized)]
+        if raw.upper() in self._by_ticker and len(raw) <= 5:
+            candidates.append(self._match(self._by_ticker[raw.upper()], CONFIDENCE["ticker_case"], "ticker_case"))
+        candidates = [c for c in candidates if c]
+        if candidates:
+            return max(candidates, key=lambda c: c["confidence"])
+        return self._fuzzy(normalized)
+
+    def save(self, path: str) -> str:
+        """Pickle the built indexes to path"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            pickle.dump({"version": INDEX_VERSION, "resolver": self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SymbolResolver"]:
+        """Load a saved index (None if missing or from another index version)"""
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION:
+            return None
+        return payload["resolver"]
+
+    @classmethod
+    def from_fmp(cls, fmp_tool) -> "SymbolResolver":
+        """
+        Build from the FMP stock and ETF lists
+
+        Raises:
+            FMPError: If the lists could not be fetched
+        """
+        entries = [
+            (item.get("symbol"), item.get("name"), item.get("exchangeShortName") or "", item.get("type") or "stock")
+            for item in fmp_tool.get_symbol_list()
+        ]
+        return cls(entries)
+
+    @classmethod
+    def load_or_build(cls, fmp_tool, path: Optional[str] = None,
+                      max_age: float = DEFAULT_MAX_AGE) -> "SymbolResolver":
+        """
+        Load the cached index, rebuilding it from FMP when missing or older than max_age
+
+        If FMP is unreachable a stale index is still used; with no index at all an
+        empty resolver (aliases and unverified tickers only) is returned.
+        """
+        path = path or os.path.join(fmp_tool.data_dir, "symbol_index.pkl")
+        resolver = cls.load(path)
+        if resolver is not None and time.time() - resolver.built_at < max_age:
+            return resolver
+
+        try:
+            fresh = cls.from_fmp(fmp_tool)
+        except Exception as e:
+            print(f"⚠️ Could not refresh the symbol list: {e}")
+            return resolver or cls([])
+
+        if len(fresh):
+            fresh.save(path)
+            return fresh
+        return resolver or fresh
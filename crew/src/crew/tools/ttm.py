@@ -0,0 +1,129 @@
+"""
+Trailing-twelve-month (TTM) figures for quarterly statement data
+
+Flow items (revenue, EBIT, cash flows, ...) are summed over the trailing four
+quarters; stock items and identifiers keep the value at the quarter end.
+The rolling sums are computed for every quarter of every symbol in one pass
+over a long (symbol, date) frame: one cumulative sum over the stacked
+columns, differenced four rows apart, with windows that cross a symbol
+boundary or span more than a year of fiscal dates marked incomplete.
+Tax rate, after-tax EBIT and UFCF are then derived from the TTM sums.
+"""
+
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .panel import FinancialPanel, derive_ufcf_columns
+from .valuation import QUARTERS_PER_YEAR
+
+# Line items summed over the trailing four quarters; every other column is point-in-time
+FLOW_COLUMNS = (
+    "ebit", "ebitda", "tax_expense", "income_before_tax", "revenue", "net_income",
+    "depreciation_amortization", "capex", "working_capital_change",
+    "free_cash_flow", "operating_cash_flow",
+)
+
+# Largest gap between the first and last quarter end of a window (three quarters is ~273 days)
+MAX_WINDOW_DAYS = 300
+
+
+def compute_ttm(frame: pd.DataFrame, by: str = "symbol", date: str = "date",
+                flow_columns: Iterable[str] = FLOW_COLUMNS, dropna: bool = True) -> pd.DataFrame:
+    """
+    TTM values for every quarter of every group in a long frame
+
+    Args:
+        frame: Quarterly rows with a group column (symbol), a fiscal date and line items
+        by: Group column
+        date: Fiscal period end date column
+        flow_columns: Columns summed over the trailing four quarters
+        dropna: Drop quarters without four consecutive quarters of history
+
+    Returns:
+        Frame sorted by group then date (most recent first) with flow columns
+        replaced by TTM sums, derived UFCF columns recomputed from them and a
+        ttm_complete flag
+    """
+    frame = frame.sort_values([by, date], kind="stable").reset_index(drop=True)
+    flows = [c for c in flow_columns if c in frame.columns]
+    n = len(frame)
+    window = QUARTERS_PER_YEAR
+
+    values = frame[flows].to_numpy(dtype="float64")
+    cumulative = np.vstack([np.zeros((1, len(flows))), np.cumsum(np.nan_to_num(values), axis=0)])
+    finite = np.vstack([np.zeros((1, len(flows))), np.cumsum(np.isfinite(values), axis=0)])
+
+    # Row i sums rows i-3..i: cumulative[i + 1] - cumulative[i - 3]
+    end = np.arange(1, n + 1)
+    start = np.maximum(end - window, 0)
+    sums = cumulative[end] - cumulative[start]
+    counts = finite[end] - finite[start]
+
+    # Windows must stay inside one group and cover roughly one year of fiscal dates
+    codes = pd.factorize(frame[by])[0]
+    group_start = np.r_[0, np.flatnonzero(np.diff(codes)) + 1]
+    position = np.arange(n) - np.repeat(group_start, np.diff(np.r_[group_start, n]))
+    dates = pd.to_datetime(frame[date], errors="coerce").to_numpy(dtype="datetime64[D]")
+    first = dates[np.maximum(np.arange(n) - (window - 1), 0)]
+    span_ok = (dates - first) <= np.timedelta64(MAX_WINDOW_DAYS, "D")
+    complete = (position >= window - 1) & span_ok & (counts == window).all(axis=1)
+
+    result = frame.copy()
+    result[flows] = np.where(complete[:, None], sums, np.nan)
+    result["ttm_complete"] = complete
+    if {"ebit", "income_before_tax", "tax_expense", "depreciation_amortization",
+            "capex", "working_capital_change"} <= set(result.columns):
+        derive_ufcf_columns(result)
+        if not complete.all():
+            result.loc[~complete, ["tax_rate_percent", "ebit_after_tax", "unlevered_free_cash_flow"]] = np.nan
+
+    if dropna:
+        result = result[complete]
+    return result.iloc[::-1].sort_values(by, kind="stable").reset_index(drop=True)
+
+
+def annual_samples(ttm: pd.DataFrame, by: str = "symbol") -> pd.DataFrame:
+    """Every fourth TTM row per group from the most recent, i.e. non-overlapping yearly figures"""
+    return ttm[ttm.groupby(by, sort=False).cumcount() % QUARTERS_PER_YEAR == 0].reset_index(drop=True)
+
+
+def stack_panels(panels: List[FinancialPanel]) -> pd.DataFrame:
+    """One long frame (with a symbol column) from several panels"""
+    frames = [panel.frame.assign(symbol=panel.symbol) for panel in panels]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _ttm_result(panel: FinancialPanel, frame: pd.DataFrame) -> FinancialPanel:
+    if frame.empty:
+        raise ValueError(f"Not enough consecutive quarters for {panel.symbol} to compute TTM figures")
+    return FinancialPanel(panel.symbol, "ttm", frame.drop(columns=["symbol", "ttm_complete"]))
+
+
+def ttm_panel(panel: FinancialPanel) -> FinancialPanel:
+    """
+    TTM figures for every quarter of a quarterly panel with four quarters of history
+
+    Raises:
+        ValueError: If no quarter has four consecutive quarters of history
+    """
+    return _ttm_result(panel, compute_ttm(panel.frame.assign(symbol=panel.symbol)))
+
+
+def annualize(panel: FinancialPanel, years: Optional[int] = None) -> FinancialPanel:
+    """
+    Panel with one row per discounting year
+
+    Annual panels are returned as they are. Quarterly panels are converted to
+    TTM figures sampled every four quarters, so each row covers a full year.
+
+    Raises:
+        ValueError: If a quarterly panel has no four consecutive quarters
+    """
+    if panel.period != "quarter":
+        return panel
+    frame = annual_samples(compute_ttm(panel.frame.assign(symbol=panel.symbol)))
+    if years:
+        frame = frame.head(years)
+    return _ttm_result(panel, frame)
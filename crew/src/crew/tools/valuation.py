@@ -0,0 +1,145 @@
+"""
+Vectorized DCF valuation math
+
+Pure NumPy functions shared by FMPTool's sensitivity analysis and the batch
+engines. They follow the same conventions as FMPTool.calculate_dcf_valuation:
+the UFCF vector is discounted in the order given (period 1 first), the
+terminal value grows the last UFCF by the terminal growth rate, and net debt
+defaults to 5% of enterprise value when it is not known.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+# Quarterly statements per fiscal year
+QUARTERS_PER_YEAR = 4
+
+# Net debt estimate used when the balance sheet is not available
+DEFAULT_NET_DEBT_RATIO = 0.05
+
+
+def dcf_sensitivity_grid(ufcf: Sequence[float], discount_rates: Sequence[float],
+                         growth_rates: Sequence[float], net_debt: Optional[float] = None,
+                         shares_outstanding: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """
+    Value a UFCF vector over every (discount rate, terminal growth rate) pair in one pass
+
+    Args:
+        ufcf: UFCF per period, period 1 first
+        discount_rates: Discount rates (rows of the grid)
+        growth_rates: Terminal growth rates (columns of the grid)
+        net_debt: Net debt (if None, 5% of enterprise value)
+        shares_outstanding: Shares used for the per-share value (NaN grid if unknown)
+
+    Returns:
+        Dict of (len(discount_rates), len(growth_rates)) float64 arrays: enterprise_value,
+        equity_value, intrinsic_value_per_share, plus the boolean 'valid' mask.
+        Cells where growth >= discount rate are NaN.
+
+    Raises:
+        ValueError: If the UFCF vector is empty
+    """
+    ufcf = np.asarray(ufcf, dtype="float64")
+    if ufcf.size == 0:
+        raise ValueError("UFCF vector is empty")
+    r = np.asarray(discount_rates, dtype="float64")[:, None]
+    g = np.asarray(growth_rates, dtype="float64")[None, :]
+    n = ufcf.shape[0]
+
+    # (R, T) discount factors, reduced against the UFCF vector
+    pv_factors = (1.0 + r) ** -np.arange(1, n + 1, dtype="float64")
+    sum_pv = pv_factors @ ufcf
+
+    valid = g < r
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terminal_value = np.where(valid, ufcf[-1] * (1.0 + g) / (r - g), np.nan)
+    terminal_pv = terminal_value * pv_factors[:, -1:]
+
+    enterprise_value = sum_pv[:, None] + terminal_pv
+    debt = enterprise_value * DEFAULT_NET_DEBT_RATIO if net_debt is None else net_debt
+    equity_value = enterprise_value - debt
+
+    if shares_outstanding and shares_outstanding > 0:
+        per_share = equity_value / shares_outstanding
+    else:
+        per_share = np.full_like(equity_value, np.nan)
+
+    return {
+        "enterprise_value": enterprise_value,
+        "equity_value": equity_value,
+        "intrinsic_value_per_share": per_share,
+        "valid": valid,
+    }
+
+
+def shares_outstanding_from_profile(profile: Optional[Dict], current_price: Optional[float]) -> Optional[float]:
+    """Shares outstanding as market cap / price, falling back to the profile's sharesOutstanding"""
+    if not profile:
+        return None
+    shares = profile.get('mktCap', 0) / current_price if current_price else None
+    if not shares:
+        shares = profile.get('sharesOutstanding', 0)
+    return shares
+
+
+def grid_to_lists(grid: np.ndarray, digits: int = 2) -> list:
+    """JSON-friendly nested lists with NaN cells as None"""
+    rounded = np.round(grid, digits).astype(object)
+    rounded[np.isnan(grid)] = None
+    return rounded.tolist()
+
+
+def batch_dcf_valuation(ufcf_matrix: np.ndarray, discount_rate: float = 0.10,
+                        terminal_growth_rate: float = 0.03, net_debt: Optional[np.ndarray] = None,
+                        shares_outstanding: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Value many symbols at once from a stacked UFCF matrix
+
+    Args:
+        ufcf_matrix: (symbols, periods) UFCF, period 1 first; shorter histories are NaN-padded at the end
+        discount_rate: WACC/discount rate
+        terminal_growth_rate: Long-term growth rate
+        net_debt: Net debt per symbol (NaN or None -> 5% of enterprise value)
+        shares_outstanding: Shares per symbol (NaN -> no per-share value)
+
+    Returns:
+        Dict of per-symbol float64 vectors: years_analyzed, sum_pv_fcf, terminal_pv,
+        enterprise_value, net_debt, equity_value, intrinsic_value_per_share
+    """
+    ufcf = np.asarray(ufcf_matrix, dtype="float64")
+    n_symbols, n_periods = ufcf.shape
+    present = ~np.isnan(ufcf)
+    lengths = present.sum(axis=1)
+
+    pv_factors = (1.0 + discount_rate) ** -np.arange(1, n_periods + 1, dtype="float64")
+    sum_pv = np.where(present, ufcf * pv_factors, 0.0).sum(axis=1)
+
+    # Terminal value grows each row's last available UFCF
+    last_index = np.maximum(lengths - 1, 0)
+    final_ufcf = np.take_along_axis(np.nan_to_num(ufcf), last_index[:, None], axis=1)[:, 0]
+    terminal_value = final_ufcf * (1.0 + terminal_growth_rate) / (discount_rate - terminal_growth_rate)
+    terminal_pv = terminal_value * (1.0 + discount_rate) ** -lengths.astype("float64")
+
+    enterprise_value = np.where(lengths > 0, sum_pv + terminal_pv, np.nan)
+    if discount_rate <= terminal_growth_rate:
+        enterprise_value = np.full(n_symbols, np.nan)
+
+    debt = np.full(n_symbols, np.nan) if net_debt is None else np.asarray(net_debt, dtype="float64")
+    debt = np.where(np.isnan(debt), enterprise_value * DEFAULT_NET_DEBT_RATIO, debt)
+    equity_value = enterprise_value - debt
+
+    shares = np.full(n_symbols, np.nan) if shares_outstanding is None else np.asarray(shares_outstanding, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_share = np.where(shares > 0, equity_value / shares, np.nan)
+
+    return {
+        "years_analyzed": lengths,
+        "sum_pv_fcf": np.where(lengths > 0, sum_pv, np.nan),
+        "terminal_pv": np.where(lengths > 0, terminal_pv, np.nan),
+        "enterprise_value": enterprise_value,
+        "net_debt": debt,
+        "equity_value": equity_value,
+        "intrinsic_value_per_share": per_share,
+    }
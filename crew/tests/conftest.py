@@ -0,0 +1,83 @@
+"""Shared fixtures: an FMPTool whose HTTP client is replaced by canned FMP payloads"""
+
+import pytest
+
+from src.crew.tools.client import FMPNoDataError
+from tests.statements import cashflow_row, income_row
+
+
+class FakeFMP:
+    """Stands in for FMPClient.get, serving the same statements for every symbol"""
+
+    def __init__(self):
+        self.calls = []
+        self.overrides = {}
+
+    def get(self, endpoint, params=None):
+        self.calls.append(endpoint)
+        if endpoint in self.overrides:
+            result = self.overrides[endpoint]
+            if isinstance(result, Exception):
+                raise result
+            return result
+        limit = int((params or {}).get("limit", 5))
+        if endpoint.startswith("/income-statement/"):
+            return [income_row(2024 - i, i) for i in range(limit)]
+        if endpoint.startswith("/cash-flow-statement/"):
+            return [cashflow_row(2024 - i, i) for i in range(limit)]
+        if endpoint.startswith(("/quote/", "/quote-short/")):
+            return [{"symbol": s, "price": 200.0, "volume": 1} for s in endpoint.rsplit("/", 1)[1].split(",")]
+        if endpoint.startswith("/profile/"):
+            return [{"symbol": s, "mktCap": 3e12, "companyName": s, "price": 200.0}
+                    for s in endpoint.rsplit("/", 1)[1].split(",")]
+        raise FMPNoDataError(f"No data found at {endpoint}", endpoint, 404)
+
+
+@pytest.fixture
+def fake_fmp():
+    return FakeFMP()
+
+
+@pytest.fixture
+def make_tool(tmp_path, monkeypatch, fake_fmp):
+    """Build FMPTool instances in a temporary data directory, backed by fake_fmp"""
+    from src.crew.tools.fmp import FMPTool
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FMP_API_KEY", "test-key")
+    tools = []
+
+    def make(**kwargs):
+        kwargs.setdefault("cache_enabled", False)
+        kwargs.setdefault("calls_per_minute", 0)
+        kwargs.setdefault("background_exports", False)
+        tool = FMPTool(**kwargs)
+        tool._client.get = fake_fmp.get
+        tools.append(tool)
+        return tool
+
+    yield make
+    for tool in tools:
+        tool.close()
+
+
+@pytest.fixture
+def offline_crew(monkeypatch, make_tool):
+    """A DCFCrew whose agents answer without an LLM and whose FMP data is canned"""
+    from crewai import Agent
+
+    from src.crew.dcf_crew import DCFCrew
+    from src.crew.tools.symbols import SymbolResolver
+
+    for key in ("GEMINI_API_KEY", "OPENAI_API_KEY", "SERPER_API_KEY"):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setenv("CREWAI_DISABLE_TELEMETRY", "true")
+    monkeypatch.setenv("OTEL_SDK_DISABLED", "true")
+    monkeypatch.setattr(Agent, "execute_task", lambda self, task, context=None, tools=None: f"{task.name} done")
+
+    dcf_crew = DCFCrew()
+    dcf_crew.fmp_tool = make_tool()
+    dcf_crew._symbol_resolver = SymbolResolver([("AAPL", "Apple Inc.", "NASDAQ", "stock"),
+                                                ("F", "Ford Motor Company", "NYSE", "stock"),
+                                                ("FORD", "Forward Industries, Inc.", "NASDAQ", "stock")])
+    return dcf_crew
@@ -0,0 +1,16 @@
+"""Canned FMP statement rows shared by the tests"""
+
+
+def income_row(year: int, offset: int = 0, month: str = "09-30") -> dict:
+    return {
+        "date": f"{year}-{month}", "calendarYear": str(year), "period": "FY",
+        "operatingIncome": 100e9 + offset * 1e9, "ebitda": 120e9, "incomeBeforeTax": 110e9,
+        "incomeTaxExpense": 20e9, "revenue": 390e9, "netIncome": 90e9,
+    }
+
+
+def cashflow_row(year: int, offset: int = 0, month: str = "09-30") -> dict:
+    return {
+        "date": f"{year}-{month}", "depreciationAndAmortization": 11e9, "capitalExpenditure": -9e9,
+        "changeInWorkingCapital": 3e9 + offset * 1e8, "freeCashFlow": 100e9, "operatingCashFlow": 110e9,
+    }
@@ -0,0 +1,129 @@
+"""API endpoints served by pooled stub crews, without an LLM or FMP access"""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.crew.pool import CrewPool
+from src.crew.tools.client import FMPNoDataError, FMPTransportError
+
+
+class StubCrew:
+    """Answers analyze_company immediately; companies named 'Broken ...' fail"""
+
+    def __init__(self):
+        self.last_run = {}
+
+    def extract_stock_symbol(self, company):
+        return company.upper()[:4]
+
+    def analyze_company(self, query, progress=None):
+        if "Broken" in query:
+            raise RuntimeError("analysis failed")
+        self.last_run = {"run_id": query.split(" for ", 1)[1].split(" with ", 1)[0]}
+        return SimpleNamespace(raw=f"report: {self.last_run['run_id']}")
+
+
+@pytest.fixture
+def prefetch_started(monkeypatch):
+    """Prefetches that block until the test releases them"""
+    started, release = threading.Event(), threading.Event()
+    started.finished = threading.Event()
+
+    class Engine:
+        def __init__(self, fmp_tool):
+            pass
+
+        def prefetch(self, symbols):
+            started.set()
+            release.wait(10)
+            started.finished.set()
+            return {symbol: None for symbol in symbols}
+
+    monkeypatch.setattr(main, "BatchValuationEngine", Engine)
+    monkeypatch.setattr(main, "get_fmp_tool", lambda: None)
+    yield started
+    release.set()
+
+
+@pytest.fixture
+def client(monkeypatch, prefetch_started):
+    monkeypatch.setattr(main, "crew_pool", CrewPool(StubCrew, size=2, max_size=2))
+    return TestClient(main.app)
+
+
+def test_batch_returns_one_json_response_in_request_order(client, prefetch_started):
+    response = client.post("/batch_analyze", json=["Apple", "Broken Co", "Microsoft"])
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    body = response.json()
+    assert body["status"] == "completed"
+    assert body["total_companies"] == 3
+    assert [(r["company"], r["status"]) for r in body["results"]] == [
+        ("Apple", "success"), ("Broken Co", "failed"), ("Microsoft", "success")]
+    assert body["results"][0]["result"] == "report: Apple"
+    assert body["results"][1]["error"] == "analysis failed"
+    # The still-running prefetch did not hold the response back
+    assert prefetch_started.is_set()
+    assert not prefetch_started.finished.is_set()
+
+
+def test_batch_streams_ndjson_when_requested(client):
+    response = client.post("/batch_analyze?stream=true", json=["Apple", "Broken Co", "Microsoft"])
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    members, summary = lines[:-1], lines[-1]
+    assert sorted(m["company"] for m in members) == ["Apple", "Broken Co", "Microsoft"]
+    assert summary == {"status": "completed", "total_companies": 3, "succeeded": 2, "failed": 1,
+                       "concurrency": 2}
+
+
+@pytest.mark.parametrize("companies", [[], [" ", ""]])
+def test_batch_rejects_empty_lists(client, companies):
+    assert client.post("/batch_analyze", json=companies).status_code == 400
+
+
+def test_batch_rejects_oversized_lists(client, monkeypatch):
+    monkeypatch.setattr(main, "MAX_BATCH_SIZE", 2)
+    assert client.post("/batch_analyze", json=["A", "B", "C"]).status_code == 400
+
+
+@pytest.fixture
+def valuation_client(monkeypatch, make_tool, fake_fmp):
+    monkeypatch.setattr(main, "get_fmp_tool", lambda: make_tool())
+    return TestClient(main.app)
+
+
+def test_valuation_endpoint_computes_without_the_crew(valuation_client, fake_fmp):
+    response = valuation_client.get("/valuation/aapl?years=3&discount_rate=0.09")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["status"], body["symbol"], body["period"]) == ("success", "AAPL", "annual")
+    assert body["assumptions"] == {"terminal_growth_rate": 0.03, "discount_rate": 0.09, "years_analyzed": 3}
+    assert len(body["ufcf"]) == 3
+    assert body["valuation"]["market_comparison"]["current_price"] == 200.0
+    assert sorted(fake_fmp.calls) == ["/cash-flow-statement/AAPL", "/income-statement/AAPL",
+                                      "/profile/AAPL", "/quote-short/AAPL"]
+
+
+@pytest.mark.parametrize("query", ["period=monthly", "years=0", "years=11",
+                                   "discount_rate=0.03&terminal_growth_rate=0.03"])
+def test_valuation_endpoint_rejects_bad_parameters(valuation_client, fake_fmp, query):
+    assert valuation_client.get(f"/valuation/AAPL?{query}").status_code == 400
+    assert fake_fmp.calls == []
+
+
+def test_valuation_endpoint_maps_fetch_errors(valuation_client, fake_fmp):
+    fake_fmp.overrides["/income-statement/ZZZZ"] = FMPNoDataError("No data", "/income-statement/ZZZZ", 404)
+    assert valuation_client.get("/valuation/ZZZZ").status_code == 404
+
+    fake_fmp.overrides["/income-statement/AAPL"] = FMPTransportError("HTTP 503", "/income-statement/AAPL", 503)
+    assert valuation_client.get("/valuation/AAPL").status_code == 502
@@ -0,0 +1,109 @@
+"""Async bundle fetches over the pooled HTTP session (mocked, no network)"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.crew.tools.client import FMPTransportError
+from tests.statements import cashflow_row, income_row
+
+
+class Response:
+    def __init__(self, payload, status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class Session:
+    """Answers FMP URLs; with a barrier, every request waits until all are in flight"""
+
+    def __init__(self, barrier=None, fail=()):
+        self.barrier = barrier
+        self.fail = fail
+        self.urls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self._lock:
+            self.urls.append(url)
+        if self.barrier is not None:
+            self.barrier.wait()
+        endpoint = url.split("/api/v3", 1)[1]
+        if endpoint.startswith(self.fail):
+            return Response({}, status_code=503)
+        limit = int(params.get("limit", 5))
+        if endpoint.startswith("/income-statement/"):
+            return Response([income_row(2024 - i, i) for i in range(limit)])
+        if endpoint.startswith("/cash-flow-statement/"):
+            return Response([cashflow_row(2024 - i, i) for i in range(limit)])
+        if endpoint.startswith("/quote-short/"):
+            return Response([{"symbol": "AAPL", "price": 200.0}])
+        return Response([{"symbol": "AAPL", "mktCap": 3e12, "price": 200.0}])
+
+
+@pytest.fixture
+def session_tool(make_tool):
+    """Tool whose FMPClient runs for real on top of a mocked requests session"""
+    def make(session, **kwargs):
+        tool = make_tool(max_retries=0, **kwargs)
+        del tool._client.get
+        tool._client.session.get = session.get
+        return tool
+    return make
+
+
+def test_afetch_data_issues_the_bundle_requests_concurrently(session_tool):
+    session = Session(barrier=threading.Barrier(4, timeout=5))
+    tool = session_tool(session)
+
+    bundle = asyncio.run(tool.afetch_data("AAPL", "annual", 3, tool.fetch_plan("valuation")))
+
+    assert set(bundle) == {"income", "cashflow", "quote", "profile"}
+    assert len(bundle["income"]) == 3
+    assert bundle["quote"] == 200.0
+    assert sorted(url.rsplit("/", 2)[1] for url in session.urls) == [
+        "cash-flow-statement", "income-statement", "profile", "quote-short"]
+
+
+def test_afetch_data_skips_endpoints_already_fetched(session_tool):
+    session = Session()
+    tool = session_tool(session)
+
+    bundle = asyncio.run(tool.afetch_data("AAPL", "annual", 3, tool.fetch_plan("valuation"),
+                                          data={"income": [], "cashflow": []}))
+
+    assert bundle["income"] == []
+    assert len(session.urls) == 2
+
+
+def test_afetch_data_respects_max_concurrency(session_tool):
+    # A barrier for two requests cannot be passed if only one is in flight at a time
+    session = Session(barrier=threading.Barrier(2, timeout=0.5))
+    tool = session_tool(session, max_concurrency=1)
+
+    with pytest.raises(threading.BrokenBarrierError):
+        asyncio.run(tool.afetch_data("AAPL", "annual", 3, ("income", "cashflow")))
+
+
+def test_afetch_data_raises_typed_errors(session_tool):
+    tool = session_tool(Session(fail=("/cash-flow-statement/",)))
+
+    with pytest.raises(FMPTransportError):
+        asyncio.run(tool.afetch_data("AAPL", "annual", 3))
+
+
+def test_async_valuation_matches_the_sync_one(session_tool):
+    tool = session_tool(Session())
+
+    async_result = asyncio.run(tool.acalculate_dcf_valuation("AAPL", years=3))
+    sync_result = tool.calculate_dcf_valuation("AAPL", years=3)
+
+    assert async_result["valuation_summary"] == sync_result["valuation_summary"]
@@ -0,0 +1,86 @@
+"""Batch valuation engine against the scalar FMPTool.calculate_dcf_valuation"""
+
+import numpy as np
+import pytest
+
+from src.crew.tools.batch import BatchValuationEngine
+from src.crew.tools.client import FMPNoDataError
+from tests.statements import cashflow_row, income_row
+
+QUARTER_ENDS = ["03-31", "06-30", "09-30", "12-31"]
+
+
+def statements(fake_fmp, symbol, rows):
+    """Serve rows (income, cash flow) pairs for symbol's statements"""
+    fake_fmp.overrides[f"/income-statement/{symbol}"] = [income for income, _ in rows]
+    fake_fmp.overrides[f"/cash-flow-statement/{symbol}"] = [cashflow for _, cashflow in rows]
+
+
+def annual(years, scale=0):
+    return [(income_row(2024 - i, i + scale), cashflow_row(2024 - i, i + scale)) for i in range(years)]
+
+
+def quarterly(count, scale=0):
+    """count consecutive quarters, newest first, ending 2024-12-31"""
+    rows = []
+    for i in range(count):
+        year, quarter = 2024 - i // 4, 3 - i % 4
+        income, cashflow = (income_row(year, i + scale, QUARTER_ENDS[quarter]),
+                            cashflow_row(year, i + scale, QUARTER_ENDS[quarter]))
+        income["period"] = f"Q{quarter + 1}"
+        rows.append((income, cashflow))
+    return rows
+
+
+def assert_matches_scalar(tool, frame, period, years):
+    for row in frame.itertuples(index=False):
+        scalar = tool.calculate_dcf_valuation(row.symbol, period, years)
+        if isinstance(row.error, str):
+            assert "error" in scalar
+            assert np.isnan(row.enterprise_value)
+            continue
+        summary, market = scalar["valuation_summary"], scalar["market_comparison"]
+        assert row.years_analyzed == scalar["assumptions"]["years_analyzed"]
+        # The scalar path rounds each year's present value, so allow a few dollars of drift
+        assert row.enterprise_value == pytest.approx(summary["enterprise_value"], abs=5)
+        assert row.equity_value == pytest.approx(summary["equity_value"], abs=5)
+        assert row.intrinsic_value_per_share == pytest.approx(summary["intrinsic_value_per_share"], abs=0.011)
+        assert row.current_price == market["current_price"]
+        assert row.recommendation == market["recommendation"]
+
+
+def test_annual_batch_matches_scalar_valuations(make_tool, fake_fmp):
+    statements(fake_fmp, "AAPL", annual(5))
+    statements(fake_fmp, "MSFT", annual(3, scale=7))
+    fake_fmp.overrides["/income-statement/ZZZZ"] = FMPNoDataError("No data", "/income-statement/ZZZZ", 404)
+    tool = make_tool()
+
+    frame = BatchValuationEngine(tool, max_workers=2).run(["aapl", "MSFT", "ZZZZ", "AAPL"], "annual", 5)
+
+    assert list(frame["symbol"]) == ["AAPL", "MSFT", "ZZZZ"]
+    assert list(frame["years_analyzed"]) == [5, 3, 0]
+    assert frame["error"].iloc[2].startswith("FMPNoDataError")
+    assert frame["recommendation"].iloc[2] == "N/A"
+    assert_matches_scalar(tool, frame, "annual", 5)
+
+
+def test_ufcf_vectors_are_nan_padded_per_symbol(make_tool, fake_fmp):
+    statements(fake_fmp, "AAPL", annual(5))
+    statements(fake_fmp, "MSFT", annual(2))
+    ufcf = BatchValuationEngine(make_tool()).fetch_ufcf(["AAPL", "MSFT"], "annual", 5)
+
+    assert [len(ufcf["AAPL"]), len(ufcf["MSFT"])] == [5, 2]
+    np.testing.assert_allclose(ufcf["MSFT"], ufcf["AAPL"][:2])
+
+
+def test_quarterly_batch_uses_ttm_like_the_scalar_path(make_tool, fake_fmp):
+    statements(fake_fmp, "AAPL", quarterly(16))
+    statements(fake_fmp, "MSFT", quarterly(9, scale=3))
+    statements(fake_fmp, "NVDA", quarterly(3))
+    tool = make_tool()
+
+    frame = BatchValuationEngine(tool).run(["AAPL", "MSFT", "NVDA"], "quarter", 3)
+
+    assert list(frame["years_analyzed"]) == [3, 2, 0]
+    assert "Not enough consecutive quarters for NVDA" in frame["error"].iloc[2]
+    assert_matches_scalar(tool, frame, "quarter", 3)
@@ -0,0 +1,50 @@
+"""Batched quote/profile lookups"""
+
+from src.crew.tools.client import FMPTransportError
+
+
+def test_failed_chunk_falls_back_to_single_requests(make_tool, fake_fmp):
+    tool = make_tool()
+    fake_fmp.overrides["/quote/AAPL,MSFT"] = FMPTransportError("connection reset", "/quote/AAPL,MSFT")
+    fake_fmp.overrides["/quote-short/MSFT"] = FMPTransportError("connection reset", "/quote-short/MSFT")
+
+    prices = tool.get_current_prices(["AAPL", "MSFT", "NVDA"], chunk_size=2)
+
+    assert prices == {"AAPL": 200.0, "MSFT": None, "NVDA": 200.0}
+    assert "/quote-short/AAPL" in fake_fmp.calls
+
+
+def test_batch_items_are_cached_under_single_keys(make_tool, fake_fmp):
+    tool = make_tool(cache_enabled=True)
+    tool.get_company_profiles(["AAPL", "MSFT"])
+    calls = len(fake_fmp.calls)
+
+    assert tool.get_company_profile("MSFT")["symbol"] == "MSFT"
+    assert len(fake_fmp.calls) == calls
+
+
+def test_many_symbols_take_one_request_per_chunk(make_tool, fake_fmp):
+    tool = make_tool(cache_enabled=True)
+    symbols = [f"S{i:03d}" for i in range(120)]
+
+    prices = tool.get_current_prices(symbols, chunk_size=50)
+    profiles = tool.get_company_profiles(symbols, chunk_size=50)
+
+    assert len(prices) == len(profiles) == 120
+    assert sorted(len(call.rsplit("/", 1)[1].split(",")) for call in fake_fmp.calls) == [20, 20, 50, 50, 50, 50]
+    assert sum(call.startswith("/quote/") for call in fake_fmp.calls) == 3
+
+    # Every symbol is now cached under its single-symbol key
+    fake_fmp.calls.clear()
+    tool.get_current_prices(symbols)
+    tool.get_company_profiles(symbols)
+    assert fake_fmp.calls == []
+
+
+def test_failed_chunk_costs_one_request_per_member(make_tool, fake_fmp):
+    tool = make_tool()
+    fake_fmp.overrides["/profile/AAPL,MSFT"] = FMPTransportError("connection reset", "/profile/AAPL,MSFT")
+
+    tool.get_company_profiles(["AAPL", "MSFT", "NVDA", "AMZN"], chunk_size=2)
+
+    assert sorted(fake_fmp.calls) == ["/profile/AAPL", "/profile/AAPL,MSFT", "/profile/MSFT", "/profile/NVDA,AMZN"]
@@ -0,0 +1,77 @@
+"""FMP response cache: keys, per-endpoint TTLs, LRU eviction and FMPTool integration"""
+
+import pytest
+
+from src.crew.tools import cache as cache_module
+from src.crew.tools.cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache module"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    response_cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttls={"statement": 100, "profile": 50, "quote": 10})
+    yield response_cache
+    response_cache.close()
+
+
+def test_key_ignores_the_api_key_and_parameter_order():
+    assert ResponseCache.make_key("/income-statement/AAPL", {"limit": 5, "period": "annual", "apikey": "x"}) == \
+        ResponseCache.make_key("/income-statement/AAPL", {"period": "annual", "limit": "5"})
+    assert ResponseCache.make_key("/profile/AAPL") == "/profile/AAPL"
+
+
+def test_hits_and_misses_are_counted(cache):
+    assert cache.get("/profile/AAPL") is None
+    cache.set("/profile/AAPL", None, [{"symbol": "AAPL"}])
+    assert cache.get("/profile/AAPL") == [{"symbol": "AAPL"}]
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.parametrize("endpoint, ttl", [("/income-statement/AAPL", 100), ("/cash-flow-statement/AAPL", 100),
+                                           ("/profile/AAPL", 50), ("/quote/AAPL", 10), ("/quote-short/AAPL", 10)])
+def test_entries_expire_after_their_endpoint_ttl(cache, clock, endpoint, ttl):
+    cache.set(endpoint, {"limit": 5}, [{"value": 1}])
+    clock[0] += ttl - 1
+    assert cache.get(endpoint, {"limit": 5}) == [{"value": 1}]
+    clock[0] += 1
+    assert cache.get(endpoint, {"limit": 5}) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    small = ResponseCache(str(tmp_path / "small.sqlite3"), max_bytes=250)
+    payload = [{"padding": "x" * 80}]
+    for symbol in ("AAPL", "MSFT"):
+        small.set(f"/profile/{symbol}", None, payload)
+        clock[0] += 1
+    small.get("/profile/AAPL")  # MSFT is now the least recently used
+    clock[0] += 1
+    small.set("/profile/NVDA", None, payload)
+
+    assert small.get("/profile/MSFT") is None
+    assert small.get("/profile/AAPL") == payload
+    assert small.get("/profile/NVDA") == payload
+    assert small.stats()["evictions"] == 1
+    small.close()
+
+
+def test_repeat_valuations_are_served_from_the_cache(make_tool, fake_fmp):
+    tool = make_tool(cache_enabled=True)
+    first = tool.calculate_dcf_valuation("AAPL")
+    calls = len(fake_fmp.calls)
+    second = tool.calculate_dcf_valuation("AAPL")
+
+    assert calls > 0
+    assert len(fake_fmp.calls) == calls
+    assert second["valuation_summary"] == first["valuation_summary"]
+    assert tool.cache_stats()["hits"] >= calls
@@ -0,0 +1,57 @@
+"""FMPClient error typing and retries (no network or API key needed)"""
+
+import pytest
+import requests
+
+from src.crew.tools.client import FMPClient, FMPNoDataError, FMPTransportError
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self.headers = {}
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+def client_with(responses):
+    """Client whose session returns (or raises) the given items in order"""
+    client = FMPClient("https://fmp.test/api/v3", "secret-key", max_retries=2, backoff_factor=0)
+    calls = iter(responses)
+
+    def get(url, params=None, timeout=None):
+        item = next(calls)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    client.session.get = get
+    return client
+
+
+@pytest.mark.parametrize("error", [
+    requests.exceptions.ConnectionError("https://fmp.test/?apikey=secret-key"),
+    requests.exceptions.ChunkedEncodingError("connection broken"),
+    requests.exceptions.ContentDecodingError("bad gzip"),
+])
+def test_request_exceptions_become_transport_errors(error):
+    client = client_with([error] * 3)
+    with pytest.raises(FMPTransportError) as info:
+        client.get("/quote/AAPL")
+    assert "secret-key" not in str(info.value)
+
+
+def test_transient_failure_is_retried():
+    client = client_with([requests.exceptions.ChunkedEncodingError("broken"), FakeResponse(payload=[{"price": 1.0}])])
+    assert client.get("/quote/AAPL") == [{"price": 1.0}]
+
+
+def test_404_is_no_data():
+    client = client_with([FakeResponse(404)])
+    with pytest.raises(FMPNoDataError):
+        client.get("/profile/NOPE")
@@ -0,0 +1,51 @@
+"""Partitioned Parquet dataset: column types stay readable across runs"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from src.crew.tools.dataset import read_dataset, write_partition
+
+
+def test_all_null_column_is_written_as_float(tmp_path):
+    write_partition(str(tmp_path), pd.DataFrame({"price_variance": [None]}), "AAPL", "dcf",
+                    generated_at=datetime(2025, 1, 30, 9))
+    write_partition(str(tmp_path), pd.DataFrame({"price_variance": [1.5]}), "AAPL", "dcf",
+                    generated_at=datetime(2025, 1, 31, 9))
+
+    frame = read_dataset(str(tmp_path), symbol="AAPL", data_type="dcf").sort_values("generated_at")
+
+    assert frame["price_variance"].isna().tolist() == [True, False]
+    assert frame["price_variance"].iloc[1] == 1.5
+    assert sorted(frame["run_date"].astype(str)) == ["2025-01-30", "2025-01-31"]
+
+
+def test_incompatible_drift_is_promoted_on_read(tmp_path):
+    # A column that was text in one run and numeric in another is read back as strings
+    write_partition(str(tmp_path), pd.DataFrame({"rating": ["A"], "value": [1]}), "MSFT", "dcf",
+                    generated_at=datetime(2025, 2, 1, 9))
+    write_partition(str(tmp_path), pd.DataFrame({"rating": [2.0], "value": [2.5]}), "MSFT", "dcf",
+                    generated_at=datetime(2025, 2, 2, 9))
+
+    frame = read_dataset(str(tmp_path)).sort_values("generated_at")
+
+    assert frame["rating"].tolist() == ["A", "2"]
+    assert frame["value"].tolist() == [1.0, 2.5]
+
+
+def test_parquet_exports_append_even_when_payload_is_unchanged(make_tool):
+    tool = make_tool()
+    payload = [{"date": "2024-09-30", "revenue": 390e9}]
+
+    first = tool.save_to_parquet(payload, "AAPL", "income-statement")
+    second = tool.save_to_parquet(payload, "AAPL", "income-statement")
+
+    assert first != second
+    assert len(read_dataset(f"{tool.data_dir}/dataset", symbol="AAPL")) == 2
+
+
+def test_csv_exports_are_deduplicated(make_tool):
+    tool = make_tool()
+    payload = [{"date": "2024-09-30", "revenue": 390e9}]
+
+    assert tool.save_to_csv(payload, "AAPL_income") == tool.save_to_csv(payload, "AAPL_income")
@@ -0,0 +1,133 @@
+"""DCFCrew query handling that runs without an LLM or FMP access"""
+
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from crewai import Agent
+
+from src.crew.dcf_crew import DCFCrew, REPORT_FILE
+from src.crew.tools.symbols import SymbolResolver
+
+
+@pytest.fixture
+def crew_stub():
+    resolver = SymbolResolver([
+        ("AAPL", "Apple Inc.", "NASDAQ", "stock"),
+        ("ZBQH", "Zebra Quantum Holdings", "NYSE", "stock"),
+    ])
+    return SimpleNamespace(get_symbol_resolver=lambda: resolver)
+
+
+def test_resolved_company_keeps_symbol_and_name(crew_stub):
+    info = DCFCrew._extract_basic_info(crew_stub, "Analyze Apple for DCF")
+    assert info["stock_symbol"] == "AAPL"
+    assert info["company_name"] == "Apple Inc."
+
+
+def test_unknown_company_keeps_parsed_name(crew_stub):
+    info = DCFCrew._extract_basic_info(crew_stub, "Analyze Flurbo Gadgets with 3 years of data")
+    assert info["stock_symbol"] is None
+    assert info["company_name"] == "Flurbo Gadgets"
+    assert info["years"] == 3
+
+
+def test_rejected_weak_match_keeps_name_as_written(crew_stub):
+    info = DCFCrew._extract_basic_info(crew_stub, "Analyze Zebronic Widgets for DCF")
+    assert info["stock_symbol"] is None
+    assert info["company_name"] == "Zebronic Widgets"
+
+
+def test_research_result_salts_later_tasks():
+    stub = SimpleNamespace(
+        _cache_salt={"model": "m", "data": ""},
+        _symbol_from_research=lambda raw: "AAPL" if "Apple" in raw else None,
+        _data_fingerprint=lambda symbol, period, years: f"{symbol}-{period}-{years}" if symbol else "",
+    )
+    tasks = [SimpleNamespace(name="extract_company_info", cache_salt={"model": "m", "data": ""}),
+             SimpleNamespace(name="fetch_financial_data", cache_salt=None)]
+    reported = []
+
+    on_done = DCFCrew._salt_after_research(stub, tasks, "annual", 5, reported.append)
+    on_done(SimpleNamespace(raw="Company: Apple Inc."))
+    assert tasks[1].cache_salt == {"model": "m", "data": "AAPL-annual-5"}
+    assert tasks[0].cache_salt == {"model": "m", "data": ""}
+    assert len(reported) == 1
+
+
+def test_unresolved_research_leaves_later_tasks_uncached():
+    stub = SimpleNamespace(
+        _cache_salt={"model": "m", "data": ""},
+        _symbol_from_research=lambda raw: None,
+        _data_fingerprint=lambda symbol, period, years: "",
+    )
+    tasks = [SimpleNamespace(name="extract_company_info", cache_salt={"model": "m", "data": ""}),
+             SimpleNamespace(name="fetch_financial_data", cache_salt=None)]
+
+    DCFCrew._salt_after_research(stub, tasks, "annual", 5)(SimpleNamespace(raw="No idea"))
+    assert tasks[1].cache_salt is None
+
+
+def test_each_run_gets_a_new_crew(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FMP_API_KEY", "test-key")
+    for key in ("GEMINI_API_KEY", "OPENAI_API_KEY", "SERPER_API_KEY"):
+        monkeypatch.delenv(key, raising=False)
+    dcf_crew = DCFCrew()
+
+    first = dcf_crew.crew()
+    second = dcf_crew.crew(skip_tasks=["extract_company_info"])
+    assert first is not second
+    assert first is not dcf_crew.crew()
+    assert [t.name for t in second.tasks] == ["fetch_financial_data", "calculate_dcf_metrics",
+                                              "generate_analysis_report"]
+    # Tasks (and their output cache) are reused across runs
+    assert second.tasks[0] is first.tasks[1]
+    assert second.tasks[0].output_cache is not None
+
+
+def test_runs_write_outputs_to_their_own_directory(offline_crew, tmp_path):
+    runs = []
+    for _ in range(2):
+        result = offline_crew.analyze_company("Analyze Apple for DCF")
+        runs.append((result.raw, offline_crew.last_run["run_id"]))
+
+    (first_raw, first_id), (second_raw, second_id) = runs
+    assert first_id != second_id
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".md")]
+    for raw, run_id in runs:
+        output_dir = os.path.join(offline_crew.fmp_tool.data_dir, "runs", run_id)
+        assert sorted(os.listdir(output_dir)) == sorted(["dcf_calculations.md", "financial_data.md", REPORT_FILE])
+        with open(os.path.join(output_dir, REPORT_FILE), encoding="utf-8") as f:
+            assert f.read() == raw
+        assert json.loads(raw)["metadata"]["run_id"] == run_id
+
+
+@pytest.mark.parametrize("query, fast_path", [("Analyze Apple for DCF", True),
+                                              ("DCF for FORD", True),
+                                              ("Analyze Apple, then Zebra Widgets", False),
+                                              ("Analyze Ford for DCF", False),
+                                              ("Analyze aapl for DCF", False)])
+def test_confident_parse_skips_company_research(offline_crew, query, fast_path):
+    offline_crew.analyze_company(query)
+
+    assert offline_crew.last_run["fast_path"] is fast_path
+    assert ("extract_company_info" in offline_crew.last_run["task_cache"]) is not fast_path
+
+
+def test_report_task_gets_only_the_narrative_brief(offline_crew, monkeypatch):
+    contexts = {}
+
+    def execute_task(self, task, context=None, tools=None):
+        contexts[task.name] = context
+        return f"{task.name} done"
+
+    monkeypatch.setattr(Agent, "execute_task", execute_task)
+    offline_crew.analyze_company("Analyze Apple for DCF")
+
+    report_task = next(t for t in offline_crew.tasks if t.name == "generate_analysis_report")
+    assert not contexts["generate_analysis_report"]
+    assert "Valuation: intrinsic" in report_task.description
+    assert "previous task" not in report_task.description
+    assert "fetch_financial_data done" in contexts["calculate_dcf_metrics"]
@@ -0,0 +1,39 @@
+"""dcf_interface.py --valuation prints the valuation without building the crew"""
+
+import json
+import sys
+
+import pytest
+
+import dcf_interface
+
+
+@pytest.fixture
+def cli(monkeypatch, make_tool):
+    import crew.tools.fmp
+
+    monkeypatch.setattr(crew.tools.fmp, "get_fmp_tool", lambda: make_tool())
+    monkeypatch.setattr(dcf_interface, "create_dcf_crew", lambda: pytest.fail("the crew must not be built"))
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", ["dcf_interface.py", *args])
+        with pytest.raises(SystemExit) as exit_info:
+            dcf_interface.main()
+        return exit_info.value.code
+
+    return run
+
+
+def test_valuation_prints_json(cli, capsys):
+    assert cli("--valuation", "AAPL", "--years", "3") == 0
+
+    result = json.loads(capsys.readouterr().out)
+    assert result["symbol"] == "AAPL"
+    assert result["assumptions"]["years_analyzed"] == 3
+    assert result["valuation"]["valuation_summary"]["intrinsic_value_per_share"] > 0
+
+
+def test_valuation_error_exits_nonzero(cli, capsys, fake_fmp):
+    assert cli("--valuation", "not a symbol!") == 1
+    assert json.loads(capsys.readouterr().out)["error_type"] == "invalid_symbol"
+    assert fake_fmp.calls == []
@@ -0,0 +1,85 @@
+"""Write-only Excel exports read back through openpyxl"""
+
+from datetime import datetime
+
+from openpyxl import load_workbook
+
+from src.crew.tools.excel import MAX_SHEET_NAME, data_sheets, write_symbol_workbook, write_workbook
+
+
+def read(path):
+    """Sheet name -> list of row tuples"""
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return {sheet.title: list(sheet.iter_rows(values_only=True)) for sheet in workbook.worksheets}
+    finally:
+        workbook.close()
+
+
+def test_sheets_and_values_round_trip(tmp_path):
+    sheets = {
+        "Income": (["year", "note", "revenue"], iter([[2024, None, 390.5], [2023, "restated", 383.0]])),
+        "Flags": (["ok"], [[True]]),
+    }
+    book = read(write_workbook(str(tmp_path / "book.xlsx"), sheets))
+
+    assert list(book) == ["Income", "Flags"]
+    assert book["Income"] == [("year", "note", "revenue"), (2024, None, 390.5), (2023, "restated", 383.0)]
+    assert book["Flags"] == [("ok",), (True,)]
+
+
+def test_long_and_duplicate_sheet_names_are_made_unique(tmp_path):
+    name = "X" * 40
+    book = read(write_workbook(str(tmp_path / "book.xlsx"), {name: (["a"], [[1]]), name + "Y": (["b"], [[2]])}))
+
+    first, second = list(book)
+    assert first == name[:MAX_SHEET_NAME]
+    assert second == f"{name[:MAX_SHEET_NAME - 3]}_2"
+    assert book[second] == [("b",), (2,)]
+
+
+def test_empty_workbook_gets_a_placeholder_sheet(tmp_path):
+    assert read(write_workbook(str(tmp_path / "empty.xlsx"), {})) == {"Summary": [("No data",)]}
+
+
+def test_record_rows_take_the_union_of_keys_and_stringify_nested_values():
+    header, rows = data_sheets([{"date": "2024-09-30", "revenue": 1.0},
+                                {"date": "2023-09-30", "segments": {"iPhone": 0.5}}])["Financial_Data"]
+    assert header == ["date", "revenue", "segments"]
+    assert list(rows) == [["2024-09-30", 1.0, None], ["2023-09-30", None, "{'iPhone': 0.5}"]]
+
+
+def test_valuation_is_flattened_with_its_projections():
+    valuation = {"symbol": "AAPL", "valuation_summary": {"enterprise_value": 1e12},
+                 "cash_flow_projections": [{"year": 1, "ufcf": 1e11}], "company_profile": {"sector": "Tech"}}
+    sheets = data_sheets(valuation)
+
+    assert list(sheets) == ["Valuation", "Cash_Flow_Projections"]
+    assert list(sheets["Valuation"][1]) == [["symbol", "AAPL"], ["valuation_summary_enterprise_value", 1e12]]
+
+
+def test_symbol_workbook_has_a_sheet_per_data_type(tmp_path):
+    sections = {
+        "income-statement": [{"date": "2024-09-30", "revenue": 390e9}],
+        "ufcf": {"symbol": "AAPL", "ufcf_calculations": [{"year": "2024", "unlevered_free_cash_flow": 1e11}]},
+        "valuation": {"error": "no quote"},
+    }
+    path = write_symbol_workbook(str(tmp_path / "AAPL.xlsx"), "AAPL", sections, generated_at=datetime(2025, 1, 2))
+    book = read(path)
+
+    assert list(book) == ["Summary", "INCOME_STATEMENT", "UFCF"]
+    assert book["Summary"][1] == ("AAPL", "income-statement, ufcf, valuation", "2025-01-02 00:00:00")
+    assert book["UFCF"] == [("year", "unlevered_free_cash_flow"), ("2024", 1e11)]
+
+
+def test_tool_excel_export_matches_its_data(make_tool):
+    tool = make_tool(dedupe_exports=False)
+    data = tool.get_dcf_data("AAPL", "annual", 3)
+
+    book = read(tool.save_to_excel(data, "AAPL_DCF_Data"))
+
+    assert list(book) == ["Financial_Data", "Summary"]
+    header, *rows = book["Financial_Data"]
+    assert len(rows) == 3
+    assert [dict(zip(header, row))["date"] for row in rows] == [record["date"] for record in data["data"]]
+    assert book["Summary"][1][:3] == ("AAPL", "annual", 3)
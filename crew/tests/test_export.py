@@ -0,0 +1,89 @@
+"""Background export queue: bounded, drained by flush, failures recorded"""
+
+import os
+import threading
+
+import pytest
+
+from src.crew.tools.export import ExportQueue
+
+
+@pytest.fixture
+def exports():
+    queue = ExportQueue(max_workers=2, max_pending=2)
+    yield queue
+    queue.close()
+
+
+def write(path, text="data"):
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+
+def test_flush_drains_every_queued_write(exports, tmp_path):
+    paths = [str(tmp_path / f"export_{i}.csv") for i in range(10)]
+    for i, path in enumerate(paths):
+        exports.submit(f"export_{i}", write, path)
+
+    outcomes = exports.flush()
+
+    assert sorted(o["key"] for o in outcomes) == sorted(f"export_{i}" for i in range(10))
+    assert all(o["error"] is None and os.path.exists(o["path"]) for o in outcomes)
+    assert exports.stats() == {"submitted": 10, "pending": 0, "completed": 10, "failed": 0,
+                               "max_pending": 2, "workers": 2}
+
+
+def test_failed_writes_are_recorded_and_raised(exports, capsys):
+    def broken():
+        raise OSError("disk full")
+
+    future = exports.submit("raises", broken)
+    exports.submit("reports", lambda: "Error: no data")
+    outcomes = {o["key"]: o for o in exports.flush()}
+
+    with pytest.raises(OSError):
+        future.result()
+    assert outcomes["raises"]["error"] == "OSError: disk full"
+    assert outcomes["reports"]["error"] == "Error: no data"
+    assert exports.stats()["failed"] == 2
+    assert "Background export raises failed" in capsys.readouterr().out
+
+
+def test_submit_blocks_while_max_pending_writes_are_outstanding(exports):
+    release = threading.Event()
+    for key in ("a", "b"):
+        exports.submit(key, release.wait, 10)
+
+    third = threading.Thread(target=exports.submit, args=("c", lambda: "c"))
+    third.start()
+    third.join(0.1)
+    assert third.is_alive()
+    assert exports.stats()["submitted"] == 2
+
+    release.set()
+    third.join(5)
+    exports.flush()
+    assert exports.stats()["completed"] == 3
+
+
+def test_closed_queue_refuses_writes(tmp_path):
+    queue = ExportQueue()
+    queue.submit("late", write, str(tmp_path / "late.csv"))
+    queue.close()
+
+    assert os.path.exists(tmp_path / "late.csv")
+    with pytest.raises(RuntimeError):
+        queue.submit("after", write, str(tmp_path / "after.csv"))
+
+
+def test_tool_returns_before_background_exports_finish(make_tool):
+    tool = make_tool(background_exports=True, dedupe_exports=False)
+
+    message = tool._run("AAPL", "ufcf", save_to_file=True, save_format="both")
+    assert "queued for export" in message
+
+    outcomes = tool.flush_exports()
+    assert [o["key"] for o in sorted(outcomes, key=lambda o: o["key"])] == [
+        "AAPL_UFCF_Data:CSV", "AAPL_UFCF_Data:Excel"]
+    assert all(os.path.exists(o["path"]) for o in outcomes)
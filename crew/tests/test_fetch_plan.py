@@ -0,0 +1,36 @@
+"""Each FMP endpoint is requested once per valuation or report"""
+
+from collections import Counter
+
+import pytest
+
+
+def test_valuation_requests_each_endpoint_once(make_tool, fake_fmp):
+    tool = make_tool()
+
+    valuation = tool.calculate_dcf_valuation("AAPL")
+
+    assert "error" not in valuation
+    assert Counter(fake_fmp.calls) == Counter({"/income-statement/AAPL": 1, "/cash-flow-statement/AAPL": 1,
+                                               "/quote-short/AAPL": 1, "/profile/AAPL": 1})
+
+
+@pytest.mark.parametrize("data_type, expected", [
+    ("valuation", 4),
+    ("ufcf", 2),
+    ("income-statement", 1),
+])
+def test_tool_run_requests_only_its_fetch_plan(make_tool, fake_fmp, data_type, expected):
+    tool = make_tool()
+    tool._run("AAPL", data_type, save_to_file=False)
+
+    assert len(fake_fmp.calls) == len(set(fake_fmp.calls)) == expected
+
+
+def test_comprehensive_report_fetches_statements_once(make_tool, fake_fmp):
+    tool = make_tool(dedupe_exports=False)
+
+    paths = tool.create_comprehensive_report("AAPL", save_format="csv")
+
+    assert "error" not in paths
+    assert sorted(fake_fmp.calls) == ["/cash-flow-statement/AAPL", "/income-statement/AAPL"]
@@ -0,0 +1,24 @@
+"""Importing the FMP tool must not pull in crewai until the agent tool is built"""
+
+import subprocess
+import sys
+
+
+def _loaded_after(statement: str) -> str:
+    code = f"import sys; {statement}; print('crewai' in sys.modules)"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return proc.stdout.strip()
+
+
+def test_fmp_module_defers_crewai():
+    assert _loaded_after("import src.crew.tools.fmp") == "False"
+    assert _loaded_after("import src.crew.tools.batch") == "False"
+
+
+def test_fmp_tool_is_a_crewai_tool():
+    from crewai.tools import BaseTool
+    from src.crew.tools.fmp import FMPTool, FMPToolBase
+
+    assert issubclass(FMPTool, BaseTool)
+    assert issubclass(FMPTool, FMPToolBase)
+    assert FMPTool.__name__ == "FMPTool"
@@ -0,0 +1,109 @@
+"""Incremental statement sync: full first fetch, probe-sized refreshes afterwards"""
+
+import pytest
+
+from src.crew.tools.history import StatementHistory
+from tests.statements import income_row
+
+
+class Source:
+    """Newest-first statement rows served like FMP, recording each requested limit"""
+
+    def __init__(self, years):
+        self.rows = [income_row(year) for year in sorted(years, reverse=True)]
+        self.requests = []
+
+    def __call__(self, count):
+        self.requests.append(count)
+        return self.rows[:count]
+
+
+@pytest.fixture
+def history(tmp_path):
+    store = StatementHistory(str(tmp_path / "history.sqlite3"), probe_periods=2)
+    yield store
+    store.close()
+
+
+def years(rows):
+    return [int(row["calendarYear"]) for row in rows]
+
+
+def test_first_sync_fetches_the_full_history(history):
+    source = Source(range(2015, 2025))
+
+    rows = history.sync("aapl", "income", "annual", 5, source)
+
+    assert source.requests == [5]
+    assert years(rows) == [2024, 2023, 2022, 2021, 2020]
+    assert history.stats()["full_syncs"] == 1
+    assert history.stats()["rows_stored"] == 5
+
+
+def test_no_new_period_only_probes(history):
+    source = Source(range(2015, 2025))
+    history.sync("AAPL", "income", "annual", 5, source)
+
+    rows = history.sync("AAPL", "income", "annual", 3, source)
+
+    assert source.requests == [5, 2]
+    assert years(rows) == [2024, 2023, 2022]
+    stats = history.stats()
+    assert (stats["full_syncs"], stats["incremental_syncs"], stats["rows_written"]) == (1, 1, 5)
+
+
+def test_new_period_is_appended_from_the_probe(history):
+    source = Source(range(2015, 2025))
+    history.sync("AAPL", "income", "annual", 5, source)
+
+    source.rows.insert(0, income_row(2025))
+    rows = history.sync("AAPL", "income", "annual", 5, source)
+
+    assert source.requests == [5, 2]
+    assert years(rows) == [2025, 2024, 2023, 2022, 2021]
+    assert history.stats()["rows_stored"] == 6
+
+
+def test_probe_of_only_new_periods_falls_back_to_a_full_fetch(history):
+    source = Source(range(2015, 2025))
+    history.sync("AAPL", "income", "annual", 5, source)
+
+    source.rows[:0] = [income_row(2027), income_row(2026), income_row(2025)]
+    rows = history.sync("AAPL", "income", "annual", 5, source)
+
+    assert source.requests == [5, 2, 5]
+    assert years(rows) == [2027, 2026, 2025, 2024, 2023]
+
+
+def test_deeper_request_than_synced_fetches_again(history):
+    source = Source(range(2015, 2025))
+    history.sync("AAPL", "income", "annual", 3, source)
+    history.sync("AAPL", "income", "annual", 8, source)
+
+    assert source.requests == [3, 8]
+
+
+def test_probe_bypasses_the_cached_fetch(history):
+    source = Source(range(2015, 2025))
+    stale = list(source.rows)
+    history.sync("AAPL", "income", "annual", 5, source)
+
+    source.rows.insert(0, income_row(2025))
+    rows = history.sync("AAPL", "income", "annual", 5, lambda count: stale[:count], probe=source)
+
+    assert years(rows)[0] == 2025
+
+
+def test_tool_probe_skips_the_response_cache(make_tool, fake_fmp):
+    tool = make_tool(cache_enabled=True, incremental_sync=True)
+    # The second call caches a probe-sized response
+    for _ in range(2):
+        assert years(tool.get_income_statement("AAPL", "annual", 5)) == [2024, 2023, 2022, 2021, 2020]
+
+    fake_fmp.overrides["/income-statement/AAPL"] = [income_row(year) for year in range(2025, 2019, -1)]
+    fake_fmp.calls.clear()
+    rows = tool.get_income_statement("AAPL", "annual", 5)
+
+    assert fake_fmp.calls == ["/income-statement/AAPL"]
+    assert years(rows) == [2025, 2024, 2023, 2022, 2021]
+    assert tool.sync_stats()["incremental_syncs"] == 2
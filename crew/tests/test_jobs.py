@@ -0,0 +1,177 @@
+"""Background jobs: submission, progress, cancellation and recovery"""
+
+import threading
+import time
+
+import pytest
+
+from src.crew import jobs
+from src.crew.jobs import JobManager, JobQueueFull, JobStore
+
+
+def wait_for(manager, job_id, states=jobs.TERMINAL_STATES, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job["status"] in states:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} still {job['status']}")
+
+
+@pytest.fixture
+def store(tmp_path):
+    job_store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    yield job_store
+    job_store.close()
+
+
+@pytest.fixture
+def make_manager(store):
+    managers = []
+
+    def make(runner, **kwargs):
+        manager = JobManager(store, runner, **kwargs)
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.close(wait=True)
+
+
+def test_submitted_job_reports_progress_and_result(make_manager):
+    def runner(params, report):
+        report({"completed": 1, "total": 2})
+        return {"echo": params["query"]}
+
+    manager = make_manager(runner)
+    job = manager.submit("analysis", {"query": "Analyze Apple"})
+    assert job["status"] in ("queued", "running")
+
+    job = wait_for(manager, job["id"])
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"echo": "Analyze Apple"}
+    assert job["progress"] == {"completed": 1, "total": 2}
+    assert job["started_at"] <= job["finished_at"]
+    assert manager.stats()["running"] == 0
+
+
+def test_failed_job_keeps_the_error(make_manager):
+    def runner(params, report):
+        raise RuntimeError("no data for ZZZZ")
+
+    manager = make_manager(runner)
+    job = wait_for(manager, manager.submit("analysis", {})["id"])
+    assert (job["status"], job["error"]) == ("failed", "no data for ZZZZ")
+
+
+def test_cancelled_queued_job_never_starts(make_manager):
+    release, started = threading.Event(), []
+
+    def runner(params, report):
+        started.append(params["n"])
+        release.wait(10)
+        return None
+
+    manager = make_manager(runner, workers=1)
+    first = manager.submit("analysis", {"n": 1})
+    second = manager.submit("analysis", {"n": 2})
+    assert manager.cancel(second["id"])["status"] == "cancelled"
+    release.set()
+
+    assert wait_for(manager, first["id"])["status"] == "succeeded"
+    manager.close(wait=True)
+    assert started == [1]
+    assert manager.get(second["id"])["started_at"] is None
+
+
+def test_running_job_stops_at_its_next_progress_report(make_manager):
+    reported, proceed = threading.Event(), threading.Event()
+    steps = []
+
+    def runner(params, report):
+        for step in range(3):
+            report({"completed": step})
+            steps.append(step)
+            reported.set()
+            proceed.wait(10)
+
+    manager = make_manager(runner)
+    job_id = manager.submit("analysis", {})["id"]
+    assert reported.wait(10)
+    assert manager.cancel(job_id)["cancel_requested"]
+    proceed.set()
+
+    job = wait_for(manager, job_id)
+    assert job["status"] == "cancelled"
+    assert steps == [0]
+
+
+def test_cancellation_stops_a_crew_between_tasks(make_manager, offline_crew):
+    def runner(params, report):
+        return offline_crew.analyze_company(params["query"], progress=report).raw
+
+    manager = make_manager(runner)
+    original_update = manager.store.update
+
+    def update(job_id, **fields):
+        original_update(job_id, **fields)
+        if "progress" in fields:
+            if fields["progress"]["completed"] == 1:
+                manager.store.request_cancel(job_id)
+
+    manager.store.update = update
+    job = wait_for(manager, manager.submit("analysis", {"query": "Analyze Apple for DCF"})["id"])
+
+    assert job["status"] == "cancelled"
+    assert job["progress"]["tasks"] == {"fetch_financial_data": "done", "calculate_dcf_metrics": "pending",
+                                        "generate_analysis_report": "pending"}
+
+
+def test_queue_limit_refuses_new_jobs(make_manager):
+    release = threading.Event()
+    manager = make_manager(lambda params, report: release.wait(10), workers=1, max_queued=2)
+    manager.submit("analysis", {})
+    manager.submit("analysis", {})
+
+    with pytest.raises(JobQueueFull):
+        manager.submit("analysis", {})
+    release.set()
+
+
+def test_heartbeat_keeps_running_jobs_alive(make_manager, monkeypatch):
+    monkeypatch.setattr(jobs, "HEARTBEAT_INTERVAL", 0.05)
+    release = threading.Event()
+    manager = make_manager(lambda params, report: release.wait(10))
+    job = manager.submit("analysis", {})
+
+    wait_for(manager, job["id"], states=("running",))
+    time.sleep(0.2)
+    assert manager.get(job["id"])["heartbeat_at"] > job["heartbeat_at"]
+    assert manager.store.recover(stale_after=0.1) == 0
+    release.set()
+
+
+def test_recover_fails_jobs_with_a_stale_heartbeat(store):
+    orphaned = store.create("analysis", {})
+    store.update(orphaned["id"], status="running", heartbeat_at=time.time() - 300)
+    alive = store.create("analysis", {})
+    finished = store.create("analysis", {})
+    store.update(finished["id"], status="succeeded", heartbeat_at=time.time() - 300)
+
+    assert store.recover(stale_after=120) == 1
+    assert store.get(orphaned["id"])["status"] == "failed"
+    assert store.get(orphaned["id"])["error"] == "Interrupted by a server restart"
+    assert store.get(alive["id"])["status"] == "queued"
+    assert store.get(finished["id"])["status"] == "succeeded"
+
+
+def test_purge_removes_only_old_finished_jobs(store):
+    old = store.create("analysis", {})
+    store.update(old["id"], status="failed", finished_at=time.time() - 7200)
+    queued = store.create("analysis", {})
+
+    assert store.purge(max_age=3600) == 1
+    assert store.get(old["id"]) is None
+    assert [job["id"] for job in store.list()] == [queued["id"]]
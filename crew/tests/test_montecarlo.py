@@ -0,0 +1,48 @@
+"""Monte Carlo DCF against the deterministic valuation"""
+
+import pytest
+
+from src.crew.tools.montecarlo import simulate_dcf
+
+FIXED = {
+    "discount_rate": {"dist": "fixed", "value": 0.10},
+    "terminal_growth": {"dist": "fixed", "value": 0.03},
+    "ufcf_growth": {"dist": "fixed", "value": 0.0},
+}
+
+
+def test_zero_variance_simulation_matches_deterministic_valuation(make_tool):
+    tool = make_tool()
+    deterministic = tool.calculate_dcf_valuation("AAPL", discount_rate=0.10, terminal_growth_rate=0.03)
+    simulated = tool.simulate_dcf_valuation("AAPL", paths=1_000, seed=1, distributions=FIXED)
+
+    expected = deterministic["market_comparison"]["intrinsic_value"]
+    assert simulated["horizon_years"] == deterministic["assumptions"]["years_analyzed"]
+    for value in simulated["percentiles"].values():
+        assert value == pytest.approx(expected, abs=0.01)
+
+
+def test_default_distribution_brackets_deterministic_value(make_tool):
+    tool = make_tool()
+    expected = tool.calculate_dcf_valuation("AAPL")["market_comparison"]["intrinsic_value"]
+    simulated = tool.simulate_dcf_valuation("AAPL", paths=20_000, seed=7)
+
+    assert simulated["percentiles"]["p25"] < expected < simulated["percentiles"]["p75"]
+
+
+def test_single_base_ufcf_is_repeated_over_horizon():
+    result = simulate_dcf(1e9, paths=1_000, seed=3, distributions=FIXED, horizon=4)
+    assert result["horizon_years"] == 4
+    assert result["base_ufcf"] == [1e9] * 4
+    assert simulate_dcf(1e9, paths=1_000, seed=3)["percentiles"] == simulate_dcf(1e9, paths=1_000, seed=3)["percentiles"]
+
+
+def test_probability_undervalued_counts_invalid_paths():
+    # Half the paths draw terminal growth at or above the discount rate and have no value
+    distributions = {**FIXED, "terminal_growth": {"dist": "uniform", "low": 0.0, "high": 0.2}}
+    result = simulate_dcf(1e9, paths=10_000, seed=5, distributions=distributions,
+                          shares_outstanding=1e6, current_price=0.01)
+
+    assert result["valid_paths"] + result["invalid_paths"] == 10_000
+    assert result["invalid_paths"] == pytest.approx(5_000, rel=0.05)
+    assert result["probability_undervalued"] == pytest.approx(result["valid_paths"] / 10_000)
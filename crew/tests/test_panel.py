@@ -0,0 +1,40 @@
+"""Joining income and cash flow statements into a FinancialPanel"""
+
+import numpy as np
+import pytest
+
+from src.crew.tools.panel import FinancialPanel
+from tests.statements import cashflow_row, income_row
+
+
+def test_statements_join_on_fiscal_year_when_dates_differ():
+    income = [income_row(2024, 0, "09-30"), income_row(2023, 1, "09-30")]
+    # Cash flow filings dated a few days off the income statements
+    cashflow = [cashflow_row(2024, 0, "09-28"), cashflow_row(2023, 1, "09-29")]
+    for row, year in zip(cashflow, (2024, 2023)):
+        row.update(calendarYear=str(year), period="FY")
+
+    panel = FinancialPanel.from_statements("AAPL", "annual", income, cashflow)
+
+    assert list(panel.frame["date"]) == ["2024-09-30", "2023-09-30"]
+    assert list(panel.frame["working_capital_change"]) == [3e9, 3.1e9]
+    assert list(panel.frame["capex"]) == [9e9, 9e9]
+
+
+def test_unmatched_periods_are_dropped_and_rows_sorted_newest_first():
+    income = [income_row(2022, 2), income_row(2024, 0), income_row(2021, 3)]
+    cashflow = [cashflow_row(2024, 0), cashflow_row(2022, 2), cashflow_row(2020, 4)]
+
+    panel = FinancialPanel.from_statements("AAPL", "annual", income, cashflow)
+
+    assert list(panel.frame["calendarYear"]) == ["2024", "2022"]
+    # UFCF = EBIT * (1 - tax rate) + D&A - CapEx - change in working capital
+    tax_rate = 20e9 / 110e9
+    expected = [round((100e9 + i * 1e9) * (1 - round(tax_rate * 100, 2) / 100) + 11e9 - 9e9 - (3e9 + i * 1e8))
+                for i in (0, 2)]
+    np.testing.assert_allclose(panel.ufcf, expected)
+
+
+def test_statements_without_a_shared_period_raise():
+    with pytest.raises(ValueError, match="share no fiscal period"):
+        FinancialPanel.from_statements("AAPL", "annual", [income_row(2024)], [cashflow_row(2023)])
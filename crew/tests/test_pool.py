@@ -0,0 +1,138 @@
+"""Crew pool: warm-up, checkout/return, concurrent map and counters"""
+
+import threading
+import time
+
+import pytest
+
+from src.crew.pool import CrewPool, PoolExhausted
+
+
+class StubCrew:
+    """Records resets; fails to reset once broken"""
+
+    created = 0
+
+    def __init__(self):
+        StubCrew.created += 1
+        self.number = StubCrew.created
+        self.resets = 0
+        self.broken = False
+
+    def reset(self):
+        if self.broken:
+            raise RuntimeError("stuck run")
+        self.resets += 1
+
+
+@pytest.fixture
+def pool():
+    StubCrew.created = 0
+    return CrewPool(StubCrew, size=2, max_size=3)
+
+
+def test_warm_creates_size_instances_once(pool):
+    assert pool.warm() == 2
+    assert pool.warm() == 0
+    assert pool.warm(10) == 1
+    stats = pool.stats()
+    assert (stats["created"], stats["idle"], stats["in_use"]) == (3, 3, 0)
+
+
+def test_returned_instance_is_reset_and_reused(pool):
+    pool.warm(1)
+    with pool.checkout() as crew:
+        assert pool.stats()["in_use"] == 1
+    with pool.checkout() as again:
+        assert again is crew
+    assert crew.resets == 2
+    assert pool.stats()["checkouts"] == 2
+    assert pool.stats()["created"] == 1
+
+
+def test_instances_are_created_on_demand_up_to_max_size(pool):
+    with pool.checkout() as a, pool.checkout() as b, pool.checkout() as c:
+        assert len({a.number, b.number, c.number}) == 3
+        with pytest.raises(PoolExhausted):
+            with pool.checkout(timeout=0.01):
+                pass
+    stats = pool.stats()
+    assert (stats["created"], stats["idle"], stats["waits"]) == (3, 3, 1)
+
+
+def test_waiting_checkout_gets_the_next_returned_instance():
+    pool = CrewPool(StubCrew, size=1)
+    got = []
+
+    def wait():
+        with pool.checkout(timeout=5) as crew:
+            got.append(crew)
+
+    with pool.checkout() as first:
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        time.sleep(0.05)
+    waiter.join(5)
+    assert got == [first]
+    assert pool.stats()["avg_wait_ms"] > 0
+
+
+def test_instance_failing_reset_is_discarded(pool):
+    with pool.checkout() as crew:
+        crew.broken = True
+    stats = pool.stats()
+    assert (stats["created"], stats["discarded"], stats["idle"]) == (0, 1, 0)
+    with pool.checkout() as fresh:
+        assert fresh is not crew
+
+
+def test_map_unordered_yields_in_completion_order(pool):
+    delays = {"slow": 0.2, "fast": 0.0, "medium": 0.1}
+
+    def work(crew, item):
+        time.sleep(delays[item])
+        return item.upper()
+
+    results = list(pool.map_unordered(work, delays, concurrency=3))
+
+    assert [item for item, _, _ in results] == ["fast", "medium", "slow"]
+    assert all(result == item.upper() and error is None for item, result, error in results)
+    assert pool.stats()["in_use"] == 0
+
+
+def test_map_unordered_returns_errors_per_item(pool):
+    def work(crew, item):
+        if item == "bad":
+            raise ValueError("no data")
+        return item
+
+    results = {item: (result, error) for item, result, error in pool.map_unordered(work, ["ok", "bad", "fine"])}
+
+    assert results["ok"] == ("ok", None)
+    assert results["bad"][0] is None
+    assert isinstance(results["bad"][1], ValueError)
+    assert pool.stats()["idle"] == pool.stats()["created"]
+
+
+def test_map_unordered_caps_concurrency(pool):
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def work(crew, item):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    list(pool.map_unordered(work, range(8), concurrency=10))
+
+    assert peak[0] <= pool.max_size
+    assert pool.stats()["checkouts"] == 8
+
+
+def test_from_env_sizes_the_pool(monkeypatch):
+    monkeypatch.setenv("CREW_POOL_SIZE", "3")
+    monkeypatch.setenv("CREW_POOL_MAX_SIZE", "1")
+    pool = CrewPool.from_env(StubCrew)
+    assert (pool.size, pool.max_size) == (3, 3)
@@ -0,0 +1,78 @@
+"""Query parsing and the confidence that decides the research fast path"""
+
+import pytest
+
+from src.crew.dcf_crew import FAST_PATH_CONFIDENCE, SYMBOL_MIN_CONFIDENCE
+from src.crew.query_parser import parse_query
+from src.crew.tools.symbols import SymbolResolver
+
+
+@pytest.fixture
+def resolver():
+    return SymbolResolver([
+        ("AAPL", "Apple Inc.", "NASDAQ", "stock"),
+        ("MSFT", "Microsoft Corporation", "NASDAQ", "stock"),
+        ("BRK-B", "Berkshire Hathaway Inc.", "NYSE", "stock"),
+    ])
+
+
+def test_fields_are_extracted(resolver):
+    info = parse_query("Run a DCF on Microsoft with 7 years of quarterly data", resolver)
+    assert info["stock_symbol"] == "MSFT"
+    assert info["company_name"] == "Microsoft Corporation"
+    assert (info["period"], info["years"], info["analysis_type"]) == ("quarter", 7, "dcf")
+
+
+def test_years_are_clamped_and_defaulted(resolver):
+    assert parse_query("Analyze Apple with 40 years of data", resolver)["years"] == 10
+    assert parse_query("Analyze Apple", resolver)["years"] == 5
+
+
+@pytest.mark.parametrize("query", [
+    "Analyze Apple for DCF",          # exact name
+    "DCF valuation for $AAPL",         # cashtag
+    "Analyze Berkshire Hathaway",      # full name, corporate suffix ignored
+])
+def test_confident_parses_take_the_fast_path(resolver, query):
+    info = parse_query(query, resolver)
+    assert info["confidence"] >= FAST_PATH_CONFIDENCE
+    assert info["symbol_confidence"] >= SYMBOL_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("query", ["Analyze Apple, then Zebra Widgets", "Analyze Apple Inc (AAPL)"])
+def test_several_company_spans_lower_the_confidence(resolver, query):
+    info = parse_query(query, resolver)
+    assert info["stock_symbol"] == "AAPL"
+    assert info["symbol_confidence"] >= FAST_PATH_CONFIDENCE
+    assert info["confidence"] < FAST_PATH_CONFIDENCE
+
+
+def test_partial_names_do_not_take_the_fast_path(resolver):
+    info = parse_query("Analyze Micro", resolver)
+    assert info["stock_symbol"] == "MSFT"
+    assert info["confidence"] < FAST_PATH_CONFIDENCE
+
+
+def test_unverified_tickers_have_no_confidence():
+    info = parse_query("Analyze NVDA", SymbolResolver([]))
+    assert info["stock_symbol"] == "NVDA"
+    assert info["symbol_method"] == "unverified"
+    assert info["confidence"] == 0.0
+
+
+def test_unknown_company_keeps_its_name(resolver):
+    info = parse_query("Analyze Flurbo Gadgets for 3 years", resolver)
+    assert info["stock_symbol"] is None
+    assert info["company_name"] == info["company_span"] == "Flurbo Gadgets"
+    assert info["confidence"] == 0.0
+
+
+@pytest.mark.parametrize("query, symbol, method", [("Analyze Ford for DCF", "F", "prefix"),
+                                                   ("Analyze aapl", "AAPL", "ticker_case")])
+def test_inexact_matches_do_not_clear_the_fast_path(query, symbol, method):
+    resolver = SymbolResolver([("F", "Ford Motor Company", "NYSE", "stock"),
+                               ("FORD", "Forward Industries, Inc.", "NASDAQ", "stock"),
+                               ("AAPL", "Apple Inc.", "NASDAQ", "stock")])
+    info = parse_query(query, resolver)
+    assert (info["stock_symbol"], info["symbol_method"]) == (symbol, method)
+    assert info["confidence"] < FAST_PATH_CONFIDENCE
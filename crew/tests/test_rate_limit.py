@@ -0,0 +1,87 @@
+"""Shared token-bucket rate limiter"""
+
+import threading
+
+import pytest
+
+from src.crew.tools import rate_limit as rate_limit_module
+from src.crew.tools.client import FMPClient
+from src.crew.tools.rate_limit import RateLimiter
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the waits instead of sleeping"""
+    recorded = []
+    monkeypatch.setattr(rate_limit_module.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_burst_is_free_then_calls_queue_at_the_rate(tmp_path, sleeps):
+    limiter = RateLimiter(str(tmp_path / "bucket.sqlite3"), calls_per_minute=60, burst=2)
+    waits = [limiter.acquire() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    # One call per second: the third caller waits ~1s, the fourth queues behind it for ~2s
+    assert waits[2] == pytest.approx(1.0, abs=0.05)
+    assert waits[3] == pytest.approx(2.0, abs=0.05)
+    assert sleeps == waits[2:]
+
+    stats = limiter.stats()
+    assert (stats["acquisitions"], stats["waits"]) == (4, 2)
+    assert stats["max_wait_seconds"] == pytest.approx(2.0, abs=0.05)
+    assert stats["available_tokens"] < 0
+
+
+def test_limiters_on_the_same_file_share_one_budget(tmp_path, sleeps):
+    path = str(tmp_path / "bucket.sqlite3")
+    # Separate instances stand in for separate worker processes
+    first = RateLimiter(path, calls_per_minute=60, burst=3)
+    second = RateLimiter(path, calls_per_minute=60, burst=3)
+
+    waits = []
+    threads = [threading.Thread(target=lambda limiter=limiter: waits.append(limiter.acquire()))
+               for limiter in (first, second, first, second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(waits)[:3] == [0.0, 0.0, 0.0]
+    assert sorted(waits)[3] == pytest.approx(1.0, abs=0.1)
+
+
+def test_rate_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        RateLimiter(str(tmp_path / "bucket.sqlite3"), calls_per_minute=0)
+
+
+def test_every_client_attempt_draws_a_token():
+    class CountingLimiter:
+        acquired = 0
+
+        def acquire(self):
+            self.acquired += 1
+            return 0.0
+
+    class Response:
+        headers = {}
+
+        def __init__(self, status_code, payload=None):
+            self.status_code = status_code
+            self.payload = payload
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.payload
+
+    limiter = CountingLimiter()
+    client = FMPClient("https://fmp.test/api/v3", "secret-key", max_retries=2, backoff_factor=0,
+                       rate_limiter=limiter)
+    responses = iter([Response(429), Response(503), Response(200, [{"price": 1.0}])])
+    client.session.get = lambda url, params=None, timeout=None: next(responses)
+
+    assert client.get("/quote/AAPL") == [{"price": 1.0}]
+    assert limiter.acquired == 3
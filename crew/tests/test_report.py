@@ -0,0 +1,100 @@
+"""Hybrid report: deterministic sections from the tool, narrative parsed from the LLM"""
+
+import json
+
+import pytest
+
+from src.crew.report import assemble_report, build_report_data, narrative_brief, parse_narrative
+from src.crew.tools.client import FMPError
+from tests.statements import cashflow_row, income_row
+
+NARRATIVE = {
+    "executive_summary": "Apple looks fairly valued.",
+    "company_overview": "Apple sells hardware and services.",
+    "trends": {"revenue_trend": "Flat.", "profitability_trend": "Stable.", "cash_flow_trend": "Steady."},
+    "key_insights": ["Large buybacks", "Services growth", "Strong margins"],
+}
+
+
+@pytest.fixture
+def report_data(make_tool):
+    return build_report_data(make_tool(), "AAPL", "annual", 5)
+
+
+def test_build_report_data_converts_amounts_to_billions(report_data):
+    assert report_data["symbol"] == "AAPL"
+    revenue = report_data["financial_metrics"]["revenue"]
+    assert [m["year"] for m in revenue] == [2024, 2023, 2022, 2021, 2020]
+    assert revenue[0] == {"year": 2024, "value": 390.0, "currency": "USD_billions"}
+    assert report_data["financial_metrics"]["tax_rate"][0]["unit"] == "percent"
+
+    latest = report_data["dcf_analysis"]["ufcf_calculations"][0]
+    assert (latest["ebit"], latest["depreciation"]) == (100.0, 11.0)
+    valuation = report_data["valuation"]
+    assert valuation["current_price"] == 200.0
+    assert valuation["upside_potential"] == round(
+        (valuation["intrinsic_value"] - 200.0) / 200.0 * 100, 1)
+    assert "5 annual periods" in report_data["data_quality_notes"]
+
+
+def test_build_report_data_notes_short_history(make_tool, fake_fmp):
+    fake_fmp.overrides["/income-statement/AAPL"] = [income_row(2024 - i, i) for i in range(3)]
+    fake_fmp.overrides["/cash-flow-statement/AAPL"] = [cashflow_row(2024 - i, i) for i in range(3)]
+    report = build_report_data(make_tool(), "AAPL", "annual", 5)
+
+    assert len(report["dcf_analysis"]["ufcf_calculations"]) == 3
+    assert "Only 3 of the requested 5 years" in report["data_quality_notes"]
+
+
+def test_build_report_data_reports_fetch_errors(make_tool, fake_fmp):
+    fake_fmp.overrides["/income-statement/AAPL"] = FMPError("Rate limited", "/income-statement/AAPL", 429)
+    report = build_report_data(make_tool(), "AAPL")
+    assert set(report) == {"error", "error_type"}
+
+
+def test_brief_carries_latest_figures_and_valuation(report_data):
+    brief = narrative_brief(report_data)
+    assert brief.startswith("Company: AAPL (AAPL)")
+    assert "revenue: latest $390.0B (2024)" in brief
+    assert "Valuation: intrinsic $" in brief
+
+
+@pytest.mark.parametrize("text", [
+    json.dumps(NARRATIVE),
+    f"Here is the narrative:\n```json\n{json.dumps(NARRATIVE, indent=2)}\n```",
+])
+def test_parse_narrative_accepts_plain_and_fenced_json(text):
+    assert parse_narrative(text) == NARRATIVE
+
+
+@pytest.mark.parametrize("text", [None, "", "no json here", "{not: valid}", "[1, 2]"])
+def test_parse_narrative_rejects_unusable_output(text):
+    assert parse_narrative(text) == {}
+
+
+def test_parse_narrative_drops_unknown_and_empty_keys():
+    text = json.dumps({"executive_summary": "Short.", "company_overview": "", "valuation": {"x": 1}})
+    assert parse_narrative(text) == {"executive_summary": "Short."}
+
+
+def test_assemble_report_keeps_the_computed_numbers(report_data):
+    text = json.dumps({**NARRATIVE, "financial_metrics": {}, "valuation": {"intrinsic_value": 1}})
+    report = assemble_report(report_data, text)
+
+    assert report["executive_summary"] == NARRATIVE["executive_summary"]
+    assert report["key_insights"] == NARRATIVE["key_insights"]
+    assert report["financial_metrics"] == report_data["financial_metrics"]
+    assert report["valuation"]["intrinsic_value"] == report_data["valuation"]["intrinsic_value"]
+    assert report["dcf_analysis"]["trends"] == NARRATIVE["trends"]
+    assert "_profile" not in report
+
+
+def test_assemble_report_falls_back_to_generated_narrative(report_data):
+    text = json.dumps({"trends": {"revenue_trend": "Flat."}, "key_insights": "One insight"})
+    report = assemble_report(report_data, text)
+
+    trends = report["dcf_analysis"]["trends"]
+    assert trends["revenue_trend"] == "Flat."
+    assert "per year" in trends["profitability_trend"]
+    assert report["key_insights"] == ["One insight"]
+    assert "intrinsic value" in report["executive_summary"]
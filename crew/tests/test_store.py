@@ -0,0 +1,126 @@
+"""Export store: content-addressed reuse, adoption of old exports and retention"""
+
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.crew.tools.dataset import write_partition
+from src.crew.tools.store import ExportStore, payload_digest
+
+DAY = 86400
+
+
+def export(data_dir, name, content="date,revenue\n2024,1\n", age_days=0):
+    """Write a timestamped export file, optionally backdated"""
+    path = os.path.join(data_dir, name)
+    with open(path, "w") as f:
+        f.write(content)
+    stamp = time.time() - age_days * DAY
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+@pytest.fixture
+def store(tmp_path):
+    export_store = ExportStore(str(tmp_path))
+    yield export_store
+    export_store.close()
+
+
+def test_payload_digest_reuses_the_indexed_file(store, tmp_path):
+    digest = payload_digest("csv", "AAPL_income", [{"revenue": 1}])
+    assert store.lookup(digest) is None
+
+    path = store.add(digest, export(str(tmp_path), "AAPL_INCOME_20250101_090000.csv"), "AAPL", "income", "csv")
+    assert store.lookup(digest) == path
+    assert payload_digest("csv", "AAPL_income", [{"revenue": 2}]) != digest
+
+    os.remove(path)
+    assert store.lookup(digest) is None
+    assert store.stats()["objects"] == 0
+
+
+def test_compact_adopts_old_exports_and_links_duplicates(store, tmp_path):
+    first = export(str(tmp_path), "AAPL_INCOME_20250101_090000.csv")
+    copy = export(str(tmp_path), "AAPL_INCOME_20250102_090000.csv")
+    other = export(str(tmp_path), "MSFT_INCOME_20250102_090000.csv", content="date,revenue\n2024,2\n")
+    export(str(tmp_path), "notes.txt")
+
+    result = store.compact()
+
+    assert (result["adopted"], result["duplicates_linked"]) == (3, 1)
+    assert os.path.samefile(first, copy)
+    assert not os.path.samefile(first, other)
+    assert store.stats()["objects"] == 2
+    assert store.compact()["adopted"] == 0
+
+
+def test_adopt_rejects_files_that_are_not_exports(store, tmp_path):
+    with pytest.raises(ValueError):
+        store.adopt(export(str(tmp_path), "notes.txt"))
+
+
+def test_keep_last_and_max_age_retention(store, tmp_path):
+    data_dir = str(tmp_path)
+    for day in range(1, 5):
+        export(data_dir, f"AAPL_DCF_2025010{day}_090000.csv", content=f"run {day}", age_days=10 - day)
+    recent = export(data_dir, "MSFT_DCF_20250109_090000.csv", content="msft", age_days=1)
+
+    result = store.compact(keep_last=2)
+    assert result["removed"] == 2
+    assert sorted(f for f in os.listdir(data_dir) if f.endswith(".csv")) == [
+        "AAPL_DCF_20250103_090000.csv", "AAPL_DCF_20250104_090000.csv", os.path.basename(recent)]
+
+    assert store.compact(max_age=6.5 * DAY)["removed"] == 1
+    assert os.path.exists(recent)
+    assert not os.path.exists(os.path.join(data_dir, "AAPL_DCF_20250103_090000.csv"))
+
+
+def test_max_bytes_trims_least_recently_used(store, tmp_path):
+    old = export(str(tmp_path), "AAPL_DCF_20250101_090000.csv", content="x" * 100, age_days=3)
+    new = export(str(tmp_path), "MSFT_DCF_20250101_090000.csv", content="y" * 100, age_days=1)
+
+    assert store.compact(max_bytes=150)["removed"] == 1
+    assert not os.path.exists(old)
+    assert os.path.exists(new)
+
+
+def test_compaction_never_touches_the_parquet_dataset(store, tmp_path):
+    dataset_dir = str(tmp_path / "dataset")
+    parts = [write_partition(dataset_dir, pd.DataFrame({"value": [day]}), "AAPL", "dcf",
+                             generated_at=datetime(2024, 1, day, 9)) for day in range(1, 4)]
+    for path in parts:
+        os.utime(path, (0, 0))
+
+    result = store.compact(keep_last=1, max_age=DAY, max_bytes=1)
+
+    assert result["adopted"] == 0
+    assert all(os.path.exists(path) for path in parts)
+
+
+def test_dataset_rows_adopted_by_older_versions_are_forgotten(tmp_path):
+    part = write_partition(str(tmp_path / "dataset"), pd.DataFrame({"value": [1]}), "AAPL", "dcf")
+    ExportStore(str(tmp_path)).close()
+    with sqlite3.connect(str(tmp_path / "fmp_store.sqlite3")) as conn:
+        conn.execute("INSERT INTO objects (digest, content, symbol, data_type, format, size, created_at, last_used_at) "
+                     "VALUES ('d', 'c', 'AAPL', 'DCF', 'parquet', 1, 0, 0)")
+        conn.execute("INSERT INTO paths (path, digest) VALUES (?, 'd')", (part,))
+
+    reopened = ExportStore(str(tmp_path))
+    assert reopened.stats()["objects"] == 0
+    reopened.compact(keep_last=1, max_age=1)
+    assert os.path.exists(part)
+    reopened.close()
+
+
+def test_tool_retention_defaults_keep_the_dataset(make_tool):
+    tool = make_tool()
+    parts = [tool.save_to_parquet([{"date": "2024-09-30", "revenue": float(i)}], "AAPL", "dcf") for i in range(12)]
+
+    tool.compact_exports()
+
+    assert all(os.path.exists(path) for path in parts)
@@ -0,0 +1,54 @@
+"""SymbolResolver lookups by ticker, name, alias, prefix and fuzzy match"""
+
+import pytest
+
+from src.crew.dcf_crew import FAST_PATH_CONFIDENCE, SYMBOL_MIN_CONFIDENCE
+from src.crew.tools.symbols import SymbolResolver
+
+
+@pytest.fixture
+def resolver():
+    return SymbolResolver([
+        ("F", "Ford Motor Company", "NYSE", "stock"),
+        ("FORD", "Forward Industries, Inc.", "NASDAQ", "stock"),
+        ("AAPL", "Apple Inc.", "NASDAQ", "stock"),
+        ("GOOGL", "Alphabet Inc.", "NASDAQ", "stock"),
+        ("MSFT", "Microsoft Corporation", "NASDAQ", "stock"),
+    ])
+
+
+def test_company_name_that_is_also_a_ticker_resolves_to_the_company(resolver):
+    match = resolver.resolve("Ford")
+    assert match["symbol"] == "F"
+    assert match["method"] == "prefix"
+    assert SYMBOL_MIN_CONFIDENCE <= match["confidence"] < FAST_PATH_CONFIDENCE
+
+
+def test_uppercase_ticker_is_exact(resolver):
+    assert resolver.resolve("FORD") == {"symbol": "FORD", "name": "Forward Industries, Inc.",
+                                        "confidence": 1.0, "method": "ticker"}
+
+
+def test_lowercase_ticker_is_accepted_below_the_fast_path(resolver):
+    match = resolver.resolve("msft")
+    assert match["symbol"] == "MSFT"
+    assert match["method"] == "ticker_case"
+    assert SYMBOL_MIN_CONFIDENCE <= match["confidence"] < FAST_PATH_CONFIDENCE
+
+
+@pytest.mark.parametrize("query, symbol, method", [
+    ("Apple Inc", "AAPL", "name"),
+    ("microsoft", "MSFT", "name"),
+    ("Google", "GOOGL", "alias"),
+    ("Alphabt", "GOOGL", "fuzzy"),
+])
+def test_name_alias_and_fuzzy_matches(resolver, query, symbol, method):
+    match = resolver.resolve(query)
+    assert (match["symbol"], match["method"]) == (symbol, method)
+
+
+def test_index_round_trips_through_a_file(resolver, tmp_path):
+    path = resolver.save(str(tmp_path / "index.pkl"))
+    loaded = SymbolResolver.load(path)
+    assert len(loaded) == len(resolver)
+    assert loaded.resolve("Ford") == resolver.resolve("Ford")
@@ -0,0 +1,50 @@
+"""CachedTask replay and bypass without calling an LLM"""
+
+import pytest
+from crewai import Task
+from crewai.tasks.task_output import TaskOutput
+
+from src.crew.task_cache import CachedTask, TaskOutputCache
+
+
+@pytest.fixture
+def executed(monkeypatch):
+    """Replace the LLM execution with a counter returning a fixed output"""
+    calls = []
+
+    def execute_sync(self, agent=None, context=None, tools=None):
+        calls.append(self.name)
+        return TaskOutput(name=self.name, description=self.description, raw="computed", agent="analyst")
+
+    monkeypatch.setattr(Task, "execute_sync", execute_sync)
+    return calls
+
+
+def make_task(cache, salt):
+    return CachedTask(output_cache=cache, cache_salt=salt, name="calculate_dcf_metrics",
+                      description="Value the company", expected_output="A valuation")
+
+
+def test_output_is_replayed_for_the_same_salt(tmp_path, executed):
+    cache = TaskOutputCache(str(tmp_path / "tasks.sqlite3"))
+    first = make_task(cache, {"model": "m", "data": "abc"})
+    assert first.execute_sync().raw == "computed"
+    assert first.cache_status == "miss"
+
+    second = make_task(cache, {"model": "m", "data": "abc"})
+    assert second.execute_sync().raw == "computed"
+    assert second.cache_status == "hit"
+    assert executed == ["calculate_dcf_metrics"]
+
+    make_task(cache, {"model": "m", "data": "changed"}).execute_sync()
+    assert len(executed) == 2
+
+
+def test_none_salt_bypasses_the_cache(tmp_path, executed):
+    cache = TaskOutputCache(str(tmp_path / "tasks.sqlite3"))
+    for _ in range(2):
+        task = make_task(cache, None)
+        task.execute_sync()
+        assert task.cache_status == "off"
+    assert len(executed) == 2
+    assert cache.stats()["entries"] == 0
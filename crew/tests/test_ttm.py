@@ -0,0 +1,53 @@
+"""Trailing-twelve-month sums over quarterly statements"""
+
+import pandas as pd
+import pytest
+
+from src.crew.tools.ttm import annual_samples, compute_ttm
+
+QUARTER_ENDS = ["03-31", "06-30", "09-30", "12-31"]
+
+
+def quarters(symbol, start_year, count, skip=()):
+    """Quarterly rows with revenue 1, 2, 3, ... in date order, leaving out the dates in skip"""
+    rows = []
+    for i in range(count):
+        date = f"{start_year + i // 4}-{QUARTER_ENDS[i % 4]}"
+        if date not in skip:
+            rows.append({"symbol": symbol, "date": date, "revenue": float(i + 1)})
+    return rows
+
+
+def test_ttm_sums_the_trailing_four_quarters():
+    ttm = compute_ttm(pd.DataFrame(quarters("AAPL", 2022, 6)), flow_columns=["revenue"])
+
+    # Most recent first: 3+4+5+6, 2+3+4+5, 1+2+3+4
+    assert list(ttm["date"]) == ["2023-06-30", "2023-03-31", "2022-12-31"]
+    assert list(ttm["revenue"]) == [18.0, 14.0, 10.0]
+
+
+def test_windows_across_a_missing_quarter_are_incomplete():
+    rows = quarters("AAPL", 2022, 8, skip={"2022-09-30"})
+    ttm = compute_ttm(pd.DataFrame(rows), flow_columns=["revenue"], dropna=False)
+
+    by_date = ttm.set_index("date")
+    # Four rows straddling the gap cover more than a year of fiscal dates
+    assert not by_date.loc[["2022-12-31", "2023-03-31", "2023-06-30"], "ttm_complete"].any()
+    assert by_date.loc["2023-09-30", "ttm_complete"]
+    assert by_date.loc["2023-12-31", "revenue"] == 5 + 6 + 7 + 8
+    assert pd.isna(by_date.loc["2023-06-30", "revenue"])
+
+
+def test_windows_do_not_cross_symbols():
+    rows = quarters("AAPL", 2023, 4) + quarters("MSFT", 2023, 3)
+    ttm = compute_ttm(pd.DataFrame(rows), flow_columns=["revenue"])
+
+    assert list(ttm["symbol"]) == ["AAPL"]
+    assert ttm["revenue"].iloc[0] == 10.0
+
+
+@pytest.mark.parametrize("count, expected", [(12, ["2024-12-31", "2023-12-31", "2022-12-31"]),
+                                             (7, ["2023-09-30"])])
+def test_annual_samples_are_a_year_apart(count, expected):
+    ttm = compute_ttm(pd.DataFrame(quarters("AAPL", 2022, count)), flow_columns=["revenue"])
+    assert list(annual_samples(ttm)["date"]) == expected
@@ -0,0 +1,39 @@
+"""Vectorized DCF grids against the scalar FMPTool.calculate_dcf_valuation"""
+
+import numpy as np
+import pytest
+
+from src.crew.tools.valuation import dcf_sensitivity_grid
+
+DISCOUNT_RATES = [0.07, 0.085, 0.10, 0.12]
+GROWTH_RATES = [0.01, 0.025, 0.03, 0.04]
+
+
+@pytest.mark.parametrize("net_debt", [None, 25e9])
+def test_sensitivity_grid_matches_looped_valuations(make_tool, net_debt):
+    tool = make_tool()
+    grid = tool.calculate_dcf_sensitivity("AAPL", DISCOUNT_RATES, GROWTH_RATES, net_debt=net_debt)
+
+    for i, r in enumerate(DISCOUNT_RATES):
+        for j, g in enumerate(GROWTH_RATES):
+            summary = tool.calculate_dcf_valuation("AAPL", terminal_growth_rate=g, discount_rate=r,
+                                                   net_debt=net_debt)["valuation_summary"]
+            # The scalar path rounds each year's present value, so allow a few dollars of drift
+            assert grid["enterprise_value"][i][j] == pytest.approx(summary["enterprise_value"], abs=5)
+            assert grid["equity_value"][i][j] == pytest.approx(summary["equity_value"], abs=5)
+            assert grid["intrinsic_value_per_share"][i][j] == pytest.approx(
+                summary["intrinsic_value_per_share"], abs=0.011)
+    assert grid["shares_outstanding"] == summary["shares_outstanding"]
+
+
+def test_cells_with_growth_at_or_above_the_discount_rate_are_empty():
+    grid = dcf_sensitivity_grid([100.0, 110.0], [0.03, 0.10], [0.03, 0.05], shares_outstanding=10)
+    assert grid["valid"].tolist() == [[False, False], [True, True]]
+    assert np.isnan(grid["enterprise_value"][0]).all()
+    assert np.isfinite(grid["intrinsic_value_per_share"][1]).all()
+
+
+def test_grid_without_shares_has_no_per_share_values():
+    grid = dcf_sensitivity_grid([100.0], [0.10], [0.03])
+    assert np.isnan(grid["intrinsic_value_per_share"]).all()
+    assert grid["equity_value"][0, 0] == pytest.approx(grid["enterprise_value"][0, 0] * 0.95)